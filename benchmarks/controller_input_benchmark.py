@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+手把輸入迴圈效能測試 - 比較 wait（事件驅動）與 poll（忙碌輪詢）兩種模式
+- 閒置 CPU：監聽執行緒在沒有任何輸入時所消耗的 CPU 時間比例
+- 分派延遲：事件送入 pygame 佇列到回呼函式被呼叫之間的延遲
+- 搖桿合併：高頻軸事件在不同取樣間隔下實際分派的回呼次數
+
+不需要實體手把，以 pygame.event.post 注入模擬的按鍵事件
+用法：python benchmarks/controller_input_benchmark.py [--idle-seconds 3] [--events 500]
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pygame
+from common.controller_input import ControllerInput
+
+
+# 保留所有建立過的 ControllerInput，避免被回收時 __del__ -> stop() 關閉共用的 joystick 子系統
+_controllers = []
+
+
+def _create_controller(**kwargs):
+    """建立不綁定實體手把的 ControllerInput"""
+    controller = ControllerInput(use_existing_controller=False, **kwargs)
+    _controllers.append(controller)
+    return controller
+
+
+def _start_listener(controller):
+    """直接啟動事件迴圈（略過實體手把檢查）"""
+    thread = threading.Thread(target=controller._event_loop, daemon=True)
+    thread.start()
+    return thread
+
+
+def measure_idle_cpu(mode, seconds):
+    """量測閒置時整個行程的 CPU 使用率（主執行緒僅 sleep）"""
+    controller = _create_controller(input_mode=mode)
+    thread = _start_listener(controller)
+    time.sleep(0.2)  # 讓監聽執行緒進入穩定狀態
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    time.sleep(seconds)
+    cpu_used = time.process_time() - cpu_start
+    wall_used = time.perf_counter() - wall_start
+
+    controller.running = False
+    thread.join(timeout=1.0)
+    return cpu_used / wall_used * 100
+
+
+def measure_latency(mode, event_count, interval_s):
+    """注入按鍵事件，量測從 post 到回呼被呼叫的延遲（微秒）"""
+    latencies = []
+    done = threading.Event()
+
+    def on_button(buttons, leftX, leftY, last_key_bit, last_key_down, timestamp_ns=None):
+        if last_key_down:
+            latencies.append((time.perf_counter_ns() - sent_times[last_key_bit]) / 1000)
+            if len(latencies) >= event_count:
+                done.set()
+
+    controller = _create_controller(button_callback=on_button, input_mode=mode)
+    thread = _start_listener(controller)
+    time.sleep(0.2)
+
+    sent_times = {}
+    for i in range(event_count):
+        button = i % 16
+        sent_times[button] = time.perf_counter_ns()
+        pygame.event.post(pygame.event.Event(pygame.JOYBUTTONDOWN, button=button, joy=0, instance_id=0))
+        time.sleep(interval_s)
+        pygame.event.post(pygame.event.Event(pygame.JOYBUTTONUP, button=button, joy=0, instance_id=0))
+
+    done.wait(timeout=5.0)
+    controller.running = False
+    thread.join(timeout=1.0)
+    return latencies
+
+
+def measure_axis_coalescing(interval_ms, event_count, rate_hz):
+    """以 rate_hz 的頻率注入軸事件，回傳 (原始事件數, 分派回呼數)"""
+    calls = []
+
+    def on_axis(buttons, leftX, leftY, last_key_bit, last_key_down, timestamp_ns=None):
+        calls.append(timestamp_ns)
+
+    controller = _create_controller(analog_callback=on_axis, input_mode="wait",
+                                    analog_sample_interval_ms=interval_ms)
+    thread = _start_listener(controller)
+    time.sleep(0.2)
+
+    period = 1.0 / rate_hz
+    next_time = time.perf_counter()
+    for i in range(event_count):
+        value = 0.5 + 0.4 * ((i % 50) / 50)  # 持續偏移中的搖桿
+        pygame.event.post(pygame.event.Event(pygame.JOYAXISMOTION, axis=i % 2, value=value,
+                                             joy=0, instance_id=0))
+        next_time += period
+        delay = next_time - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    time.sleep(0.2)
+    controller.running = False
+    thread.join(timeout=1.0)
+    return controller.raw_axis_events, len(calls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ControllerInput wait / poll 模式效能比較")
+    parser.add_argument("--idle-seconds", type=float, default=3.0, help="閒置 CPU 量測秒數")
+    parser.add_argument("--events", type=int, default=500, help="延遲量測注入的事件數")
+    parser.add_argument("--interval-ms", type=float, default=2.0, help="注入事件之間的間隔（毫秒）")
+    parser.add_argument("--axis-rate", type=float, default=1000.0, help="搖桿合併量測的軸事件頻率（Hz）")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"{'模式':<8}{'閒置 CPU %':>12}{'延遲中位數 µs':>16}{'延遲 p99 µs':>14}{'事件數':>8}")
+    print("=" * 60)
+    for mode in ("poll", "wait"):
+        cpu_percent = measure_idle_cpu(mode, args.idle_seconds)
+        latencies = measure_latency(mode, args.events, args.interval_ms / 1000)
+        if latencies:
+            latencies.sort()
+            median = statistics.median(latencies)
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        else:
+            median = p99 = float("nan")
+        print(f"{mode:<8}{cpu_percent:>12.1f}{median:>16.1f}{p99:>14.1f}{len(latencies):>8}")
+    print("=" * 60)
+
+    axis_events = int(args.axis_rate)  # 約一秒的軸事件
+    print(f"{'取樣間隔':<12}{'原始事件':>10}{'分派回呼':>10}{'節省 %':>10}")
+    print("=" * 60)
+    for interval_ms in (None, 0, 16):
+        raw, emitted = measure_axis_coalescing(interval_ms, axis_events, args.axis_rate)
+        saved = (1 - emitted / raw) * 100 if raw else 0
+        label = "不合併" if interval_ms is None else f"{interval_ms} ms"
+        print(f"{label:<12}{raw:>10}{emitted:>10}{saved:>10.1f}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
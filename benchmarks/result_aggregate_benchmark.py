@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+跨使用者結果彙整效能測試
+- 在暫存資料夾中建立多位使用者的反應時間與路徑追蹤結果（含每個 trial 的明細）
+- 比較三種情況讀取所有摘要並計算年齡分組統計的時間：
+  逐一解析（單一程序、不使用快取，相當於分析人員的臨時腳本）、平行解析（不使用快取）、快取命中（資料夾未變動）
+
+用法：python benchmarks/result_aggregate_benchmark.py [--users 300] [--runs 5]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from common import config
+from common import result_aggregator
+
+
+def create_results(root, users, runs, seed=0):
+    """每位使用者建立 runs 次反應時間與路徑追蹤結果，回傳檔案數"""
+    rng = random.Random(seed)
+    count = 0
+    for u in range(users):
+        user_id = f"user{u:04d}"
+        user_dir = Path(root) / user_id
+        user_dir.mkdir(parents=True)
+        age = rng.randint(8, 70)
+        frequency = rng.randint(1, 7)
+        for r in range(runs):
+            stamp = f"20240101_{10 + r:02d}0000"
+            reaction_trials = [{"trial": i + 1, "reaction_time_ms": rng.uniform(180, 450)} for i in range(10)]
+            path_trials = [{"trial_number": i + 1, "path_accuracy": rng.uniform(60, 100),
+                            "completion_time_seconds": rng.uniform(2, 8),
+                            "path_shapes": [[[rng.random() * 1000, rng.random() * 800] for _ in range(3)]
+                                            for _ in range(4)]}
+                           for i in range(12)]
+            for test_name, metrics in (
+                ("button_reaction_time", {
+                    "total_trials": 10,
+                    "average_reaction_time_ms": sum(t["reaction_time_ms"] for t in reaction_trials) / 10,
+                    "trials": reaction_trials}),
+                ("analog_path_follow", {
+                    "total_trials": 12,
+                    "average_accuracy_percentage": sum(t["path_accuracy"] for t in path_trials) / 12,
+                    "trials": path_trials}),
+            ):
+                data = {"user_id": user_id, "test_name": test_name, "timestamp": f"2024-01-01T{10 + r:02d}:00:00",
+                        "parameters": {}, "metrics": metrics, "age": age, "controller_usage_frequency": frequency}
+                with open(user_dir / f"{test_name}_{stamp}.json", "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                count += 1
+    return count
+
+
+def measure(label, **kwargs):
+    """讀取所有摘要並計算年齡分組統計，回傳 (標籤, 秒數, 統計表)"""
+    start = time.perf_counter()
+    summaries = result_aggregator.load_summaries(**kwargs)
+    table = result_aggregator.aggregate(summaries, "average_reaction_time_ms", "age", [0, 20, 40, 60, 100])
+    return label, time.perf_counter() - start, table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="跨使用者結果彙整效能比較")
+    parser.add_argument("--users", type=int, default=300, help="使用者數量")
+    parser.add_argument("--runs", type=int, default=5, help="每位使用者每個測試的結果數")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="result_aggregate_benchmark_")
+    config.RESULTS_DIR = os.path.join(root, "results")
+    config.AGGREGATE_CACHE_FILE = os.path.join(root, "aggregate_cache.sqlite")
+    try:
+        files = create_results(config.RESULTS_DIR, args.users, args.runs)
+        # 先建立各使用者的結果索引，讓三種情況都只比較解析與彙整
+        result_aggregator.list_result_files()
+
+        rows = [
+            measure("逐一解析", use_cache=False, workers=1),
+            measure(f"平行解析 ({os.cpu_count()} 程序)", use_cache=False),
+            measure("建立快取", use_cache=True),
+            measure("快取命中", use_cache=True),
+        ]
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    # 所有情況的統計結果必須相同
+    assert all(row[2] == rows[0][2] for row in rows)
+
+    base = rows[0][1]
+    print("=" * 56)
+    print(f"結果檔案數：{files}（{args.users} 位使用者）")
+    print(f"{'情況':<24}{'秒數':>12}{'加速倍數':>14}")
+    print("=" * 56)
+    for label, seconds, _ in rows:
+        print(f"{label:<24}{seconds:>12.3f}{base / seconds:>13.1f}x")
+    print("=" * 56)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+結果查詢效能測試 - 比較列出資料夾（glob + 排序）與結果索引（SQLite）的查詢時間
+- 在暫存資料夾中為一位使用者建立大量結果 JSON（6 種測試平均分配）
+- 比較「載入最新結果」與「取得某個測試的所有結果檔案」兩種查詢
+- 索引在第一次查詢時由資料夾建立，建立時間另外列出
+
+用法：python benchmarks/result_index_benchmark.py [--files 5000] [--repeat 200]
+"""
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from common import config
+from common import result_index
+from common import result_saver
+
+TEST_NAMES = [
+    "button_reaction_time",
+    "button_prediction_countdown",
+    "button_smash",
+    "button_accuracy",
+    "analog_move",
+    "analog_path_follow",
+]
+USER_ID = "benchmark_user"
+
+
+def create_results(count):
+    """建立 count 個結果檔案，每個檔案間隔一分鐘"""
+    user_dir = Path(config.RESULTS_DIR) / USER_ID
+    user_dir.mkdir(parents=True)
+    start = datetime(2024, 1, 1)
+    for i in range(count):
+        test_name = TEST_NAMES[i % len(TEST_NAMES)]
+        stamp = (start + timedelta(minutes=i)).strftime("%Y%m%d_%H%M%S")
+        with open(user_dir / f"{test_name}_{stamp}.json", "w", encoding="utf-8") as f:
+            json.dump({"user_id": USER_ID, "test_name": test_name, "metrics": {}}, f)
+
+
+def glob_latest(test_name):
+    """索引加入前的 load_test_result：列出資料夾並排序後載入最後一個檔案"""
+    user_dir = Path(config.RESULTS_DIR) / USER_ID
+    latest_file = sorted(user_dir.glob(f"{test_name}_*.json"))[-1]
+    with open(latest_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def glob_files(test_name):
+    """索引加入前的 get_test_result_files"""
+    user_dir = Path(config.RESULTS_DIR) / USER_ID
+    return [str(f) for f in sorted(user_dir.glob(f"{test_name}_*.json"))]
+
+
+def measure(func, repeat):
+    """回傳每次呼叫的平均毫秒數"""
+    start = time.perf_counter()
+    for i in range(repeat):
+        func(TEST_NAMES[i % len(TEST_NAMES)])
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="結果查詢：glob 與索引比較")
+    parser.add_argument("--files", type=int, default=5000, help="結果檔案數量")
+    parser.add_argument("--repeat", type=int, default=200, help="每種查詢的呼叫次數")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="result_index_benchmark_")
+    config.RESULTS_DIR = root
+    try:
+        create_results(args.files)
+
+        start = time.perf_counter()
+        result_index.rebuild_index(USER_ID)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        # 兩種方式的結果必須相同
+        for test_name in TEST_NAMES:
+            assert glob_files(test_name) == result_saver.get_test_result_files(USER_ID, test_name)
+            assert glob_latest(test_name) == result_saver.load_test_result(USER_ID, test_name)
+
+        rows = [
+            ("載入最新結果", measure(glob_latest, args.repeat),
+             measure(lambda name: result_saver.load_test_result(USER_ID, name), args.repeat)),
+            ("某測試所有檔案", measure(glob_files, args.repeat),
+             measure(lambda name: result_saver.get_test_result_files(USER_ID, name), args.repeat)),
+        ]
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print("=" * 60)
+    print(f"結果檔案數：{args.files}（建立索引 {build_ms:.0f} ms，只需一次）")
+    print(f"{'查詢':<16}{'glob ms':>12}{'索引 ms':>12}{'加速倍數':>12}")
+    print("=" * 60)
+    for label, glob_ms, index_ms in rows:
+        print(f"{label:<16}{glob_ms:>12.2f}{index_ms:>12.2f}{glob_ms / index_ms:>11.1f}x")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
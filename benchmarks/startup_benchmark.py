@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+測試程式啟動時間測試 - 量測以 `python tests/<name>.py` 啟動測試到 Tk 第一次閒置回呼的時間
+- 與直接執行測試相同：執行測試腳本的 __main__（以命令列參數提供使用者資訊，不需輸入）
+- 在 tkinter.Tk 建立時排入一個閒置回呼，回呼執行時（視窗已建立、主迴圈開始處理事件）記錄時間並結束行程
+- 冷啟動：行程啟動到第一次閒置回呼的總時間（含 Python 直譯器本身的啟動）
+- 視窗就緒：從執行測試腳本開始到第一次閒置回呼的時間
+- 同時列出此時是否已匯入 pygame / matplotlib / numpy（手把在第一次閒置之後才連接，pygame 不應出現在按鍵測試）
+需要可用的顯示器（或 Xvfb）
+
+用法：python benchmarks/startup_benchmark.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# 與 main.py 的測試選單相同的入口
+TEST_SCRIPTS = [
+    "button_reaction_time_test",
+    "button_prediction_countdown_test",
+    "button_smash_test",
+    "button_accuracy_test",
+    "analog_move_test",
+    "analog_path_follow_test",
+]
+
+HEAVY_MODULES = ("pygame", "matplotlib", "numpy")
+
+# 測試腳本的命令列參數：提供完整的使用者資訊，不會停下來等待輸入
+SCRIPT_ARGS = ["--user", "startup_benchmark", "--age", "30", "--controller-freq", "4"]
+
+# 在子行程中執行：模擬 `python tests/<name>.py`，在第一次閒置回呼時回報並結束
+_CHILD_CODE = """
+import json, os, runpy, sys, time, tkinter
+start = time.perf_counter()
+_tk_init = tkinter.Tk.__init__
+
+def _init_and_report(self, *args, **kwargs):
+    _tk_init(self, *args, **kwargs)
+
+    def report():
+        print(json.dumps({{"first_idle_ms": (time.perf_counter() - start) * 1000,
+                          "loaded": [name for name in {heavy!r} if name in sys.modules]}}), flush=True)
+        os._exit(0)
+
+    self.after_idle(report)
+
+tkinter.Tk.__init__ = _init_and_report
+sys.argv = [{script!r}] + {args!r}
+sys.path[0] = {tests_dir!r}
+runpy.run_path({script!r}, run_name="__main__")
+"""
+
+
+def measure_script(name, runs):
+    """回傳 (冷啟動毫秒數中位數, 視窗就緒毫秒數中位數, 已匯入的大型模組)"""
+    script = str(ROOT / "tests" / f"{name}.py")
+    code = _CHILD_CODE.format(script=script, args=SCRIPT_ARGS, tests_dir=str(ROOT / "tests"), heavy=HEAVY_MODULES)
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    totals, ready, loaded = [], [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                                capture_output=True, text=True)
+        totals.append((time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            raise RuntimeError(f"{name} failed to start:\n{result.stderr}")
+        # 測試啟動時會輸出其他訊息，結果在最後一行
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        ready.append(report["first_idle_ms"])
+        loaded = report["loaded"]
+    return statistics.median(totals), statistics.median(ready), loaded
+
+
+def measure_interpreter(runs):
+    """空的 Python 行程啟動時間，作為比較基準"""
+    totals = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        totals.append((time.perf_counter() - start) * 1000)
+    return statistics.median(totals)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="各測試入口啟動到第一次 Tk 閒置回呼的時間")
+    parser.add_argument("--runs", type=int, default=5, help="每個入口量測次數（取中位數）")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"{'測試入口':<34}{'冷啟動 ms':>11}{'視窗就緒 ms':>12}   已匯入")
+    print("=" * 80)
+    print(f"{'(python -c pass)':<34}{measure_interpreter(args.runs):>11.0f}")
+    for name in TEST_SCRIPTS:
+        total, ready, loaded = measure_script(name, args.runs)
+        print(f"{name:<34}{total:>11.0f}{ready:>12.0f}   {', '.join(loaded) or '-'}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
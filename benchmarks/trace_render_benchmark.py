@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+軌跡圖繪製效能測試 - 比較 matplotlib 與 raster（pygame 直接點陣繪製）兩種繪製方式
+- 以實際測試使用的 12 條路徑與合成的玩家軌跡建立路徑追蹤圖工作
+- 以合成的移動軌跡與按鍵點建立搖桿移動圖工作
+- 每種方式依序輸出相同的工作，比較每張圖的平均時間與輸出檔案大小
+
+用法：python benchmarks/trace_render_benchmark.py [--trials 60] [--keep DIR]
+"""
+import argparse
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from common import config
+from common import trace_plot
+from common.replay import HeadlessWidget
+from tests.analog_path_follow_test import PathFollowingTestApp
+
+
+def build_jobs(trials, output_dir, seed=0):
+    """建立路徑追蹤與搖桿移動各 trials 個繪圖工作"""
+    rng = random.Random(seed)
+    random.seed(seed)  # create_paths 以 random.shuffle 排列路徑
+    app = SimpleNamespace(canvas=HeadlessWidget(), canvas_width=config.WINDOW_WIDTH,
+                          canvas_height=config.WINDOW_HEIGHT)
+    paths = PathFollowingTestApp.create_paths(app)
+
+    jobs = []
+    for i in range(trials):
+        path = paths[i % len(paths)]
+        path.create_path()
+        # 沿路徑中心線前進並加上抖動，約 3 秒的 60 Hz 取樣
+        start, end = path.get_path_shapes()[0][0], path.get_path_shapes()[-1][2]
+        path.player_trace = [(start[0] + (end[0] - start[0]) * k / 180 + rng.uniform(-20, 20),
+                              start[1] + (end[1] - start[1]) * k / 180 + rng.uniform(-20, 20))
+                             for k in range(180)]
+        jobs.append(trace_plot.single_trace_job(path, i, output_dir))
+
+    for i in range(trials):
+        angle = rng.uniform(0, 2 * math.pi)
+        start = (600, 400)
+        target = (600 + 300 * math.cos(angle), 400 + 300 * math.sin(angle))
+        points = [(start[0] + (target[0] - start[0]) * k / 90 + rng.uniform(-4, 4),
+                   start[1] + (target[1] - start[1]) * k / 90 + rng.uniform(-4, 4))
+                  for k in range(90)]
+        jobs.append(trace_plot.move_trace_job(points, start, target, 40, 15, points[60::10],
+                                              f"m{i}", output_dir))
+    return jobs
+
+
+def measure_backend(backend, jobs, output_dir):
+    """依序輸出所有工作，回傳 (各種圖的平均毫秒數, 平均檔案大小 KB)"""
+    os.makedirs(output_dir, exist_ok=True)
+
+    # 第一張圖包含建立 Figure / 載入字型等一次性成本，另外暖機不列入統計
+    trace_plot.render_trace_job(dict(jobs[0], output_dir=output_dir, index="warmup", backend=backend))
+
+    elapsed = {'single': 0.0, 'move': 0.0}
+    counts = {'single': 0, 'move': 0}
+    sizes = []
+    for job in jobs:
+        job = dict(job, output_dir=output_dir, backend=backend)
+        start = time.perf_counter()
+        path = trace_plot.render_trace_job(job)
+        elapsed[job['kind']] += time.perf_counter() - start
+        counts[job['kind']] += 1
+        sizes.append(os.path.getsize(path))
+
+    per_image = {kind: elapsed[kind] / counts[kind] * 1000 for kind in elapsed if counts[kind]}
+    return per_image, sum(sizes) / len(sizes) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="軌跡圖 matplotlib / raster 繪製效能比較")
+    parser.add_argument("--trials", type=int, default=60, help="每種圖的數量")
+    parser.add_argument("--keep", help="保留輸出圖片的資料夾（預設輸出到暫存資料夾並於結束後刪除）")
+    args = parser.parse_args()
+
+    root = args.keep or tempfile.mkdtemp(prefix="trace_render_benchmark_")
+    jobs = build_jobs(args.trials, root)
+
+    # 繪圖過程中的「已儲存」訊息不列印，避免影響計時
+    stdout = sys.stdout
+    results = {}
+    try:
+        sys.stdout = open(os.devnull, "w")
+        for backend in ("matplotlib", "raster"):
+            results[backend] = measure_backend(backend, jobs, os.path.join(root, backend))
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print("=" * 60)
+    print(f"{'繪製方式':<12}{'路徑圖 ms':>12}{'移動圖 ms':>12}{'平均檔案 KB':>14}")
+    print("=" * 60)
+    for backend, (per_image, size_kb) in results.items():
+        print(f"{backend:<12}{per_image['single']:>12.1f}{per_image['move']:>12.1f}{size_kb:>14.1f}")
+    print("=" * 60)
+    base, fast = results["matplotlib"][0], results["raster"][0]
+    for kind, label in (("single", "路徑圖"), ("move", "移動圖")):
+        print(f"{label} 加速倍數：{base[kind] / fast[kind]:.1f}x")
+    if args.keep:
+        print(f"輸出圖片：{root}")
+
+
+if __name__ == "__main__":
+    main()
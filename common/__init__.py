@@ -3,9 +3,17 @@ Common module package
 包含共用的控制器輸入處理、工具函式和配置設定
 """
 
-from .controller_input import ControllerInput
 from .utils import *
 from . import config
 from . import language
 
 __all__ = ['ControllerInput', 'config', 'language']
+
+
+def __getattr__(name):
+    # ControllerInput 會載入 pygame，等到第一次使用時才匯入，
+    # 只需要 config / language 的測試程式（例如 `from common import config`）啟動時不必載入 pygame
+    if name == 'ControllerInput':
+        from .controller_input import ControllerInput
+        return ControllerInput
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -32,6 +32,19 @@ COLORS = {
     'NEUTRAL': (128, 128, 128),      # 中性灰色
 }
 
+# 手把輸入設定
+CONTROLLER_INPUT_MODE = "wait"  # "wait" = 事件驅動（閒置時不佔 CPU），"poll" = 忙碌輪詢
+CONTROLLER_WAIT_TIMEOUT_MS = 100  # wait 模式下單次等待的最長時間，逾時後重新檢查停止旗標
+CONTROLLER_EVENT_BUFFER_SIZE = 4096  # 監聽執行緒與 Tk 主執行緒之間的事件環形緩衝區容量
+CONTROLLER_DRAIN_INTERVAL_MS = 16  # Tk 主執行緒讀取事件緩衝區的間隔（約 60fps）
+
+# 搖桿事件合併：None = 每個軸事件都分派；0 = 每批事件合併為一次；N = 每 N 毫秒最多分派一次
+ANALOG_SAMPLE_INTERVAL_MS = None
+
+# 模擬迴圈設定（類比搖桿測試）：每步固定 16ms，幀延遲時每幀最多補跑 5 步
+SIMULATION_STEP_MS = 16
+SIMULATION_MAX_CATCH_UP_STEPS = 5
+
 # 類比搖桿設定
 ANALOG_DEADZONE = 0.1
 ANALOG_SENSITIVITY = 1.0
@@ -45,6 +58,40 @@ PATH_OUT_OF_BOUNDS_TOLERANCE = 10
 DATA_DIR = "data"
 RESULTS_DIR = "data/results"
 IMAGES_DIR = "data/images"
+RAW_INPUT_DIR = "data/raw_input"
+SESSIONS_DIR = "data/sessions"  # 完整測試套件的 session 清單
+REPLAY_RESULTS_DIR = "data/replay_results"  # 無頭重播產生的結果（與正式結果分開）
+RESULT_INDEX_FILENAME = "result_index.sqlite"  # 每位使用者結果資料夾中的結果索引
+
+# 結果 JSON 中的軌跡座標："columnar" 另存為二進位 sidecar（JSON 只保留參照）；"inline" 直接寫入 JSON 列表（舊格式）
+TRAJECTORY_STORAGE = "columnar"
+
+# 搖桿移動測試目標排程：ANALOG_MOVE_SCHEDULE_FILE 設定時載入排程 JSON（python -m common.target_schedule 產生），
+# 否則依重複次數與亂數種子產生（種子為 None 時維持固定的條件順序）
+ANALOG_MOVE_SCHEDULE_FILE = None
+ANALOG_MOVE_REPETITIONS = 1
+ANALOG_MOVE_SCHEDULE_SEED = None
+
+# 路徑追蹤偏離記錄：每個 trial 預先配置的樣本數（約 65 秒，超過時自動加倍）與偏離持續時間分佈的邊界（秒）
+PATH_SAMPLE_CAPACITY = 4096
+PATH_EXCURSION_HISTOGRAM_S = [0.1, 0.25, 0.5, 1.0, 2.0]
+
+# 跨使用者結果彙整：摘要快取檔與平行解析的程序數（0 = CPU 核心數）
+AGGREGATE_CACHE_FILE = "data/aggregate_cache.sqlite"
+AGGREGATE_WORKERS = 0
+
+# 軌跡圖背景繪圖程序數（0 = 在呼叫端同步繪製）
+TRACE_PLOT_WORKERS = 2
+
+# 軌跡圖輸出方式："per_trial" 每個 trial 一張；"sheet" 整個 session 一張多格總表；"both" 兩者都輸出
+TRACE_PLOT_LAYOUT = "per_trial"
+TRACE_SHEET_DPI = 100
+
+# 單一 trial 軌跡圖的繪製方式："matplotlib"；"raster" 直接以 pygame 點陣繪製（大量重新產生圖片時較快，多格總表仍使用 matplotlib）
+TRACE_PLOT_BACKEND = "matplotlib"
+
+# 原始輸入紀錄：設為 True 時，每個測試 session 的所有手把事件都會寫入 RAW_INPUT_DIR 下的二進位紀錄檔
+RECORD_RAW_INPUT = False
 
 # 日誌設定
 LOG_LEVEL = "INFO"
@@ -56,4 +103,10 @@ user_info = {
     "controller_usage_frequency": None,
     "controller_usage_frequency_description": "1=從來沒用過, 7=每天使用"
 }
+
+# 已收集的所有受試者資訊，以 user_id 為鍵 (多人同時測試時每位受試者各自一份，由 utils.collect_user_info_if_needed 設定)
+participants = {}
+
+# 目前測試 session 的 random 種子 (由 utils.seed_session 設定，寫入原始輸入紀錄檔頭供重播使用)
+session_seed = None
 DEBUG_MODE = False
@@ -2,29 +2,68 @@ import pygame
 import os
 import signal
 import sys
-from .controller_manager import controller_manager
+import time
+from .controller_manager import controller_manager, ensure_pygame_initialized
 from .language import get_text
+from .event_buffer import EventRingBuffer, EVENT_AXIS, EVENT_BUTTON_DOWN, EVENT_BUTTON_UP
+from .input_recorder import MARKER_START, InputRecorder, default_record_path
+from . import config
 
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
 os.environ['SDL_VIDEODRIVER'] = 'dummy'
 
-pygame.init()
-pygame.joystick.init()
-
 DEBUG = False  # 設定為 True 以啟用除錯輸出
+DEADZONE = 0.15  # 搖桿死區，絕對值小於此值視為 0
+
+
+def _event_device(event):
+    """取得事件來源手把的編號（pygame 2 為 instance_id）"""
+    return getattr(event, 'instance_id', getattr(event, 'joy', 0))
+
+
+def wait_for_events(timeout_ms):
+    """阻塞等待第一個事件（最長 timeout_ms），再一次取出佇列中其餘事件"""
+    first_event = pygame.event.wait(timeout_ms)
+    if first_event.type == pygame.NOEVENT:
+        return []
+    return [first_event] + pygame.event.get()
+
+
+def _apply_deadzone(value):
+    """將搖桿原始值四捨五入並套用死區，回傳 (數值, 是否超出死區)"""
+    val = round(value, 4)
+    if abs(val) < DEADZONE:
+        return 0, False
+    return val, True
 
 
 class ControllerInput:
 
-    def __init__(self, button_callback=None, analog_callback=None, use_existing_controller=True):
-        self.leftX = 0
-        self.leftY = 0
-        self.buttons = 0
-        self.running = True  # 添加運行狀態標記
+    def __init__(self, button_callback=None, analog_callback=None, use_existing_controller=True,
+                 input_mode=None, wait_timeout_ms=None, tk_root=None, analog_sample_interval_ms=-1,
+                 record_path=None, shared_loop=False, joystick=None):
+        ensure_pygame_initialized()
+        self._init_input_state(button_callback, analog_callback, tk_root, analog_sample_interval_ms)
+
+        # 事件讀取模式："wait" 為事件驅動（阻塞等待），"poll" 為舊版忙碌輪詢
+        self.input_mode = input_mode or config.CONTROLLER_INPUT_MODE
+        self.wait_timeout_ms = wait_timeout_ms if wait_timeout_ms is not None else config.CONTROLLER_WAIT_TIMEOUT_MS
+
+        # 原始輸入紀錄（選用）：每個事件以固定長度二進位紀錄寫入檔案
+        # 服務的頻道跨多個測試使用，紀錄檔在每次 bind() 時各自開啟（見 InProcessTestRunner）
+        self.recorder = None
+        if record_path is None and config.RECORD_RAW_INPUT and not shared_loop:
+            record_path = default_record_path(config.user_info.get('user_id'))
+        if record_path is not None:
+            self._open_recorder(record_path)
+
+        if shared_loop:
+            # 由 ControllerInputService 的事件迴圈分派事件：直接使用指定的手把，
+            # 不自行配對、不註冊 signal handler（由服務統一處理）
+            self.joystick = joystick
+            self._track_joystick()
+            return
 
-        self.button_callback = button_callback
-        self.analog_callback = analog_callback
-        
         # 註冊 signal handler 來處理程式意外關閉
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -42,6 +81,48 @@ class ControllerInput:
         
         if self.joystick is None:
             print(get_text('controller_no_pairing'))
+        self._track_joystick()
+
+    def _track_joystick(self):
+        """記錄目前手把的 instance id 與 GUID（拔除後仍可用來比對事件來源與重新連線的手把）"""
+        self.joystick_instance_id = None
+        self._joystick_guid = None
+        self.joystick_connected = self.joystick is not None
+        if self.joystick is not None:
+            self.joystick_instance_id = self.joystick.get_instance_id()
+            self._joystick_guid = self.joystick.get_guid()
+
+    def _init_input_state(self, button_callback, analog_callback, tk_root, analog_sample_interval_ms):
+        """初始化搖桿／按鍵狀態與回呼分派設定（即時輸入與重播輸入共用）"""
+        self.leftX = 0
+        self.leftY = 0
+        self.buttons = 0
+        self.running = True  # 添加運行狀態標記
+
+        # 搖桿事件合併：None = 不合併；0 = 每批事件合併一次；N = 每 N 毫秒最多分派一次
+        # 從靜止變為移動（或反之）的事件一律立即分派，保留動作起始時間的精確度
+        if analog_sample_interval_ms == -1:  # 未指定時使用 config 設定
+            analog_sample_interval_ms = config.ANALOG_SAMPLE_INTERVAL_MS
+        self.analog_sample_interval_ms = analog_sample_interval_ms
+        self._pending_axes = {}  # 尚未分派的軸原始值 {axis: value}
+        self._pending_axis_code = None
+        self._pending_axis_timestamp_ns = 0
+        self._last_axis_emit_ns = 0
+        self.raw_axis_events = 0      # 收到的軸事件數
+        self.emitted_axis_events = 0  # 實際分派的軸更新數
+
+        self.button_callback = button_callback
+        self.analog_callback = analog_callback
+
+        # 綁定 Tk 視窗時，回呼改由 Tk 主執行緒每幀從環形緩衝區讀出後呼叫，
+        # 避免在監聽執行緒中操作 Tk 元件，也讓耗時的畫面更新不會阻塞事件讀取
+        self.tk_root = tk_root
+        self.event_buffer = None
+        self.drain_interval_ms = config.CONTROLLER_DRAIN_INTERVAL_MS
+        self._drain_after_id = None
+        if tk_root is not None:
+            self.event_buffer = EventRingBuffer(config.CONTROLLER_EVENT_BUFFER_SIZE)
+            self._schedule_drain()
 
     def _signal_handler(self, signum, frame):
         """處理系統信號，確保正常關閉"""
@@ -50,17 +131,12 @@ class ControllerInput:
         sys.exit(0)
 
     def _auto_select_controller(self):
-        """自動選擇第一個可用的遙控器"""
-        count = pygame.joystick.get_count()
-        
-        if count == 0:
-            print(get_text('controller_no_gamepad'))
-            return None
-        
-        # 自動選擇第一個遙控器
+        """自動選擇第一個可用的遙控器（由連線池開啟並保存）"""
         try:
-            j = pygame.joystick.Joystick(0)
-            j.init()
+            j = controller_manager.acquire_first()
+            if j is None:
+                print(get_text('controller_no_gamepad'))
+                return None
             print(get_text('controller_auto_connect', name=j.get_name()))
             return j
         except Exception as e:
@@ -68,24 +144,21 @@ class ControllerInput:
             return None
 
     def detect_joycon(self):
-        count = pygame.joystick.get_count()
-        print(get_text('controller_detected_count', count=count))
+        connected = controller_manager.refresh()
+        print(get_text('controller_detected_count', count=len(connected)))
 
-        if count == 0:
+        if not connected:
             print(get_text('controller_no_gamepad'))
             return
 
-        for i in range(count):
-            j = pygame.joystick.Joystick(i)
-            j.init()
+        for j in connected:
             print(get_text('controller_detected', name=j.get_name()))
             confirm = input(get_text('controller_use_device')).strip().lower()
             if confirm == "y" or confirm == "":
                 self.joystick = j
+                self._track_joystick()
                 print(get_text('controller_selected', name=j.get_name()))
                 return
-            else:
-                j.quit()
 
         print(get_text('controller_none_selected'))
 
@@ -95,23 +168,19 @@ class ControllerInput:
         靜態方法：配對並返回遙控器實例
         用於在主程式啟動時一次性配對遙控器
         """
-        count = pygame.joystick.get_count()
-        print(get_text('controller_detected_count', count=count))
+        connected = controller_manager.refresh()
+        print(get_text('controller_detected_count', count=len(connected)))
 
-        if count == 0:
+        if not connected:
             print(get_text('controller_no_gamepad'))
             return None
 
-        for i in range(count):
-            j = pygame.joystick.Joystick(i)
-            j.init()
+        for j in connected:
             print(get_text('controller_detected', name=j.get_name()))
             confirm = input(get_text('controller_use_device')).strip().lower()
             if confirm == "y" or confirm == "":
                 print(get_text('controller_selected', name=j.get_name()))
                 return j
-            else:
-                j.quit()
 
         print(get_text('controller_none_selected'))
         return None
@@ -122,123 +191,324 @@ class ControllerInput:
 
         print(get_text('controller_listening'))
         try:
-            while self.running:
-                try:
-                    # 檢查是否還有有效的事件系統
-                    if not pygame.get_init():
-                        break
-                        
-                    for event in pygame.event.get():
-                        if not self.running:  # 再次檢查運行狀態
-                            break
-                        
-                        # 處理 pygame 關閉事件
-                        if event.type == pygame.QUIT:
-                            self.running = False
-                            break
-                        
-                        last_key_bit = None
-                        last_key_down = None
-
-                        if event.type == pygame.JOYAXISMOTION:
-                            axis = event.axis
-                            val = round(event.value, 4)
-                            last_key_down = True
-                            if abs(val) < 0.15:
-                                val = 0
-                                last_key_down = False
-
-                            if axis == 0:
-                                self.leftX = val
-                            elif axis == 1:
-                                self.leftY = val
-                            else:
-                                continue
-
-                            if DEBUG:
-                                print(get_text('controller_axis_move', axis=event.axis, value=round(event.value, 4)))
-
-                            if self.analog_callback:
-                                try:
-                                    self.analog_callback(buttons=self.buttons,
-                                                         leftX=self.leftX,
-                                                         leftY=self.leftY,
-                                                         last_key_bit=axis,
-                                                         last_key_down=last_key_down)
-                                except Exception as e:
-                                    if self.running:  # 只在仍在運行時報告錯誤
-                                        print(get_text('controller_analog_error', error=e))
-
-                        elif event.type == pygame.JOYBUTTONDOWN:
-                            if DEBUG:
-                                print(get_text('controller_button_press', button=event.button))
-                            self.buttons |= (1 << event.button)
-                            last_key_bit = event.button
-                            last_key_down = True
-
-                            if self.button_callback:
-                                try:
-                                    self.button_callback(buttons=self.buttons,
-                                                         leftX=self.leftX,
-                                                         leftY=self.leftY,
-                                                         last_key_bit=last_key_bit,
-                                                         last_key_down=last_key_down)
-                                except Exception as e:
-                                    if self.running:  # 只在仍在運行時報告錯誤
-                                        print(get_text('controller_button_press_error', error=e))
-
-                        elif event.type == pygame.JOYBUTTONUP:
-                            if DEBUG:
-                                print(get_text('controller_button_release', button=event.button))
-                            self.buttons &= ~(1 << event.button)
-                            last_key_bit = event.button
-                            last_key_down = False
-
-                            if self.button_callback:
-                                try:
-                                    self.button_callback(buttons=self.buttons,
-                                                         leftX=self.leftX,
-                                                         leftY=self.leftY,
-                                                         last_key_bit=last_key_bit,
-                                                         last_key_down=last_key_down)
-                                except Exception as e:
-                                    if self.running:  # 只在仍在運行時報告錯誤
-                                        print(get_text('controller_button_release_error', error=e))
-                
-                except Exception as e:
-                    if self.running:  # 只在仍在運行時報告錯誤
-                        print(get_text('controller_event_error', error=e))
-                    
+            self._event_loop()
         except Exception as e:
             if self.running:
                 print(get_text('controller_thread_error', error=e))
         finally:
             # 確保清理 pygame 資源
+            self._release_joystick()
+            self._close_recorder()
+            if self.raw_axis_events:
+                stats = self.get_input_stats()
+                print(get_text('controller_axis_stats', raw=stats['raw_axis_events'],
+                               emitted=stats['emitted_axis_events'], saved=stats['saved_percentage']))
+            print(get_text('controller_thread_ended'))
+
+    def _event_loop(self):
+        """事件主迴圈：持續取得事件並分派給回呼函式"""
+        while self.running:
             try:
-                if hasattr(self, 'joystick') and self.joystick:
-                    self.joystick.quit()
+                # 檢查是否還有有效的事件系統
+                if not pygame.get_init():
+                    break
+
+                events = self._next_events()
+                # 事件取出時立即以單調高解析度時鐘記錄時間戳，避免回呼分派延遲影響量測
+                # pygame 事件不帶產生時間，同一批事件共用此時間戳（紀錄檔頭的 timestamp_mode 為 "batch"）
+                timestamp_ns = time.perf_counter_ns()
+                for event in events:
+                    if not self.running:  # 再次檢查運行狀態
+                        break
+                    self._handle_event(event, timestamp_ns)
+
+                if self._pending_axes and self._axis_flush_due(time.perf_counter_ns()):
+                    self._flush_axes()
+
+            except Exception as e:
+                if self.running:  # 只在仍在運行時報告錯誤
+                    print(get_text('controller_event_error', error=e))
+
+    def _next_events(self):
+        """
+        取得下一批事件
+        wait 模式：阻塞等待第一個事件（最長 wait_timeout_ms），再一次取出佇列中其餘事件，閒置時幾乎不佔 CPU
+        poll 模式：立即取出佇列中所有事件（舊版忙碌輪詢行為）
+        """
+        if self.input_mode == "wait":
+            return wait_for_events(self._axis_flush_timeout_ms(self.wait_timeout_ms))
+        return pygame.event.get()
+
+    def _axis_flush_timeout_ms(self, timeout_ms):
+        """有待分派的搖桿狀態時，縮短等待時間讓事件迴圈最晚在取樣間隔到期時醒來"""
+        if self._pending_axes and self.analog_sample_interval_ms:
+            elapsed_ms = (time.perf_counter_ns() - self._last_axis_emit_ns) / 1e6
+            timeout_ms = max(1, min(timeout_ms, int(self.analog_sample_interval_ms - elapsed_ms) + 1))
+        return timeout_ms
+
+    def _handle_event(self, event, timestamp_ns):
+        """
+        處理單一 pygame 事件
+        timestamp_ns: 事件從佇列取出時的 time.perf_counter_ns()，會傳給回呼函式
+        """
+        # 處理 pygame 關閉事件
+        if event.type == pygame.QUIT:
+            self.running = False
+            return
+
+        if event.type in (pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED):
+            self._handle_device_event(event, controller_manager.handle_device_event(event))
+            return
+
+        if event.type == pygame.JOYAXISMOTION:
+            axis = event.axis
+            if self.recorder is not None:
+                self.recorder.record(timestamp_ns, EVENT_AXIS, axis, event.value, _event_device(event))
+            if axis != 0 and axis != 1:
+                return
+            self.raw_axis_events += 1
+
+            if DEBUG:
+                print(get_text('controller_axis_move', axis=event.axis, value=round(event.value, 4)))
+
+            if self.analog_sample_interval_ms is not None:
+                self._queue_axis(axis, event.value, timestamp_ns)
+                return
+
+            val, last_key_down = _apply_deadzone(event.value)
+            if axis == 0:
+                self.leftX = val
+            else:
+                self.leftY = val
+
+            self.emitted_axis_events += 1
+            self._emit(timestamp_ns, EVENT_AXIS, axis, last_key_down)
+
+        elif event.type == pygame.JOYBUTTONDOWN:
+            if DEBUG:
+                print(get_text('controller_button_press', button=event.button))
+            # 先送出尚未分派的搖桿狀態，確保按鍵回呼看到的是最新座標
+            if self.recorder is not None:
+                self.recorder.record(timestamp_ns, EVENT_BUTTON_DOWN, event.button, 1.0, _event_device(event))
+            if self._pending_axes:
+                self._flush_axes()
+            self.buttons |= (1 << event.button)
+            self._emit(timestamp_ns, EVENT_BUTTON_DOWN, event.button, True)
+
+        elif event.type == pygame.JOYBUTTONUP:
+            if DEBUG:
+                print(get_text('controller_button_release', button=event.button))
+            if self.recorder is not None:
+                self.recorder.record(timestamp_ns, EVENT_BUTTON_UP, event.button, 0.0, _event_device(event))
+            if self._pending_axes:
+                self._flush_axes()
+            self.buttons &= ~(1 << event.button)
+            self._emit(timestamp_ns, EVENT_BUTTON_UP, event.button, False)
+
+    def _handle_device_event(self, event, added=None):
+        """
+        熱插拔：使用中的手把拔除時清除狀態；同型號（GUID 相同）的手把重新插上時改用新的 Joystick
+        added: 連線池為 JOYDEVICEADDED 開啟的 Joystick
+
+        Returns:
+            bool: 這個事件是否屬於目前的手把（拔除或重新連線）
+        """
+        if event.type == pygame.JOYDEVICEREMOVED:
+            if not self.joystick_connected or event.instance_id != self.joystick_instance_id:
+                return False
+            # 拔除時不會收到放開按鍵／搖桿歸零的事件，避免狀態停留在拔除前
+            self.joystick_connected = False
+            self._pending_axes.clear()
+            self.leftX = 0
+            self.leftY = 0
+            self.buttons = 0
+            print(get_text('controller_disconnected', name=self.joystick.get_name()))
+            return True
+
+        if (added is not None and self._joystick_guid is not None and not self.joystick_connected
+                and added.get_guid() == self._joystick_guid):
+            self.joystick = added
+            self._track_joystick()
+            print(get_text('controller_reconnected', name=added.get_name()))
+            return True
+        return False
+
+    def _queue_axis(self, axis, value, timestamp_ns):
+        """合併模式：只記錄最新的軸值，等到取樣時間到期再一次分派"""
+        was_moving = self.leftX != 0 or self.leftY != 0
+        self._pending_axes[axis] = value
+        self._pending_axis_code = axis
+        self._pending_axis_timestamp_ns = timestamp_ns
+
+        # 靜止與移動之間的切換立即分派，避免延後動作起始時間
+        other = self.leftY if axis == 0 else self.leftX
+        other = self._pending_axes.get(1 - axis, other)
+        is_moving = abs(value) >= DEADZONE or abs(other) >= DEADZONE
+        if is_moving != was_moving:
+            self._flush_axes()
+
+    def _axis_flush_due(self, now_ns):
+        """檢查合併中的搖桿狀態是否已到分派時間"""
+        if not self.analog_sample_interval_ms:
+            return True
+        return now_ns - self._last_axis_emit_ns >= self.analog_sample_interval_ms * 1_000_000
+
+    def _flush_axes(self):
+        """把合併中的軸值套用死區後更新狀態，並分派一次搖桿回呼"""
+        for axis, value in self._pending_axes.items():
+            val, _ = _apply_deadzone(value)
+            if axis == 0:
+                self.leftX = val
+            else:
+                self.leftY = val
+        self._pending_axes.clear()
+
+        self._last_axis_emit_ns = self._pending_axis_timestamp_ns
+        self.emitted_axis_events += 1
+        self._emit(self._pending_axis_timestamp_ns, EVENT_AXIS, self._pending_axis_code,
+                   self.leftX != 0 or self.leftY != 0)
+
+    def mark_start(self):
+        """在原始輸入紀錄中寫入「開始測試」按鈕的點擊標記（Tk 主執行緒呼叫；沒有紀錄時忽略）"""
+        if self.recorder is not None:
+            self.recorder.mark(MARKER_START)
+
+    def _open_recorder(self, record_path):
+        """開啟新的原始輸入紀錄檔（檔頭記錄目前 session 的 random 種子）"""
+        self.recorder = InputRecorder(record_path, session_seed=config.session_seed)
+        print(get_text('controller_recording_input', path=self.recorder.path))
+
+    def _close_recorder(self):
+        """關閉原始輸入紀錄檔"""
+        if self.recorder is not None:
+            try:
+                self.recorder.close()
             except Exception:
                 pass  # 忽略清理過程中的錯誤
-            print(get_text('controller_thread_ended'))
 
-    def stop(self):
-        """停止控制器輸入監聽"""
-        self.running = False
-        
-        # 清理 pygame 資源
+    def get_input_stats(self):
+        """回傳搖桿事件合併統計"""
+        saved = 0.0
+        if self.raw_axis_events:
+            saved = (1 - self.emitted_axis_events / self.raw_axis_events) * 100
+        return {
+            'raw_axis_events': self.raw_axis_events,
+            'emitted_axis_events': self.emitted_axis_events,
+            'saved_percentage': saved,
+            'analog_sample_interval_ms': self.analog_sample_interval_ms,
+            'dropped_events': self.event_buffer.dropped if self.event_buffer is not None else 0
+        }
+
+    def _emit(self, timestamp_ns, kind, code, key_down):
+        """
+        送出一筆已處理的事件
+        有綁定 Tk 視窗時寫入環形緩衝區，由 Tk 主執行緒每幀讀出分派；否則直接在監聽執行緒呼叫回呼
+        """
+        if self.event_buffer is not None:
+            self.event_buffer.push(timestamp_ns, kind, code, key_down,
+                                   self.buttons, self.leftX, self.leftY)
+        else:
+            self._dispatch(timestamp_ns, kind, code, key_down,
+                           self.buttons, self.leftX, self.leftY)
+
+    def _dispatch(self, timestamp_ns, kind, code, key_down, buttons, left_x, left_y):
+        """依事件類型呼叫對應的回呼函式"""
+        if kind == EVENT_AXIS:
+            callback = self.analog_callback
+            error_key = 'controller_analog_error'
+        elif kind == EVENT_BUTTON_DOWN:
+            callback = self.button_callback
+            error_key = 'controller_button_press_error'
+        else:
+            callback = self.button_callback
+            error_key = 'controller_button_release_error'
+
+        if not callback:
+            return
+
         try:
-            if hasattr(self, 'joystick') and self.joystick:
-                self.joystick.quit()
-                self.joystick = None
+            callback(buttons=buttons,
+                     leftX=left_x,
+                     leftY=left_y,
+                     last_key_bit=code,
+                     last_key_down=key_down,
+                     timestamp_ns=timestamp_ns)
+        except Exception as e:
+            if self.running:  # 只在仍在運行時報告錯誤
+                print(get_text(error_key, error=e))
+
+    def _schedule_drain(self):
+        """在 Tk 主執行緒排程下一次緩衝區讀取"""
+        try:
+            self._drain_after_id = self.tk_root.after(self.drain_interval_ms, self._drain_events)
         except Exception:
-            pass  # 忽略清理過程中的錯誤
-        
-        # 清理 pygame - 但不完全關閉，避免其他地方還在使用
+            self._drain_after_id = None  # 視窗已關閉
+
+    def _drain_events(self):
+        """Tk 主執行緒：讀出緩衝區中所有事件並分派給回呼函式（每幀一次）"""
+        self._drain_after_id = None
+        if not self.running:
+            return
+        self.event_buffer.drain(self._dispatch)
+        self._schedule_drain()
+
+    def bind(self, button_callback=None, analog_callback=None, analog_sample_interval_ms=-1, record_path=None):
+        """
+        讓同一個手把監聽改為服務下一個測試（在 Tk 主執行緒呼叫）
+        監聽執行緒與手把連線維持不變；清除上一個測試留下的按鍵／搖桿狀態與尚未分派的事件
+        record_path 指定時，這個測試的原始輸入寫入新的紀錄檔（unbind() 時關閉）
+        """
+        if analog_sample_interval_ms == -1:
+            analog_sample_interval_ms = config.ANALOG_SAMPLE_INTERVAL_MS
+        self.unbind()
+        if record_path is not None:
+            self._open_recorder(record_path)
+        self.leftX = 0
+        self.leftY = 0
+        self.buttons = 0
+        self.analog_sample_interval_ms = analog_sample_interval_ms
+        self._pending_axes.clear()
+        self._pending_axis_code = None
+        self.raw_axis_events = 0
+        self.emitted_axis_events = 0
+        self.button_callback = button_callback
+        self.analog_callback = analog_callback
+
+        # 上一個測試結束時可能已取消所有 Tk 排程，重新開始每幀讀取
+        if self.tk_root is not None:
+            if self._drain_after_id is not None:
+                try:
+                    self.tk_root.after_cancel(self._drain_after_id)
+                except Exception:
+                    pass  # 排程已執行或已取消
+            self._schedule_drain()
+
+    def unbind(self):
+        """解除目前測試的回呼、關閉這個測試的紀錄檔並捨棄尚未分派的事件，手把監聽繼續執行"""
+        self.button_callback = None
+        self.analog_callback = None
+        # 只關閉不清除參照：監聽執行緒可能正要寫入，已關閉的紀錄器會忽略寫入
+        self._close_recorder()
+        if self.event_buffer is not None:
+            self.event_buffer.clear()
+
+    def _release_joystick(self):
+        """釋放手把：連線池管理的手把保持開啟，其他手把（例如重播用的假手把）直接關閉"""
         try:
-            pygame.joystick.quit()
-            # 不調用 pygame.quit()，讓主程式決定何時關閉
+            if getattr(self, 'joystick', None) and not controller_manager.is_pooled(self.joystick):
+                self.joystick.quit()
         except Exception:
             pass  # 忽略清理過程中的錯誤
+
+    def stop(self):
+        """停止控制器輸入監聽"""
+        self.running = False
+        self._close_recorder()
+        
+        # 清理 pygame 資源；連線池中的手把與 joystick 模組保持開啟，讓下一個測試直接使用
+        # 不調用 pygame.quit()，讓主程式決定何時關閉
+        self._release_joystick()
+        self.joystick = None
             
         print(get_text('controller_listening_stopped'))
 
@@ -3,23 +3,36 @@
 """
 import pygame
 import os
+from threading import Lock
 from .language import get_text
 
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
 
-# 確保 pygame 已初始化
-if not pygame.get_init():
-    pygame.init()
-if not pygame.joystick.get_init():
-    pygame.joystick.init()
+
+def ensure_pygame_initialized():
+    """
+    第一次使用手把時才初始化 pygame 與 joystick 模組
+    只載入設定或工具模組的程式（例如測試視窗啟動時）不需要付出初始化成本
+    """
+    if not pygame.get_init():
+        pygame.init()
+    if not pygame.joystick.get_init():
+        pygame.joystick.init()
 
 
 class ControllerManager:
-    """全域遙控器管理器"""
+    """
+    全域遙控器管理器
+    - 已開啟的手把以 instance id 保存在連線池中，整個程式生命週期共用，測試之間不重新開啟裝置
+    - 以 GUID 記住已選擇的手把，拔除後重新插上（instance id 會改變）仍能對應到同一支實體手把
+    - 熱插拔：JOYDEVICEADDED / JOYDEVICEREMOVED 事件由 handle_device_event 更新連線池
+    """
     
     _instance = None
-    _selected_controller_index = None  # 儲存已選擇的控制器索引
+    _selected_controller_index = None  # 選擇時的裝置編號（僅供顯示；重新連線後可能改變）
     _selected_controller_name = None   # 儲存已選擇的控制器名稱
+    _selected_controller_guid = None   # 已選擇手把的 GUID，用來辨識同一支實體手把
+    _selected_instance_id = None       # 已選擇手把目前的 instance id（未連接時為 None）
     _is_initialized = False
     
     def __new__(cls):
@@ -31,41 +44,107 @@ class ControllerManager:
         # 避免重複初始化
         if not self._is_initialized:
             self._is_initialized = True
+            self._joysticks = {}  # {instance_id: 已開啟的 pygame Joystick}
+            self._lock = Lock()   # 監聽執行緒處理熱插拔事件時與主執行緒共用連線池
+    
+    def _open_device(self, device_index):
+        """開啟指定裝置編號的手把並加入連線池（已在池中則直接回傳），回傳 Joystick"""
+        j = pygame.joystick.Joystick(device_index)
+        instance_id = j.get_instance_id()
+        with self._lock:
+            pooled = self._joysticks.get(instance_id)
+            if pooled is not None:
+                return pooled
+            j.init()
+            self._joysticks[instance_id] = j
+        return j
+    
+    def refresh(self):
+        """
+        同步連線池與目前連接的手把：開啟新插入的手把，移除已拔除的手把
+        不呼叫 pygame.joystick.quit()/init()，已開啟的手把維持連線
+        """
+        ensure_pygame_initialized()
+        # 處理佇列中尚未讀取的熱插拔事件（讓 SDL 更新裝置清單）
+        if pygame.display.get_init():
+            for event in pygame.event.get([pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED]):
+                self.handle_device_event(event)
+        
+        connected = [self._open_device(i) for i in range(pygame.joystick.get_count())]
+        connected_ids = {j.get_instance_id() for j in connected}
+        with self._lock:
+            for instance_id in list(self._joysticks):
+                if instance_id not in connected_ids:
+                    self._joysticks.pop(instance_id)
+        self._match_selected()
+        return connected
+    
+    def _match_selected(self):
+        """以 GUID 找回已選擇的手把目前的 instance id"""
+        if self._selected_controller_guid is None:
+            return None
+        with self._lock:
+            if self._selected_instance_id in self._joysticks:
+                return self._joysticks[self._selected_instance_id]
+            for instance_id, j in self._joysticks.items():
+                if j.get_guid() == self._selected_controller_guid:
+                    self._selected_instance_id = instance_id
+                    return j
+            self._selected_instance_id = None
+        return None
+    
+    def handle_device_event(self, event):
+        """
+        處理手把熱插拔事件，更新連線池（可在監聽執行緒呼叫）
+        
+        Returns:
+            pygame.joystick.Joystick | None: JOYDEVICEADDED 時回傳新加入連線池的 Joystick，否則為 None
+        """
+        if event.type == pygame.JOYDEVICEADDED:
+            try:
+                j = self._open_device(event.device_index)
+            except pygame.error:
+                return None  # 事件處理前裝置已再次拔除
+            if (self._selected_controller_guid is not None and self._selected_instance_id is None
+                    and j.get_guid() == self._selected_controller_guid):
+                self._selected_instance_id = j.get_instance_id()
+            return j
+        if event.type == pygame.JOYDEVICEREMOVED:
+            with self._lock:
+                self._joysticks.pop(event.instance_id, None)
+            if event.instance_id == self._selected_instance_id:
+                self._selected_instance_id = None
+        return None
     
     def setup_controller(self, force_setup=False):
         """
-        選擇遙控器（只記錄選擇，不實際連接）
+        選擇遙控器（手把保留在連線池中，之後的測試直接共用）
         """
-        if self._selected_controller_index is not None and not force_setup:
+        if self._selected_controller_guid is not None and not force_setup:
             print(get_text('controller_selected', name=self._selected_controller_name))
             return True
         
         # 重新掃描遙控器
-        pygame.joystick.quit()
-        pygame.joystick.init()
+        connected = self.refresh()
         
-        count = pygame.joystick.get_count()
+        count = len(connected)
         print(get_text('controller_detected_count', count=count))
         
         if count == 0:
             print(get_text('controller_no_gamepad'))
             return False
         
-        for i in range(count):
-            j = pygame.joystick.Joystick(i)
-            j.init()
+        for i, j in enumerate(connected):
             controller_name = j.get_name()
             print(get_text('controller_detected', name=controller_name))
             confirm = input(get_text('controller_use_device')).strip().lower()
             if confirm == "y" or confirm == "":
-                # 只記錄選擇，不保持連接
                 self._selected_controller_index = i
                 self._selected_controller_name = controller_name
+                self._selected_controller_guid = j.get_guid()
+                self._selected_instance_id = j.get_instance_id()
                 print(get_text('controller_selected', name=controller_name))
-                j.quit()  # 立即斷開連接
                 return True
-            else:
-                j.quit()
         
         print(get_text('controller_none_selected'))
         return False
@@ -74,41 +153,65 @@ class ControllerManager:
         """取得已選擇的遙控器資訊"""
         return {
             'index': self._selected_controller_index,
-            'name': self._selected_controller_name
+            'name': self._selected_controller_name,
+            'guid': self._selected_controller_guid,
+            'instance_id': self._selected_instance_id
         }
     
     def is_controller_selected(self):
         """檢查是否已選擇遙控器"""
-        return self._selected_controller_index is not None
+        return self._selected_controller_guid is not None
     
     def create_controller(self):
-        """為測試程式建立新的遙控器實例"""
-        if self._selected_controller_index is None:
+        """取得已選擇的遙控器（連線池中已開啟的手把，不重新初始化裝置）"""
+        if self._selected_controller_guid is None:
             print(get_text('controller_not_selected_yet'))
             return None
         
         # 確保 pygame joystick 已初始化
-        if not pygame.joystick.get_init():
-            pygame.joystick.init()
+        ensure_pygame_initialized()
         
-        count = pygame.joystick.get_count()
-        if count <= self._selected_controller_index:
-            print(get_text('controller_not_exist', index=self._selected_controller_index, count=count))
+        j = self._match_selected()
+        if j is None:
+            # 可能在上次掃描後重新插上，重新同步連線池再找一次
+            self.refresh()
+            j = self._match_selected()
+        if j is None:
+            print(get_text('controller_not_connected', name=self._selected_controller_name,
+                           count=pygame.joystick.get_count()))
             return None
         
-        try:
-            j = pygame.joystick.Joystick(self._selected_controller_index)
-            j.init()
-            print(get_text('controller_connected', name=j.get_name()))
-            return j
-        except Exception as e:
-            print(get_text('controller_connect_failed', error=e))
-            return None
+        print(get_text('controller_connected', name=j.get_name()))
+        return j
+    
+    def acquire_first(self):
+        """取得第一支連接中的手把（未選擇手把時自動配對使用）"""
+        connected = self.refresh()
+        return connected[0] if connected else None
+    
+    def is_pooled(self, joystick):
+        """檢查手把是否由連線池管理（由連線池管理的手把不可由使用者自行 quit）"""
+        with self._lock:
+            return any(j is joystick for j in self._joysticks.values())
+    
+    def close(self):
+        """程式結束時關閉連線池中所有手把"""
+        with self._lock:
+            joysticks = list(self._joysticks.values())
+            self._joysticks.clear()
+        for j in joysticks:
+            try:
+                j.quit()
+            except Exception:
+                pass  # 忽略清理過程中的錯誤
+        self._selected_instance_id = None
     
     def reset(self):
         """重置選擇狀態"""
         self._selected_controller_index = None
         self._selected_controller_name = None
+        self._selected_controller_guid = None
+        self._selected_instance_id = None
 
 
 # 建立全域實例
@@ -0,0 +1,88 @@
+"""
+手把事件環形緩衝區
+- 監聽執行緒（唯一寫入者）將事件寫入，Tk 主執行緒（唯一讀取者）每幀讀出並分派
+- 以預先配置的 array 儲存精簡事件紀錄，執行中不產生額外物件
+- 單一生產者／單一消費者：寫入索引只由生產者更新、讀取索引只由消費者更新，不需加鎖
+"""
+from array import array
+
+# 事件類型
+EVENT_AXIS = 1
+EVENT_BUTTON_DOWN = 2
+EVENT_BUTTON_UP = 3
+
+
+class EventRingBuffer:
+    """固定容量的手把事件環形緩衝區"""
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        # 每個欄位一個預先配置的陣列（struct-of-arrays）
+        self.timestamps = array('q', [0]) * capacity  # perf_counter_ns
+        self.kinds = array('b', [0]) * capacity       # EVENT_*
+        self.codes = array('h', [0]) * capacity       # 軸編號或按鍵編號
+        self.key_down = array('b', [0]) * capacity    # 按下 / 超出死區
+        self.buttons = array('Q', [0]) * capacity     # 事件當下的按鍵位元狀態
+        self.left_x = array('d', [0.0]) * capacity
+        self.left_y = array('d', [0.0]) * capacity
+
+        self._write_index = 0  # 只由生產者遞增
+        self._read_index = 0   # 只由消費者遞增
+        self.dropped = 0       # 緩衝區已滿而捨棄的事件數
+
+    def __len__(self):
+        return self._write_index - self._read_index
+
+    def push(self, timestamp_ns, kind, code, key_down, buttons, left_x, left_y):
+        """
+        寫入一筆事件（只可由監聽執行緒呼叫）
+        緩衝區已滿時捨棄新事件並回傳 False，不覆寫尚未讀取的資料
+        """
+        write_index = self._write_index
+        if write_index - self._read_index >= self.capacity:
+            self.dropped += 1
+            return False
+
+        slot = write_index % self.capacity
+        self.timestamps[slot] = timestamp_ns
+        self.kinds[slot] = kind
+        self.codes[slot] = code
+        self.key_down[slot] = 1 if key_down else 0
+        self.buttons[slot] = buttons
+        self.left_x[slot] = left_x
+        self.left_y[slot] = left_y
+
+        # 資料寫完後才發布新的寫入索引，讀取端不會看到寫到一半的紀錄
+        self._write_index = write_index + 1
+        return True
+
+    def drain(self, handler, max_events=None):
+        """
+        讀出目前所有已發布的事件並逐筆呼叫 handler（只可由 Tk 主執行緒呼叫）
+        handler(timestamp_ns, kind, code, key_down, buttons, left_x, left_y)
+
+        Returns:
+            int: 本次讀出的事件數
+        """
+        read_index = self._read_index
+        end_index = self._write_index
+        if max_events is not None:
+            end_index = min(end_index, read_index + max_events)
+
+        count = end_index - read_index
+        while read_index < end_index:
+            slot = read_index % self.capacity
+            handler(self.timestamps[slot],
+                    self.kinds[slot],
+                    self.codes[slot],
+                    bool(self.key_down[slot]),
+                    self.buttons[slot],
+                    self.left_x[slot],
+                    self.left_y[slot])
+            read_index += 1
+            self._read_index = read_index
+        return count
+
+    def clear(self):
+        """捨棄所有尚未讀取的事件（只可由消費者呼叫）"""
+        self._read_index = self._write_index
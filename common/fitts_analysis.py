@@ -0,0 +1,188 @@
+"""
+Fitts' law 吞吐量分析 - ISO 9241-9 有效寬度法，用於搖桿移動測試（analog_move）
+- 起點：目標出現時的玩家位置（spawn_position）；舊結果沒有此欄位時，沿第一個軌跡點的方向回推 initial_distance
+- 端點：每個 trial 最後一次確認按鍵的位置（press_locations），投影到起點→目標方向得到偏移 dx
+- 每個條件（距離 × 目標大小）：有效寬度 We = 4.133 × SD(dx)、有效距離 De = 平均(起點到目標距離 + dx)、
+  有效難度 IDe = log2(De / We + 1)、吞吐量 TP = IDe / 平均移動時間
+- 整體吞吐量為各條件吞吐量的平均；另以各條件平均值做 MT = a + b × ID 的線性迴歸（名目 ID 與有效 IDe）
+- 所有 trial 一次以 numpy 陣列計算；可批次分析已封存的結果檔案
+用法：
+    python -m common.fitts_analysis --user P001
+    python -m common.fitts_analysis data/results/P001/analog_move_20250101_120000.json ...
+"""
+import argparse
+import math
+
+from .language import get_text, set_language
+
+EFFECTIVE_WIDTH_FACTOR = 4.133  # We = 4.133 × SD，對應 96% 的端點落在目標內
+
+
+def _spawn_position(trial):
+    """
+    目標出現時的玩家位置
+    joystick_trajectory.start_position 是第一個模擬步長之後的位置，直接當起點會低估距離；
+    舊結果只能以它決定方向，再從目標往回推 initial_distance
+    """
+    if trial.get("spawn_position") is not None:
+        return trial["spawn_position"]
+    tx, ty = trial["target_x"], trial["target_y"]
+    sx, sy = trial["joystick_trajectory"]["start_position"]
+    length = math.hypot(tx - sx, ty - sy)
+    if length == 0:
+        return sx, sy
+    scale = trial["initial_distance"] / length
+    return tx - (tx - sx) * scale, ty - (ty - sy) * scale
+
+
+def _trial_arrays(trials):
+    """把 trial 列表轉成 numpy 陣列：起點、目標、端點、移動時間（秒）、條件名稱、目標寬度"""
+    import numpy as np
+    starts, targets, endpoints, times, conditions, widths = [], [], [], [], [], []
+    for trial in trials:
+        presses = trial["press_locations"]["coordinates"]
+        presses = getattr(presses, "values", presses)  # 儲存前為 Columnar，讀回後為陣列
+        if len(presses) == 0:
+            continue
+        starts.append(_spawn_position(trial))
+        targets.append((trial["target_x"], trial["target_y"]))
+        endpoints.append(presses[-1])  # 成功的那一次按鍵
+        times.append(trial["completion_time_ms"] / 1000)
+        conditions.append(f"{trial.get('distance_type', 'unknown')}_{trial.get('size_type', 'unknown')}")
+        widths.append(trial["target_radius"] * 2)
+    return (np.asarray(starts, dtype=float).reshape(-1, 2), np.asarray(targets, dtype=float).reshape(-1, 2),
+            np.asarray(endpoints, dtype=float).reshape(-1, 2), np.asarray(times, dtype=float),
+            np.asarray(conditions), np.asarray(widths, dtype=float))
+
+
+def _regression(x, y):
+    """最小平方法線性迴歸 y = a + b × x，回傳 {"intercept_s", "slope_s_per_bit", "r_squared"}"""
+    import numpy as np
+    if len(x) < 2 or np.ptp(x) == 0:
+        return None
+    slope, intercept = np.polyfit(x, y, 1)
+    residual = y - (intercept + slope * x)
+    total = np.sum((y - y.mean()) ** 2)
+    r_squared = 1 - np.sum(residual ** 2) / total if total > 0 else 1.0
+    return {"intercept_s": float(intercept), "slope_s_per_bit": float(slope), "r_squared": float(r_squared)}
+
+
+def fitts_analysis(trials):
+    """
+    計算各條件的有效寬度、有效難度與吞吐量，以及 MT 對 ID 的迴歸
+
+    Args:
+        trials: analog_move 結果中的 trials（正式測試，不含暖身）
+
+    Returns:
+        dict: {"conditions": {...}, "throughput_bits_per_s", "regression": {"nominal", "effective"}}；
+              沒有可分析的 trial 時為 None
+    """
+    import numpy as np
+    starts, targets, endpoints, times, conditions, widths = _trial_arrays(trials)
+    if len(times) == 0:
+        return None
+
+    # 端點沿起點→目標方向的偏移（正值為超過目標中心）
+    axis = targets - starts
+    distances = np.hypot(axis[:, 0], axis[:, 1])
+    safe = np.where(distances > 0, distances, 1)
+    dx = np.einsum('ij,ij->i', endpoints - targets, axis / safe[:, None])
+    effective_distances = distances + dx
+
+    table = {}
+    for name in sorted(set(conditions.tolist())):
+        mask = conditions == name
+        count = int(mask.sum())
+        distance = float(distances[mask].mean())
+        width = float(widths[mask].mean())
+        movement_time = float(times[mask].mean())
+        row = {
+            "count": count,
+            "nominal_distance_px": distance,
+            "target_width_px": width,
+            "id_bits": math.log2(distance / width + 1),
+            "movement_time_s": movement_time,
+            "effective_distance_px": float(effective_distances[mask].mean()),
+            "endpoint_sd_px": None,
+            "effective_width_px": None,
+            "effective_id_bits": None,
+            "throughput_bits_per_s": None,
+        }
+        if count >= 2:  # 標準差至少需要兩個端點
+            sd = float(dx[mask].std(ddof=1))
+            row["endpoint_sd_px"] = sd
+            if sd > 0:
+                row["effective_width_px"] = EFFECTIVE_WIDTH_FACTOR * sd
+                row["effective_id_bits"] = math.log2(row["effective_distance_px"] / row["effective_width_px"] + 1)
+                if movement_time > 0:
+                    row["throughput_bits_per_s"] = row["effective_id_bits"] / movement_time
+        table[name] = row
+
+    rows = list(table.values())
+    throughputs = [row["throughput_bits_per_s"] for row in rows if row["throughput_bits_per_s"] is not None]
+    effective = [row for row in rows if row["effective_id_bits"] is not None]
+    return {
+        "method": "ISO 9241-9 effective width (We = 4.133 × SD)",
+        "conditions": table,
+        "throughput_bits_per_s": sum(throughputs) / len(throughputs) if throughputs else None,
+        "regression": {
+            "nominal": _regression(np.array([row["id_bits"] for row in rows]),
+                                   np.array([row["movement_time_s"] for row in rows])),
+            "effective": _regression(np.array([row["effective_id_bits"] for row in effective]),
+                                     np.array([row["movement_time_s"] for row in effective])),
+        },
+    }
+
+
+def analyze_sessions(paths):
+    """
+    批次分析已儲存的 analog_move 結果檔（軌跡 sidecar 以 memmap 讀回，不複製資料）
+    也適用於加入 fitts_analysis 欄位之前的舊結果
+
+    Returns:
+        list: [(路徑, 使用者 ID, 分析結果)]
+    """
+    from .result_saver import load_result_file
+    rows = []
+    for path in paths:
+        result = load_result_file(path)
+        rows.append((path, result.get("user_id"), fitts_analysis(result["metrics"].get("trials", []))))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=get_text('fitts_description'))
+    parser.add_argument("files", nargs="*", help=get_text('arg_fitts_files'))
+    parser.add_argument("--user", "-u", default=None, help=get_text('arg_fitts_user'))
+    parser.add_argument("--results-dir", default=None, help=get_text('arg_aggregate_results_dir'))
+    parser.add_argument("--english", action="store_true", help=get_text('arg_english'))
+    args = parser.parse_args()
+
+    if args.english:
+        set_language('en')
+
+    paths = list(args.files)
+    if not paths:
+        from .result_aggregator import list_result_files
+        from .result_index import query_results
+        if args.user:
+            paths = query_results(args.user, "analog_move", results_dir=args.results_dir, read_only=True)
+        else:
+            paths = list_result_files("analog_move", args.results_dir)
+
+    print(f"{'user':<16}{'TP bits/s':>12}{'a (s)':>10}{'b (s/bit)':>12}{'r²':>8}   file")
+    for path, user_id, analysis in analyze_sessions(paths):
+        if analysis is None or analysis["throughput_bits_per_s"] is None:
+            print(f"{str(user_id):<16}{'-':>12}{'-':>10}{'-':>12}{'-':>8}   {path}")
+            continue
+        regression = analysis["regression"]["effective"] or {}
+        print(f"{str(user_id):<16}{analysis['throughput_bits_per_s']:>12.2f}"
+              f"{regression.get('intercept_s', float('nan')):>10.3f}"
+              f"{regression.get('slope_s_per_bit', float('nan')):>12.3f}"
+              f"{regression.get('r_squared', float('nan')):>8.2f}   {path}")
+    print(get_text('fitts_analyzed', count=len(paths)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+固定時間步長的模擬迴圈
+- 在 Tk 主執行緒上以 root.after 排程，每幀以單調時鐘量測實際經過的時間
+- 經過時間累積滿一個步長才執行一次模擬；幀延遲時在同一幀補跑多個步長
+- 模擬時間因此與真實時間一致，完成時間與偏離時間不會隨機器負載漂移
+"""
+import math
+import time
+
+from . import config
+
+
+class FixedTimestepLoop:
+    """
+    固定步長模擬迴圈
+    step_callback(dt) 每個模擬步長呼叫一次，dt 固定為 step_ms / 1000 秒
+    """
+
+    def __init__(self, root, step_callback, step_ms=None, max_catch_up_steps=None):
+        self.root = root
+        self.step_callback = step_callback
+        self.step_seconds = (step_ms if step_ms is not None else config.SIMULATION_STEP_MS) / 1000
+        self.max_catch_up_steps = max_catch_up_steps or config.SIMULATION_MAX_CATCH_UP_STEPS
+
+        self.frame_dt = 0.0          # 最近一幀的實際間隔（秒）
+        self.late_frames = 0         # 需要補跑多個步長的幀數
+        self.dropped_seconds = 0.0   # 超過補跑上限而捨棄的時間（秒）
+        self.running = False
+
+        self._accumulator = 0.0
+        self._last_time = None
+        self._after_id = None
+
+    def start(self):
+        """（重新）開始迴圈，之前累積的時間與時間統計都不會帶入（每個 trial 各自統計）"""
+        self.stop()
+        self.running = True
+        self.late_frames = 0
+        self.dropped_seconds = 0.0
+        self._accumulator = 0.0
+        self._last_time = time.perf_counter()
+        self._schedule()
+
+    def stop(self):
+        self.running = False
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass  # 視窗已關閉
+            self._after_id = None
+
+    def _schedule(self):
+        """排程到下一個步長到期的時間"""
+        delay_ms = max(1, math.ceil((self.step_seconds - self._accumulator) * 1000))
+        try:
+            self._after_id = self.root.after(delay_ms, self._tick)
+        except Exception:
+            self.running = False  # 視窗已關閉
+
+    def _tick(self):
+        self._after_id = None
+        if not self.running:
+            return
+
+        now = time.perf_counter()
+        self.frame_dt = now - self._last_time
+        self._last_time = now
+        self._accumulator += self.frame_dt
+
+        steps = 0
+        # 容許極小的浮點誤差，避免剛好到期的幀被延到下一幀
+        while self.running and self._accumulator + 1e-9 >= self.step_seconds:
+            if steps >= self.max_catch_up_steps:
+                # 落後太多（例如視窗被拖曳而暫停），捨棄剩餘時間以免畫面瞬移
+                self.dropped_seconds += self._accumulator
+                self._accumulator = 0.0
+                break
+            self._accumulator -= self.step_seconds
+            self.step_callback(self.step_seconds)
+            steps += 1
+
+        if steps > 1:
+            self.late_frames += 1
+        if self.running:
+            self._schedule()
+
+    def get_timing_stats(self):
+        """
+        回傳自上次 start() 以來的迴圈時間統計
+        dropped_seconds > 0 時模擬時間比真實時間短（超過補跑上限的時間沒有模擬），degraded 為 True
+        """
+        return {
+            'simulation_step_seconds': self.step_seconds,
+            'late_frames': self.late_frames,
+            'dropped_seconds': self.dropped_seconds,
+            'degraded': self.dropped_seconds > 0,
+        }
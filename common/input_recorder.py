@@ -0,0 +1,183 @@
+"""
+原始手把輸入紀錄器
+- 以固定長度的二進位紀錄逐筆附加寫入，保留監聽執行緒收到的每一個軸／按鍵事件
+- 每個測試 session 一個檔案：檔頭 + N 筆 16 bytes 紀錄；只建立新檔，不會附加到既有紀錄檔的檔頭之後
+- 時間戳為監聽執行緒取出一批事件時的 perf_counter_ns，同一批事件共用一個時間戳
+  （解析度受等待喚醒延遲限制，不是手把實際產生事件的時間），檔頭的 timestamp_mode 記錄此語意
+- 重播所需的 session 資訊：檔頭記錄 session 的 random 種子，點擊「開始測試」按鈕時寫入一筆標記紀錄
+  （第 1 版紀錄檔沒有這些資訊，重播時目標位置與開始時間無法與錄製時相同）
+- 讀取時以記憶體映射（memmap）取得 NumPy 欄式檢視，不需解析或複製
+"""
+import os
+import struct
+import threading
+import time
+
+from .event_buffer import EVENT_AXIS, EVENT_BUTTON_DOWN, EVENT_BUTTON_UP
+
+MAGIC = b"STINPUT1"
+FORMAT_VERSION = 2
+
+# 檔頭：magic、格式版本、單筆紀錄大小、時間戳語意、開始錄製時的 Unix 時間、對應的 perf_counter_ns、
+# session 的 random 種子（-1 表示未記錄；第 1 版檔頭沒有此欄位）
+HEADER_STRUCTS = {
+    1: struct.Struct("<8sHHIdq"),   # 32 bytes
+    2: struct.Struct("<8sHHIdqq"),  # 40 bytes
+}
+HEADER_STRUCT = HEADER_STRUCTS[FORMAT_VERSION]
+HEADER_SIZE = HEADER_STRUCT.size
+_VERSION_STRUCT = struct.Struct("<8sH")
+NO_SEED = -1
+
+# 時間戳語意（檔頭欄位；舊紀錄檔此欄位為 0）
+TIMESTAMP_MODES = {
+    0: "unknown",
+    1: "batch",  # 一批事件取出時的時間，同一批事件相同
+}
+TIMESTAMP_BATCH = 1
+
+# 紀錄：timestamp_ns (int64)、value (float32)、code (int16)、kind (uint8)、device (uint8)
+RECORD_STRUCT = struct.Struct("<qfhBB")
+RECORD_SIZE = RECORD_STRUCT.size  # 16 bytes
+
+# 與 RECORD_STRUCT 對應的 NumPy 結構化型別（欄位順序與位元組排列相同）
+RECORD_DTYPE = [
+    ('timestamp_ns', '<i8'),
+    ('value', '<f4'),
+    ('code', '<i2'),
+    ('kind', 'u1'),
+    ('device', 'u1'),
+]
+
+# 標記紀錄（不是手把事件）：code 為標記種類，value 不使用
+KIND_MARKER = 4
+MARKER_START = 1  # 點擊「開始測試」按鈕
+
+KIND_NAMES = {
+    EVENT_AXIS: "axis",
+    EVENT_BUTTON_DOWN: "button_down",
+    EVENT_BUTTON_UP: "button_up",
+    KIND_MARKER: "marker",
+}
+
+
+class InputRecorder:
+    """
+    附加寫入的原始輸入紀錄檔
+    手把事件由監聽執行緒寫入，標記由 Tk 主執行緒寫入，以鎖避免兩者同時寫入
+    path 已存在時改用加上序號的檔名（例如 20250101_120000_000_1.stin），實際路徑見 self.path
+    session_seed 為這次 session 的 random 種子（見 utils.seed_session），寫入檔頭供重播使用
+    """
+
+    def __init__(self, path, session_seed=None):
+        os.makedirs(os.path.dirname(str(path)) or ".", exist_ok=True)
+        self.record_count = 0
+        self.session_seed = session_seed
+
+        self._pack = RECORD_STRUCT.pack
+        self._lock = threading.Lock()
+        self.path, self._file = _create_unique(str(path))
+        self._file.write(HEADER_STRUCT.pack(MAGIC, FORMAT_VERSION, RECORD_SIZE, TIMESTAMP_BATCH,
+                                            time.time(), time.perf_counter_ns(),
+                                            NO_SEED if session_seed is None else session_seed))
+
+    def record(self, timestamp_ns, kind, code, value, device=0):
+        """寫入一筆事件紀錄"""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(self._pack(timestamp_ns, value, code, kind, device & 0xFF))
+            self.record_count += 1
+
+    def mark(self, code, timestamp_ns=None):
+        """寫入一筆標記紀錄（時間預設為現在的 perf_counter_ns）"""
+        if timestamp_ns is None:
+            timestamp_ns = time.perf_counter_ns()
+        self.record(timestamp_ns, KIND_MARKER, code, 0.0)
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        """關閉紀錄檔（可重複呼叫）"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _create_unique(path):
+    """以獨占模式建立新檔；檔名已存在時依序加上 _1、_2 …"""
+    base, ext = os.path.splitext(path)
+    candidate, counter = path, 0
+    while True:
+        try:
+            return candidate, open(candidate, "xb")
+        except FileExistsError:
+            counter += 1
+            candidate = f"{base}_{counter}{ext}"
+
+
+def default_record_path(user_id=None):
+    """依照 data/raw_input/user_id/timestamp.stin 結構產生紀錄檔路徑（時間精確到毫秒）"""
+    from . import config
+    now = time.time()
+    timestamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(now))
+    millis = int(now * 1000) % 1000
+    return os.path.join(config.RAW_INPUT_DIR, user_id or "default", f"{timestamp}_{millis:03d}.stin")
+
+
+def read_input_log_header(path):
+    """讀取紀錄檔檔頭（session_seed 在第 1 版紀錄檔或未記錄時為 None）"""
+    with open(path, "rb") as f:
+        raw = f.read(max(header.size for header in HEADER_STRUCTS.values()))
+    if len(raw) < _VERSION_STRUCT.size:
+        raise ValueError(f"{path}: file too short for an input log header")
+    magic, version = _VERSION_STRUCT.unpack_from(raw)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not an input log (bad magic {magic!r})")
+    header_struct = HEADER_STRUCTS.get(version)
+    if header_struct is None:
+        raise ValueError(f"{path}: unsupported input log version {version}")
+    if len(raw) < header_struct.size:
+        raise ValueError(f"{path}: file too short for an input log header")
+
+    fields = header_struct.unpack_from(raw)
+    _, _, record_size, timestamp_mode, start_wall_time, start_perf_ns = fields[:6]
+    session_seed = fields[6] if len(fields) > 6 and fields[6] != NO_SEED else None
+    if record_size != RECORD_SIZE:
+        raise ValueError(f"{path}: unsupported record size {record_size}")
+    return {
+        "format_version": version,
+        "header_size": header_struct.size,
+        "record_size": record_size,
+        "timestamp_mode": TIMESTAMP_MODES.get(timestamp_mode, "unknown"),
+        "start_wall_time": start_wall_time,
+        "start_perf_ns": start_perf_ns,
+        "session_seed": session_seed,
+    }
+
+
+def load_input_log(path):
+    """
+    以記憶體映射載入原始輸入紀錄檔
+
+    Returns:
+        dict: 'header' 為檔頭資訊，其餘為各欄位的 NumPy 陣列檢視
+              ('timestamp_ns', 'value', 'code', 'kind', 'device')，共用同一塊映射記憶體
+    """
+    import numpy as np
+
+    header = read_input_log_header(path)
+    # 錄製中斷時最後一筆可能不完整，只映射完整的紀錄
+    header_size = header["header_size"]
+    count = (os.path.getsize(path) - header_size) // RECORD_SIZE
+    if count > 0:
+        records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=header_size, shape=(count,))
+    else:
+        records = np.empty(0, dtype=RECORD_DTYPE)
+
+    columns = {name: records[name] for name, _ in RECORD_DTYPE}
+    columns["header"] = header
+    return columns
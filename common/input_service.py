@@ -0,0 +1,189 @@
+"""
+多手把輸入服務 - 同一個行程內讓多位受試者同時進行測試
+- 只有一個監聽執行緒讀取 pygame 事件，依事件的 instance_id 分派給對應受試者的頻道
+- 每位受試者的頻道是一個 ControllerInput（各自的按鍵／搖桿狀態、事件合併設定與 Tk 環形緩衝區），
+  測試 App 的回呼與單人測試完全相同
+- 手把熱插拔：拔除時只影響該頻道；同型號手把重新插上時由仍在等待重新連線的頻道接手
+- pygame 事件佇列只由監聽執行緒讀取：其他執行緒需要重新整理手把清單時呼叫 refresh_devices()，
+  由監聽執行緒在兩批事件之間執行
+用法：
+    service = ControllerInputService()
+    channel = service.attach(joystick, button_callback=app.on_joycon_input, tk_root=window)
+    service.start()
+    ...
+    service.stop()
+"""
+import signal
+import sys
+import time
+from concurrent.futures import Future, wait
+from threading import Lock, Thread
+
+import pygame
+
+from . import config
+from .controller_input import ControllerInput, wait_for_events, _event_device
+from .controller_manager import controller_manager, ensure_pygame_initialized
+from .language import get_text
+
+# 喚醒阻塞在 pygame.event.wait 的監聽執行緒，讓它處理其他執行緒的請求
+_WAKE_EVENT = pygame.event.custom_type()
+
+
+class ControllerInputService:
+    """以一個事件迴圈服務多支手把的輸入服務"""
+
+    def __init__(self, input_mode=None, wait_timeout_ms=None):
+        ensure_pygame_initialized()
+        self.input_mode = input_mode or config.CONTROLLER_INPUT_MODE
+        self.wait_timeout_ms = wait_timeout_ms if wait_timeout_ms is not None else config.CONTROLLER_WAIT_TIMEOUT_MS
+        self.running = True
+        self.channels = []
+        self._routes = {}  # {instance_id: 頻道}
+        self._lock = Lock()  # attach / detach 在主執行緒，事件分派在監聽執行緒
+        self._thread = None
+        self._refresh_requests = []  # 等待監聽執行緒執行的手把清單重新整理
+
+        # 註冊 signal handler 來處理程式意外關閉（各頻道不另外註冊）
+        signal.signal(signal.SIGINT, self._signal_handler)
+        signal.signal(signal.SIGTERM, self._signal_handler)
+
+    def _signal_handler(self, signum, frame):
+        """處理系統信號，確保正常關閉"""
+        print(get_text('controller_signal_received', signum=signum))
+        self.stop()
+        sys.exit(0)
+
+    def attach(self, joystick, button_callback=None, analog_callback=None, tk_root=None,
+               analog_sample_interval_ms=-1, record_path=None):
+        """
+        為一支手把建立頻道（joystick 為 None 時建立不會收到事件的頻道）
+
+        Returns:
+            ControllerInput: 可與單人測試相同地 bind() / unbind() 的頻道
+        """
+        channel = ControllerInput(button_callback=button_callback, analog_callback=analog_callback,
+                                  tk_root=tk_root, analog_sample_interval_ms=analog_sample_interval_ms,
+                                  record_path=record_path, shared_loop=True, joystick=joystick)
+        with self._lock:
+            self.channels.append(channel)
+            self._update_routes()
+        return channel
+
+    def detach(self, channel):
+        """移除頻道並停止它的回呼分派（手把仍保留在連線池中）"""
+        with self._lock:
+            if channel in self.channels:
+                self.channels.remove(channel)
+            self._update_routes()
+        channel.stop()
+
+    def _update_routes(self):
+        """依各頻道目前的 instance id 重建分派表（呼叫前需持有 _lock）"""
+        self._routes = {channel.joystick_instance_id: channel for channel in self.channels
+                        if channel.joystick_connected}
+
+    def start(self):
+        """在背景執行緒啟動事件迴圈"""
+        if self._thread is None:
+            self._thread = Thread(target=self.run, daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def run(self):
+        """事件主迴圈：讀取所有手把的事件並分派給對應的頻道"""
+        print(get_text('input_service_listening', count=len(self.channels)))
+        try:
+            while self.running:
+                if not pygame.get_init():
+                    break
+                try:
+                    events = self._next_events()
+                    # 事件取出時立即記錄時間戳，同一批事件不論屬於哪位受試者都使用相同的時間
+                    timestamp_ns = time.perf_counter_ns()
+                    for event in events:
+                        if not self.running:
+                            break
+                        self._route(event, timestamp_ns)
+
+                    now_ns = time.perf_counter_ns()
+                    for channel in list(self._routes.values()):
+                        if channel._pending_axes and channel._axis_flush_due(now_ns):
+                            channel._flush_axes()
+                    self._run_refresh_requests()
+                except Exception as e:
+                    if self.running:  # 只在仍在運行時報告錯誤
+                        print(get_text('controller_event_error', error=e))
+        finally:
+            self._run_refresh_requests()  # 迴圈結束前仍要回應等待中的請求
+            print(get_text('controller_thread_ended'))
+
+    def refresh_devices(self):
+        """
+        重新整理手把連線池（controller_manager.refresh），回傳目前連接的手把
+        監聽執行緒執行中時交給它執行，避免兩個執行緒同時讀取 pygame 事件佇列；尚未啟動時直接執行
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return controller_manager.refresh()
+        request = Future()
+        with self._lock:
+            self._refresh_requests.append(request)
+        pygame.event.post(pygame.event.Event(_WAKE_EVENT))
+        while not request.done():
+            if not self._thread.is_alive():
+                self._run_refresh_requests()  # 監聽執行緒在取走請求前就結束了
+                break
+            wait([request], timeout=0.1)
+        return request.result()
+
+    def _run_refresh_requests(self):
+        """在監聽執行緒上執行等待中的手把清單重新整理"""
+        with self._lock:
+            requests, self._refresh_requests = self._refresh_requests, []
+        for request in requests:
+            try:
+                request.set_result(controller_manager.refresh())
+            except Exception as e:
+                request.set_exception(e)
+
+    def _next_events(self):
+        """取得下一批事件；等待時間不超過任何頻道合併中搖桿狀態的分派期限"""
+        if self.input_mode != "wait":
+            return pygame.event.get()
+        timeout_ms = self.wait_timeout_ms
+        for channel in list(self._routes.values()):
+            timeout_ms = channel._axis_flush_timeout_ms(timeout_ms)
+        return wait_for_events(timeout_ms)
+
+    def _route(self, event, timestamp_ns):
+        """把單一事件交給來源手把的頻道處理"""
+        if event.type == pygame.QUIT:
+            self.running = False
+            return
+
+        if event.type == _WAKE_EVENT:
+            return
+
+        if event.type in (pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED):
+            added = controller_manager.handle_device_event(event)
+            with self._lock:
+                # 同型號手把可能有多支：只交給第一個接受的頻道
+                for channel in self.channels:
+                    if channel._handle_device_event(event, added):
+                        break
+                self._update_routes()
+            return
+
+        channel = self._routes.get(_event_device(event))
+        if channel is not None:
+            channel._handle_event(event, timestamp_ns)
+
+    def stop(self):
+        """停止事件迴圈與所有頻道"""
+        self.running = False
+        with self._lock:
+            channels = list(self.channels)
+            self.channels.clear()
+            self._routes = {}
+        for channel in channels:
+            channel.stop()
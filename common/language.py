@@ -84,6 +84,11 @@ LANGUAGES = {
         'thank_you': "感謝使用！",
         'running_full_suite': "執行完整測試套件 (使用者: {user_id})...",
         'running_test': "執行測試 {num}...",
+        'test_runner_ready': "⚡ 測試 {name} 已開啟（{ms:.0f} ms）",
+        'suite_progress': "▶️ 完整測試套件 {index}/{total}：{name}",
+        'suite_complete': "🏁 完整測試套件結束：{completed}/{total} 項測試已儲存結果",
+        'session_manifest_saved': "已儲存 session 清單",
+        'menu_full_suite': "完整測試套件（依序執行 1-6）",
         'invalid_test_number': "無效的測試編號",
         
         # 使用者資訊收集
@@ -128,11 +133,26 @@ LANGUAGES = {
         'controller_event_error': "⚠️ 處理事件時發生錯誤: {error}",
         'controller_thread_error': "❌ 控制器執行緒發生嚴重錯誤: {error}",
         'controller_thread_ended': "🔄 控制器監聽執行緒已安全結束",
+        'controller_recording_input': "💾 原始手把輸入紀錄中：{path}",
+        'controller_axis_stats': "📊 搖桿事件：原始 {raw} 筆，分派 {emitted} 筆（合併省下 {saved:.1f}%）",
+        'replay_started': "⏩ 重播 {path}（{count} 筆事件）",
+        'replay_summary': "✅ 重播完成：虛擬時間 {virtual:.1f} 秒，實際耗時 {wall:.2f} 秒（{speedup:.0f} 倍速），回呼錯誤 {errors} 個",
+        'replay_no_session_seed': "⚠️ {path} 沒有記錄 session 種子，隨機內容與錄製時不同（結果不可用來重新計分）",
+        'replay_no_start_marker': "⚠️ {path} 沒有「開始測試」標記，改在重播開始時點擊（結果不可用來重新計分）",
         'controller_listening_stopped': "🔄 控制器輸入監聽已停止",
         'controller_use_device': "要使用這個裝置嗎？(Y/n): ",
         'controller_not_selected_yet': "❌ 尚未選擇遙控器",
         'controller_not_exist': "❌ 遙控器 {index} 不存在，當前有 {count} 支手把",
         'controller_connected': "🎮 已連接遙控器：{name}",
+        'controller_not_connected': "❌ 已選擇的遙控器 {name} 目前未連接，當前有 {count} 支手把",
+        'controller_disconnected': "⚠️ 遙控器已中斷連線：{name}",
+        'controller_reconnected': "🎮 遙控器已重新連線：{name}",
+        'input_service_listening': "🎮 開始監聽手把事件（{count} 位受試者共用同一個事件迴圈）... (Ctrl+C 中止)",
+        'concurrent_not_enough_controllers': "❌ 多人測試需要 {needed} 支手把，目前只連接 {count} 支",
+        'concurrent_participant_ready': "🎮 受試者 {user_id} 使用手把：{name}",
+        'menu_concurrent': "多人同時測試（每位受試者一支手把）",
+        'concurrent_choose_test': "請選擇要同時進行的測試 (1-6): ",
+        'concurrent_enter_user_ids': "請輸入所有受試者 ID（以逗號分隔）: ",
                 'controller_connect_failed': "❌ Failed to connect controller: {error}",
         
         # Trace plot related
@@ -165,6 +185,9 @@ LANGUAGES = {
         'trace_image_saved': "已儲存：{path}",
         'trace_no_path_data': "路徑 {index} 無軌跡資料",
         'trace_path_saved': "已儲存路徑 {index} 軌跡圖：{path}",
+        'trace_worker_unavailable': "⚠️ 無法啟動背景繪圖程序，改為同步繪製：{error}",
+        'trace_render_failed': "❌ 軌跡圖繪製失敗：{error}",
+        'trace_sheet_saved': "已儲存 {count} 個 trial 的軌跡總表：{path}",
         
         # 反應時間測試
         'reaction_test_started': "🔄 已開始反應時間測試系列！",
@@ -191,6 +214,33 @@ LANGUAGES = {
         'arg_age': "使用者年齡",
         'arg_controller_freq': "手把使用頻率 (1-7)",
         'arg_english': "使用英文介面",
+        'arg_replay_logs': "要重播的原始輸入紀錄檔 (.stin)",
+        'arg_replay_test': "要重播的測試",
+        'arg_replay_seed': "隨機種子（決定目標位置等隨機內容；預設使用紀錄檔頭的 session 種子）",
+        'arg_replay_results_dir': "重播結果的儲存目錄（預設為 data/replay_results，與正式結果分開）",
+        'aggregate_description': "彙整所有使用者的測試結果並計算族群統計",
+        'arg_aggregate_test': "只彙整指定測試（預設為所有測試）",
+        'arg_aggregate_metric': "要統計的 metrics 欄位（巢狀欄位以「.」串接）",
+        'arg_aggregate_group_by': "分組欄位，例如 age、controller_usage_frequency",
+        'arg_aggregate_bins': "數值分組邊界（以逗號分隔），例如 0,20,30,40,60",
+        'arg_aggregate_latest': "每位使用者每個測試只使用最新的一筆結果",
+        'arg_aggregate_results_dir': "結果根目錄（預設為 data/results）",
+        'arg_aggregate_no_cache': "不使用摘要快取，重新解析所有結果檔",
+        'aggregate_summary': "📊 共 {files} 筆結果，統計欄位：{metric}",
+        'fitts_description': "analog_move 結果的 Fitts' law 吞吐量分析（ISO 9241-9 有效寬度法）",
+        'arg_fitts_files': "要分析的結果 JSON 檔案（未指定時分析所有 analog_move 結果）",
+        'arg_fitts_user': "只分析指定使用者的 analog_move 結果",
+        'fitts_analyzed': "📊 共分析 {count} 筆 analog_move 結果",
+        'schedule_description': "產生搖桿移動測試的 ISO 9241 目標排程檔",
+        'arg_schedule_output': "排程 JSON 輸出路徑",
+        'arg_schedule_repetitions': "每個條件區塊（距離 × 目標大小）重複的次數",
+        'arg_schedule_seed': "打亂條件區塊順序的亂數種子（未指定時維持固定順序）",
+        'schedule_saved': "💾 已儲存 {count} 個目標的排程：{path}",
+        'schedule_loaded': "📋 已載入 {count} 個目標的排程：{path}",
+        'path_analysis_description': "重新分析 analog_path_follow 結果的路徑段落（直線段、轉角區）",
+        'arg_path_analysis_files': "要分析的結果 JSON 檔案（未指定時分析所有 analog_path_follow 結果）",
+        'arg_path_analysis_user': "只分析指定使用者的 analog_path_follow 結果",
+        'path_analysis_analyzed': "📊 共分析 {count} 筆 analog_path_follow 結果",
         
         # 視窗設定
         'window_setup_success': "🖥️ 視窗設定為：{width}x{height}，位置：({x}, {y})",
@@ -258,6 +308,7 @@ LANGUAGES = {
         'test_summary_total_time': "⏱️ 總用時：{time:.2f} 秒",
         'test_summary_avg_time': "📊 平均用時：{time:.2f} 秒",
         'test_summary_avg_efficiency': "⚡ 平均效率：{efficiency:.4f} 秒/像素",
+        'test_summary_throughput': "🎯 吞吐量（有效寬度）：{throughput:.2f} bits/秒",
         'test_summary_standard': "🎪 測試標準：ISO9241 九點圓形指向測試",
         'test_summary_distances': "📏 長距離：{long} 像素，短距離：{short} 像素",
         'test_summary_combinations': "🎯 測試組合：長距離大小目標 + 短距離大小目標",
@@ -271,6 +322,7 @@ LANGUAGES = {
         'path_test_completed': "🎮 Path Following 測試結束",
         'path_total_time_format': "⏱ 總時間：{time:.2f} 秒",
         'path_off_path_time_format': "❌ 偏離路徑時間：{time:.2f} 秒", 
+        'path_timing_degraded': "⚠️ 畫面延遲，有 {seconds:.2f} 秒未被模擬，本條路徑的完成時間偏短（timing_degraded）",
         'path_off_path_percentage_format': "📊 偏離比例：{percentage:.2f}%",
         'path_movement_type_format': "🔄 移動類型：{type}",
         'path_straight_segments_format': "📏 直線段落：{count} 個",
@@ -384,6 +436,11 @@ LANGUAGES = {
         'thank_you': "Thank you for using!",
         'running_full_suite': "Running full test suite (user: {user_id})...",
         'running_test': "Running test {num}...",
+        'test_runner_ready': "⚡ Test {name} opened ({ms:.0f} ms)",
+        'suite_progress': "▶️ Full test suite {index}/{total}: {name}",
+        'suite_complete': "🏁 Full test suite finished: {completed}/{total} tests saved results",
+        'session_manifest_saved': "Session manifest saved",
+        'menu_full_suite': "Full test suite (runs 1-6 in order)",
         'invalid_test_number': "Invalid test number",
         
         # User information collection
@@ -428,11 +485,26 @@ LANGUAGES = {
         'controller_event_error': "⚠️ Error processing event: {error}",
         'controller_thread_error': "❌ Controller thread critical error: {error}",
         'controller_thread_ended': "🔄 Controller listening thread ended safely",
+        'controller_recording_input': "💾 Recording raw controller input: {path}",
+        'controller_axis_stats': "📊 Axis events: {raw} raw, {emitted} dispatched ({saved:.1f}% saved by coalescing)",
+        'replay_started': "⏩ Replaying {path} ({count} events)",
+        'replay_summary': "✅ Replay finished: {virtual:.1f}s virtual time in {wall:.2f}s wall time ({speedup:.0f}x), {errors} callback errors",
+        'replay_no_session_seed': "⚠️ {path} has no session seed; random content differs from the recording (do not use the results for re-scoring)",
+        'replay_no_start_marker': "⚠️ {path} has no start marker; clicking start when the replay begins (do not use the results for re-scoring)",
         'controller_listening_stopped': "🔄 Controller input listening stopped",
         'controller_use_device': "Use this device? (Y/n): ",
         'controller_not_selected_yet': "❌ No controller selected yet",
         'controller_not_exist': "❌ Controller {index} does not exist, currently {count} gamepad(s) available",
         'controller_connected': "🎮 Connected controller: {name}",
+        'controller_not_connected': "❌ Selected controller {name} is not connected, currently {count} gamepad(s) available",
+        'controller_disconnected': "⚠️ Controller disconnected: {name}",
+        'controller_reconnected': "🎮 Controller reconnected: {name}",
+        'input_service_listening': "🎮 Listening for controller events ({count} participant(s) sharing one event loop)... (Ctrl+C to stop)",
+        'concurrent_not_enough_controllers': "❌ Concurrent testing needs {needed} controllers, only {count} connected",
+        'concurrent_participant_ready': "🎮 Participant {user_id} uses controller: {name}",
+        'menu_concurrent': "Concurrent session (one controller per participant)",
+        'concurrent_choose_test': "Choose the test to run concurrently (1-6): ",
+        'concurrent_enter_user_ids': "Enter all participant IDs (comma separated): ",
         'controller_connect_failed': "❌ Failed to connect controller: {error}",
         'controller_in_use': "Controller in use",
         'controller_axis_move_debug': "Axis move: {axis} -> {value}",
@@ -447,6 +519,9 @@ LANGUAGES = {
         'trace_image_saved': "Saved: {path}",
         'trace_no_path_data': "No trace data for path {index}",
         'trace_path_saved': "Saved path {index} trace diagram: {path}",
+        'trace_worker_unavailable': "⚠️ Could not start background plot workers, rendering synchronously: {error}",
+        'trace_render_failed': "❌ Trace image rendering failed: {error}",
+        'trace_sheet_saved': "Saved trace sheet with {count} trials: {path}",
         
         # Reaction time test
         'reaction_test_started': "🔄 Started reaction time test series!",
@@ -473,6 +548,33 @@ LANGUAGES = {
         'arg_age': "User age",
         'arg_controller_freq': "Controller usage frequency (1-7)",
         'arg_english': "Use English interface",
+        'arg_replay_logs': "Raw input log files (.stin) to replay",
+        'arg_replay_test': "Test to replay",
+        'arg_replay_seed': "Random seed (controls target positions and other random content; defaults to the session seed in the log header)",
+        'arg_replay_results_dir': "Directory for replay results (defaults to data/replay_results, separate from real results)",
+        'aggregate_description': "Aggregate test results across all users and compute cohort statistics",
+        'arg_aggregate_test': "Only aggregate this test (default: all tests)",
+        'arg_aggregate_metric': "Metrics field to summarize (nested fields joined with '.')",
+        'arg_aggregate_group_by': "Field to group by, e.g. age, controller_usage_frequency",
+        'arg_aggregate_bins': "Comma-separated numeric group edges, e.g. 0,20,30,40,60",
+        'arg_aggregate_latest': "Use only the latest result per user and test",
+        'arg_aggregate_results_dir': "Results root directory (default: data/results)",
+        'arg_aggregate_no_cache': "Ignore the summary cache and re-parse every result file",
+        'aggregate_summary': "📊 {files} result(s), metric: {metric}",
+        'fitts_description': "Fitts' law throughput analysis of analog_move results (ISO 9241-9 effective width)",
+        'arg_fitts_files': "Result JSON files to analyse (default: every analog_move result)",
+        'arg_fitts_user': "Only analyse this user's analog_move results",
+        'fitts_analyzed': "📊 Analysed {count} analog_move result(s)",
+        'schedule_description': "Generate an ISO 9241 target schedule file for the analog move test",
+        'arg_schedule_output': "Output path of the schedule JSON",
+        'arg_schedule_repetitions': "How many times each condition block (distance x target size) repeats",
+        'arg_schedule_seed': "Random seed for shuffling condition blocks (default: fixed order)",
+        'schedule_saved': "💾 Saved a schedule of {count} targets: {path}",
+        'schedule_loaded': "📋 Loaded a schedule of {count} targets: {path}",
+        'path_analysis_description': "Re-analyse path segments (straights, corner zone) of analog_path_follow results",
+        'arg_path_analysis_files': "Result JSON files to analyse (default: every analog_path_follow result)",
+        'arg_path_analysis_user': "Only analyse this user's analog_path_follow results",
+        'path_analysis_analyzed': "📊 Analysed {count} analog_path_follow result(s)",
         
         # Window setup
         'window_setup_success': "🖥️ Window set to: {width}x{height}, position: ({x}, {y})",
@@ -539,6 +641,7 @@ LANGUAGES = {
         'test_summary_total_time': "⏱️ Total time: {time:.2f} seconds",
         'test_summary_avg_time': "📊 Average time: {time:.2f} seconds",
         'test_summary_avg_efficiency': "⚡ Average efficiency: {efficiency:.4f} s/px",
+        'test_summary_throughput': "🎯 Throughput (effective width): {throughput:.2f} bits/s",
         'test_summary_standard': "🎪 Test standard: ISO9241 nine-point circular pointing test",
         'test_summary_distances': "📏 Long distance: {long} pixels, short distance: {short} pixels",
         'test_summary_combinations': "🎯 Test combinations: Long/short distance with large/small targets",
@@ -552,6 +655,7 @@ LANGUAGES = {
         'path_test_completed': "🎮 Path Following Test Completed",
         'path_total_time_format': "⏱ Total time: {time:.2f} seconds",
         'path_off_path_time_format': "❌ Off-path time: {time:.2f} seconds",
+        'path_timing_degraded': "⚠️ Frames fell behind; {seconds:.2f} s was not simulated. This trial's completion time is too short (timing_degraded)",
         'path_off_path_percentage_format': "📊 Off-path percentage: {percentage:.2f}%", 
         'path_movement_type_format': "🔄 Movement type: {type}",
         'path_straight_segments_format': "📏 Straight segments: {count}",
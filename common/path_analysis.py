@@ -0,0 +1,213 @@
+"""
+路徑追蹤軌跡的段落分析（analog_path_follow 使用）
+- 以完整（未收縮）路徑的幾何，把每個軌跡點分類為第一段、轉角區或第二段：
+  距轉角中心 corner_zone_radius（預設為一個路寬）以內為轉角區，其餘歸到距中心線較近的一段
+- 每個段落：樣本數、時間、離開路徑的時間、準確率、相對中心線的橫向偏移 RMS
+- 轉角區另計算切角面積：轉角區內的軌跡與路徑中心線圍成的淨面積（往轉彎內側切為正、往外側繞為負）
+- 整條軌跡一次以 NumPy 陣列計算；可在 trial 結束時使用，也可重新分析已儲存的結果
+用法：
+    python -m common.path_analysis --user P001
+    python -m common.path_analysis data/results/P001/analog_path_follow_20250101_120000.json ...
+"""
+import argparse
+import math
+
+from . import config
+from .path_geometry import CircleGeometry, PathGeometry, SegmentGeometry
+from .language import get_text, set_language
+
+PHASE_FIRST, PHASE_SECOND, PHASE_CORNER = 0, 1, 2
+
+
+def corner_segment2_start(start_x, start_y, corner_x, corner_y, end_x, end_y, width):
+    """轉彎路徑第二段的起點：有轉彎時從轉角往回延伸半個路寬，與第一段完全銜接"""
+    dx1 = corner_x - start_x
+    dy1 = corner_y - start_y
+    dx2 = end_x - corner_x
+    dy2 = end_y - corner_y
+    length1 = math.hypot(dx1, dy1)
+    length2 = math.hypot(dx2, dy2)
+    if length1 > 0 and length2 > 0 and abs(dx1 * dy2 - dy1 * dx2) > 1e-6:
+        return corner_x - dx2 / length2 * (width / 2), corner_y - dy2 / length2 * (width / 2)
+    return corner_x, corner_y
+
+
+def _project(points, x1, y1, x2, y2):
+    """點到線段的投影：回傳 (線段上最近點, 到中心線的距離)"""
+    import numpy as np
+    a = np.array([x1, y1], dtype=float)
+    axis = np.array([x2 - x1, y2 - y1], dtype=float)
+    length_sq = axis @ axis
+    t = np.zeros(len(points)) if length_sq == 0 else np.clip((points - a) @ axis / length_sq, 0, 1)
+    nearest = a + t[:, None] * axis
+    return nearest, np.hypot(*(points - nearest).T)
+
+
+def _phase_summary(mask, off_path, deviation, step_seconds, movement_type):
+    """單一段落的統計"""
+    import numpy as np
+    count = int(mask.sum())
+    duration = count * step_seconds
+    off_path_time = int((mask & off_path).sum()) * step_seconds
+    return {
+        "start_time": float(np.argmax(mask)) * step_seconds if count else None,
+        "duration": duration,
+        "movement_type": movement_type,
+        "sample_count": count,
+        "off_path_time_seconds": off_path_time,
+        "accuracy": 100 - off_path_time / duration * 100 if duration > 0 else 0,
+        "lateral_rms_px": float(np.sqrt(np.mean(deviation[mask] ** 2))) if count else None,
+    }
+
+
+def _corner_cut_area(points, zone, corner, first_line, second_line, turn_sign):
+    """
+    轉角區軌跡與中心線圍成的淨面積（shoelace）
+    多邊形：第一次進入轉角區到最後一次離開之間的軌跡 → 最後一點在第二段的投影 → 轉角 → 第一點在第一段的投影
+    """
+    import numpy as np
+    if turn_sign == 0 or not zone.any():
+        return 0.0
+    indices = np.flatnonzero(zone)
+    run = points[indices[0]:indices[-1] + 1]
+    first_proj, _ = _project(run[:1], *first_line)
+    last_proj, _ = _project(run[-1:], *second_line)
+    polygon = np.vstack([run, last_proj, [corner], first_proj])
+    x, y = polygon[:, 0], polygon[:, 1]
+    signed_area = 0.5 * float(np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y))
+    return -turn_sign * signed_area
+
+
+def analyze_corner_trace(trace, start, corner, end, width, step_seconds, corner_zone_radius=None):
+    """
+    分析轉彎路徑的軌跡
+
+    Args:
+        trace: 軌跡點序列 [[x, y], ...]（每個點為一個模擬步長）
+        start / corner / end: 路徑起點、轉角、終點 (x, y)
+        width: 路寬
+        step_seconds: 模擬步長（秒）
+        corner_zone_radius: 轉角區半徑（預設為路寬）
+
+    Returns:
+        dict: {"straight_segments": [第一段, 第二段], "corner_segments": [轉角區]}
+    """
+    import numpy as np
+    points = np.asarray(trace, dtype=float).reshape(-1, 2)
+    radius = width if corner_zone_radius is None else corner_zone_radius
+    first_line = (start[0], start[1], corner[0], corner[1])
+    second_line = (corner[0], corner[1], end[0], end[1])
+
+    _, first_dev = _project(points, *first_line)
+    _, second_dev = _project(points, *second_line)
+    zone = np.hypot(points[:, 0] - corner[0], points[:, 1] - corner[1]) <= radius
+    phase = np.where(zone, PHASE_CORNER, np.where(first_dev <= second_dev, PHASE_FIRST, PHASE_SECOND))
+    deviation = np.minimum(first_dev, second_dev)
+
+    seg2_start = corner_segment2_start(*start, *corner, *end, width)
+    geometry = PathGeometry([SegmentGeometry(*start, *corner, width / 2),
+                             SegmentGeometry(*seg2_start, *end, width / 2)])
+    off_path = ~geometry.contains(points[:, 0], points[:, 1])
+
+    turn = ((corner[0] - start[0]) * (end[1] - corner[1]) - (corner[1] - start[1]) * (end[0] - corner[0]))
+    corner_summary = _phase_summary(phase == PHASE_CORNER, off_path, deviation, step_seconds, "corner_turn")
+    corner_summary["corner_zone_radius_px"] = radius
+    corner_summary["corner_cut_area_px2"] = _corner_cut_area(points, zone, corner, first_line, second_line,
+                                                             int(np.sign(turn)))
+    return {
+        "straight_segments": [
+            _phase_summary(phase == PHASE_FIRST, off_path, deviation, step_seconds, "first_straight"),
+            _phase_summary(phase == PHASE_SECOND, off_path, deviation, step_seconds, "second_straight"),
+        ],
+        "corner_segments": [corner_summary],
+    }
+
+
+def analyze_straight_trace(trace, start, end, width, step_seconds, movement_type):
+    """分析直線路徑的軌跡（只有一個直線段）"""
+    import numpy as np
+    points = np.asarray(trace, dtype=float).reshape(-1, 2)
+    line = (start[0], start[1], end[0], end[1])
+    _, deviation = _project(points, *line)
+    if start == end:  # 零長度路徑為圓形
+        geometry = CircleGeometry(start[0], start[1], width / 2)
+    else:
+        geometry = SegmentGeometry(*line, width / 2)
+    off_path = ~geometry.contains(points[:, 0], points[:, 1])
+    segment = _phase_summary(np.ones(len(points), dtype=bool), off_path, deviation, step_seconds, movement_type)
+    segment["start_time"] = 0
+    return {"straight_segments": [segment], "corner_segments": []}
+
+
+def analyze_trial(trial):
+    """重新分析一個已儲存的路徑追蹤 trial（player_trace 可為 memmap 陣列或列表）"""
+    info = trial["path_info"]
+    step_seconds = (trial.get("timing") or {}).get("simulation_step_seconds", config.SIMULATION_STEP_MS / 1000)
+    start = (info["start_x"], info["start_y"])
+    end = (info["end_x"], info["end_y"])
+    if trial.get("path_type") == "corner":
+        return analyze_corner_trace(trial["player_trace"], start, (info["corner_x"], info["corner_y"]), end,
+                                    info["width"], step_seconds)
+    return analyze_straight_trace(trial["player_trace"], start, end, info["width"], step_seconds,
+                                  info.get("movement_type", "unknown"))
+
+
+def analyze_sessions(paths):
+    """
+    批次重新分析已儲存的 analog_path_follow 結果檔（軌跡 sidecar 以 memmap 讀回）
+
+    Returns:
+        list: [(路徑, 使用者 ID, [每個 trial 的段落分析])]
+    """
+    from .result_saver import load_result_file
+    rows = []
+    for path in paths:
+        result = load_result_file(path)
+        trials = result["metrics"].get("trials", [])
+        rows.append((path, result.get("user_id"), [analyze_trial(trial) for trial in trials]))
+    return rows
+
+
+def _mean(values):
+    values = [value for value in values if value is not None]
+    return sum(values) / len(values) if values else None
+
+
+def _cell(value, width, digits):
+    return f"{'-':>{width}}" if value is None else f"{value:>{width}.{digits}f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=get_text('path_analysis_description'))
+    parser.add_argument("files", nargs="*", help=get_text('arg_path_analysis_files'))
+    parser.add_argument("--user", "-u", default=None, help=get_text('arg_path_analysis_user'))
+    parser.add_argument("--results-dir", default=None, help=get_text('arg_aggregate_results_dir'))
+    parser.add_argument("--english", action="store_true", help=get_text('arg_english'))
+    args = parser.parse_args()
+
+    if args.english:
+        set_language('en')
+
+    paths = list(args.files)
+    if not paths:
+        from .result_aggregator import list_result_files
+        from .result_index import query_results
+        if args.user:
+            paths = query_results(args.user, "analog_path_follow", results_dir=args.results_dir, read_only=True)
+        else:
+            paths = list_result_files("analog_path_follow", args.results_dir)
+
+    print(f"{'user':<16}{'corner acc %':>14}{'corner RMS px':>15}{'cut px²':>12}{'straight RMS px':>17}   file")
+    for path, user_id, analyses in analyze_sessions(paths):
+        corners = [segment for analysis in analyses for segment in analysis["corner_segments"]]
+        straights = [segment for analysis in analyses for segment in analysis["straight_segments"]]
+        print(f"{str(user_id):<16}"
+              f"{_cell(_mean([s['accuracy'] for s in corners if s['sample_count']]), 14, 1)}"
+              f"{_cell(_mean([s['lateral_rms_px'] for s in corners]), 15, 2)}"
+              f"{_cell(_mean([s['corner_cut_area_px2'] for s in corners]), 12, 0)}"
+              f"{_cell(_mean([s['lateral_rms_px'] for s in straights]), 17, 2)}   {path}")
+    print(get_text('path_analysis_analyzed', count=len(paths)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+路徑幾何運算
+- 路徑段以「有方向的矩形」表示：預先算好單位向量、長度與半寬，判斷點是否在內只需兩次內積
+- contains_point() 給每幀的即時判斷使用（不配置任何物件）
+- contains(xs, ys) 以 NumPy 一次判斷整條軌跡，供事後分析與重新計分使用（NumPy 在第一次批次判斷時才載入）
+- Centerline 計算點在中心線上的進度與橫向距離，供每個模擬步長的偏離記錄使用
+"""
+import math
+
+
+class SegmentGeometry:
+    """由起點延伸到終點、寬度為 2 * half_width 的矩形路徑段"""
+
+    __slots__ = ('x1', 'y1', 'x2', 'y2', 'half_width', 'ux', 'uy', 'length')
+
+    def __init__(self, x1, y1, x2, y2, half_width):
+        self.x1 = x1
+        self.y1 = y1
+        self.x2 = x2
+        self.y2 = y2
+        self.half_width = half_width
+        self.length = math.hypot(x2 - x1, y2 - y1)
+        if self.length > 0:
+            self.ux = (x2 - x1) / self.length
+            self.uy = (y2 - y1) / self.length
+        else:
+            self.ux = self.uy = 0.0
+
+    def contains_point(self, x, y):
+        """點是否在矩形內（含邊界）"""
+        if self.length == 0:
+            return False
+        dx = x - self.x1
+        dy = y - self.y1
+        along = dx * self.ux + dy * self.uy
+        if along < 0 or along > self.length:
+            return False
+        return abs(dy * self.ux - dx * self.uy) <= self.half_width
+
+    def contains(self, xs, ys):
+        """批次判斷：回傳與 xs 同形狀的布林陣列"""
+        import numpy as np
+
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        if self.length == 0:
+            return np.zeros(np.broadcast(xs, ys).shape, dtype=bool)
+        dx = xs - self.x1
+        dy = ys - self.y1
+        along = dx * self.ux + dy * self.uy
+        across = dy * self.ux - dx * self.uy
+        return (along >= 0) & (along <= self.length) & (np.abs(across) <= self.half_width)
+
+    def polygon(self):
+        """回傳矩形四個頂點 [x1, y1, ..., x4, y4]（順序與 Canvas 繪製的多邊形相同）"""
+        perp_x = -self.uy * self.half_width
+        perp_y = self.ux * self.half_width
+        return [
+            self.x1 + perp_x, self.y1 + perp_y,
+            self.x2 + perp_x, self.y2 + perp_y,
+            self.x2 - perp_x, self.y2 - perp_y,
+            self.x1 - perp_x, self.y1 - perp_y,
+        ]
+
+    def as_goal_area(self):
+        """轉為結果 JSON 使用的目標區域格式"""
+        return {'points': self.polygon()}
+
+
+class RectGeometry:
+    """與座標軸對齊的矩形區域"""
+
+    __slots__ = ('left', 'top', 'right', 'bottom')
+
+    def __init__(self, left, top, right, bottom):
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+
+    def contains_point(self, x, y):
+        return self.left <= x <= self.right and self.top <= y <= self.bottom
+
+    def contains(self, xs, ys):
+        import numpy as np
+
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        return (xs >= self.left) & (xs <= self.right) & (ys >= self.top) & (ys <= self.bottom)
+
+    def polygon(self):
+        return [self.left, self.top, self.right, self.top,
+                self.right, self.bottom, self.left, self.bottom]
+
+    def as_goal_area(self):
+        return {'left': self.left, 'top': self.top, 'right': self.right, 'bottom': self.bottom}
+
+
+class CircleGeometry:
+    """圓形區域（零長度路徑使用）"""
+
+    __slots__ = ('cx', 'cy', 'radius')
+
+    def __init__(self, cx, cy, radius):
+        self.cx = cx
+        self.cy = cy
+        self.radius = radius
+
+    def contains_point(self, x, y):
+        return math.hypot(x - self.cx, y - self.cy) <= self.radius
+
+    def contains(self, xs, ys):
+        import numpy as np
+
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        return np.hypot(xs - self.cx, ys - self.cy) <= self.radius
+
+
+class PathGeometry:
+    """由多個區域組成的路徑，點落在任一區域內即視為在路徑內"""
+
+    __slots__ = ('shapes',)
+
+    def __init__(self, shapes=()):
+        self.shapes = tuple(shapes)
+
+    def contains_point(self, x, y):
+        for shape in self.shapes:
+            if shape.contains_point(x, y):
+                return True
+        return False
+
+    def contains(self, xs, ys):
+        """
+        批次判斷整條軌跡
+
+        Args:
+            xs, ys: 座標序列（list 或 NumPy 陣列）
+
+        Returns:
+            numpy.ndarray: 每個點是否在路徑內
+        """
+        import numpy as np
+
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        inside = np.zeros(np.broadcast(xs, ys).shape, dtype=bool)
+        for shape in self.shapes:
+            inside |= shape.contains(xs, ys)
+        return inside
+
+
+class Centerline:
+    """
+    路徑中心線（折線）
+    locate() 給每個模擬步長使用：回傳點在路徑上的進度與帶正負號的橫向距離（不配置任何 NumPy 物件）
+    """
+
+    __slots__ = ('segments', 'offsets', 'length')
+
+    def __init__(self, points):
+        self.segments = tuple(SegmentGeometry(x1, y1, x2, y2, 0)
+                              for (x1, y1), (x2, y2) in zip(points, points[1:]))
+        offsets = []
+        total = 0.0
+        for segment in self.segments:
+            offsets.append(total)
+            total += segment.length
+        self.offsets = tuple(offsets)
+        self.length = total
+
+    def locate(self, x, y):
+        """
+        回傳 (進度, 橫向距離)
+        進度為最近點沿中心線距起點的長度；橫向距離為到中心線的距離，沿行進方向右側為正（畫布座標）
+        """
+        best_distance = None
+        progress = lateral = 0.0
+        for segment, offset in zip(self.segments, self.offsets):
+            dx = x - segment.x1
+            dy = y - segment.y1
+            along = min(max(dx * segment.ux + dy * segment.uy, 0.0), segment.length)
+            distance = math.hypot(dx - along * segment.ux, dy - along * segment.uy)
+            if best_distance is None or distance < best_distance:
+                best_distance = distance
+                progress = offset + along
+                lateral = distance if segment.ux * dy - segment.uy * dx >= 0 else -distance
+        return progress, lateral
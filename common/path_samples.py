@@ -0,0 +1,127 @@
+"""
+路徑追蹤的逐步偏離記錄
+- PathSampleBuffer：每個模擬步長記錄一筆（trial 時間、相對中心線的橫向距離、路徑進度、是否在路徑內），
+  資料寫入預先配置的 array（容量不足時加倍），不在每一步建立 tuple
+- summarize_samples：trial 結束後只根據記錄的欄位計算偏離次數、偏離持續時間分佈、最大偏離與沿路徑的偏移分佈，
+  不需要重新做幾何判斷；也可用於已儲存結果中以 memmap 讀回的欄位
+"""
+from array import array
+
+from . import config
+from .trajectory_store import Columnar
+
+PROFILE_BINS = 10  # 偏移分佈：把路徑長度等分成幾段
+
+
+class PathSampleBuffer:
+    """單一 trial 的逐步記錄；clear() 後重複使用同一塊記憶體"""
+
+    def __init__(self, capacity=None):
+        self.capacity = capacity or config.PATH_SAMPLE_CAPACITY
+        self.time = array('d', bytes(8 * self.capacity))      # 步長結束時的 trial 模擬時間（秒）
+        self.lateral = array('d', bytes(8 * self.capacity))   # 橫向距離（像素，沿行進方向右側為正）
+        self.progress = array('d', bytes(8 * self.capacity))  # 沿中心線的進度（像素）
+        self.inside = array('b', bytes(self.capacity))        # 1 = 在路徑內
+        self.count = 0
+
+    def clear(self):
+        self.count = 0
+
+    def _grow(self):
+        """容量加倍（只有 trial 特別長時才會發生）"""
+        self.time.extend(array('d', bytes(8 * self.capacity)))
+        self.lateral.extend(array('d', bytes(8 * self.capacity)))
+        self.progress.extend(array('d', bytes(8 * self.capacity)))
+        self.inside.extend(array('b', bytes(self.capacity)))
+        self.capacity *= 2
+
+    def append(self, time_s, lateral, progress, inside):
+        i = self.count
+        if i == self.capacity:
+            self._grow()
+        self.time[i] = time_s
+        self.lateral[i] = lateral
+        self.progress[i] = progress
+        self.inside[i] = 1 if inside else 0
+        self.count = i + 1
+
+    def columns(self):
+        """目前記錄的複本，以 Columnar 標記（儲存時寫入軌跡 sidecar）"""
+        n = self.count
+        return {
+            "time_s": Columnar(self.time[:n]),
+            "lateral_px": Columnar(self.lateral[:n]),
+            "progress_px": Columnar(self.progress[:n]),
+            "inside": Columnar(list(self.inside[:n])),
+        }
+
+    def summary(self, step_seconds, half_width, path_length):
+        return summarize_samples(self.time[:self.count], self.lateral[:self.count], self.progress[:self.count],
+                                 self.inside[:self.count], step_seconds, half_width, path_length)
+
+
+def _histogram_labels(edges):
+    labels = [f"<{edges[0]}s"]
+    labels += [f"{low}-{high}s" for low, high in zip(edges, edges[1:])]
+    labels.append(f">={edges[-1]}s")
+    return labels
+
+
+def summarize_samples(time_s, lateral, progress, inside, step_seconds, half_width, path_length, histogram_edges=None):
+    """
+    由逐步記錄計算偏離統計
+
+    Args:
+        time_s / lateral / progress / inside: 記錄的欄位（array、list 或 NumPy 陣列）
+        step_seconds: 模擬步長（秒），每筆記錄代表的時間
+        half_width: 路徑半寬，用於計算超出路徑邊緣的深度
+        path_length: 中心線長度，用於偏移分佈
+        histogram_edges: 偏離持續時間分佈的邊界（秒，預設 config.PATH_EXCURSION_HISTOGRAM_S）
+
+    Returns:
+        dict: 偏離次數、每次偏離的時間與深度、持續時間分佈、最大偏離與偏移分佈
+    """
+    import numpy as np
+
+    time_s = np.asarray(time_s, dtype=float)
+    abs_lateral = np.abs(np.asarray(lateral, dtype=float))
+    progress = np.asarray(progress, dtype=float)
+    outside = np.asarray(inside) == 0
+    edges = list(histogram_edges or config.PATH_EXCURSION_HISTOGRAM_S)
+
+    # 連續在路徑外的樣本為一次偏離
+    changes = np.diff(np.concatenate(([0], outside.astype(np.int8), [0])))
+    starts = np.flatnonzero(changes == 1)
+    ends = np.flatnonzero(changes == -1)
+    durations = (ends - starts) * step_seconds
+    depth = np.where(outside, np.maximum(abs_lateral - half_width, 0), 0)
+    max_depths = np.maximum.reduceat(depth, starts) if len(starts) else np.empty(0)
+
+    histogram = np.bincount(np.searchsorted(edges, durations, side='right'), minlength=len(edges) + 1)
+
+    profile_edges = np.linspace(0, path_length, PROFILE_BINS + 1)
+    profile = []
+    if len(abs_lateral) and path_length > 0:
+        bins = np.clip(np.searchsorted(profile_edges, progress, side='right') - 1, 0, PROFILE_BINS - 1)
+        sums = np.bincount(bins, weights=abs_lateral ** 2, minlength=PROFILE_BINS)
+        counts = np.bincount(bins, minlength=PROFILE_BINS)
+        profile = [float(np.sqrt(total / count)) if count else None for total, count in zip(sums, counts)]
+
+    return {
+        "sample_count": int(len(outside)),
+        "off_path_samples": int(outside.sum()),
+        "off_path_time_seconds": float(outside.sum() * step_seconds),
+        "excursion_count": int(len(starts)),
+        "excursions": [{"start_s": float(time_s[start]) - step_seconds,
+                        "duration_s": float(duration),
+                        "start_progress_px": float(progress[start]),
+                        "max_depth_px": float(max_depth)}
+                       for start, duration, max_depth in zip(starts, durations, max_depths)],
+        "duration_histogram": dict(zip(_histogram_labels(edges), (int(n) for n in histogram))),
+        "max_lateral_px": float(abs_lateral.max()) if len(abs_lateral) else 0.0,
+        "max_excursion_depth_px": float(depth.max()) if len(depth) else 0.0,
+        "deviation_profile": {
+            "progress_edges_px": [float(edge) for edge in profile_edges],
+            "rms_lateral_px": profile,
+        },
+    }
@@ -0,0 +1,428 @@
+"""
+無頭重播引擎
+- 以虛擬時鐘取代 time 模組，Tk 視窗以不需要螢幕的替身元件取代
+- ReplayInput 取代 ControllerInput，依錄製（或腳本產生）的時間戳依序送出事件，
+  搖桿死區、事件合併與回呼分派都沿用 ControllerInput 的邏輯
+- 整個 session 在單一執行緒上依事件時間跳躍執行，不需等待真實時間，結果可重現
+- 重播錄製的紀錄檔時，以檔頭記錄的 session 種子初始化 random，並依「開始測試」的點擊標記點擊按鈕，
+  重建與錄製時相同的目標位置、延遲時間與開始時間；第 1 版紀錄檔（沒有種子與標記）只能重播輸入，
+  隨機內容與開始時間和錄製時不同，不可用來重新計分
+- 重播結果預設存到 config.REPLAY_RESULTS_DIR，不會混入正式結果
+
+使用方式:
+    uv run python -m common.replay --test analog_path_follow data/raw_input/P1/20250101_120000.stin
+"""
+import argparse
+import contextlib
+import heapq
+import importlib
+import random
+import sys
+import time
+import tkinter
+import traceback
+
+import pygame
+
+from . import config
+from .controller_input import ControllerInput
+from .event_buffer import EVENT_AXIS, EVENT_BUTTON_DOWN, EVENT_BUTTON_UP
+from .input_recorder import KIND_MARKER, MARKER_START, load_input_log
+from .language import get_text, set_language
+from .test_runner import TEST_TARGETS, create_test_app
+from .trace_plot import flush_trace_jobs
+
+# 可重播的測試與 InProcessTestRunner 使用同一份設定
+REPLAY_TARGETS = TEST_TARGETS
+
+# 虛擬時鐘的起點，避免 perf_counter() 回傳 0 被當成「尚未開始」
+VIRTUAL_START_NS = 1_000_000_000
+
+
+class VirtualClock:
+    """
+    虛擬時鐘，提供與 time 模組相同的介面
+    時間只會在重播迴圈執行到下一個排程時前進；其餘屬性（strftime 等）轉交給真正的 time 模組
+    """
+
+    def __init__(self, start_wall_time=None):
+        self.now_ns = VIRTUAL_START_NS
+        self.start_wall_time = start_wall_time if start_wall_time is not None else time.time()
+
+    @property
+    def elapsed_ns(self):
+        return self.now_ns - VIRTUAL_START_NS
+
+    def perf_counter_ns(self):
+        return self.now_ns
+
+    def perf_counter(self):
+        return self.now_ns / 1e9
+
+    monotonic_ns = perf_counter_ns
+    monotonic = perf_counter
+
+    def time(self):
+        return self.start_wall_time + self.elapsed_ns / 1e9
+
+    def sleep(self, seconds):
+        self.now_ns += int(seconds * 1e9)
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+def _noop(*args, **kwargs):
+    return None
+
+
+class HeadlessWidget:
+    """不需要螢幕的 Tk 元件替身，所有繪圖與版面配置呼叫都直接忽略"""
+
+    def __init__(self, *args, **kwargs):
+        self._item_count = 0
+        self.command = kwargs.get('command')
+
+    def configure(self, **kwargs):
+        if 'command' in kwargs:
+            self.command = kwargs['command']
+
+    config = configure
+
+    def invoke(self):
+        """模擬點擊按鈕"""
+        if self.command is not None:
+            return self.command()
+        return None
+
+    def _create_item(self, *args, **kwargs):
+        self._item_count += 1
+        return self._item_count
+
+    create_oval = create_rectangle = create_polygon = create_line = create_text = create_image = _create_item
+
+    def winfo_screenwidth(self):
+        return config.WINDOW_WIDTH
+
+    def winfo_screenheight(self):
+        return config.WINDOW_HEIGHT
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return _noop
+
+
+class HeadlessRoot(HeadlessWidget):
+    """
+    無頭 Tk 根視窗
+    after() 排程的回呼依虛擬時間排序執行，mainloop() 直接跳到下一個排程時間，不做真實等待
+    """
+
+    def __init__(self, clock=None):
+        super().__init__()
+        self.clock = clock or VirtualClock()
+        self._queue = []  # (到期時間 ns, 序號, after_id, 回呼, 參數)
+        self._cancelled = set()
+        self._sequence = 0
+        self._quit = False
+        self.destroyed = False
+        self.callback_errors = []  # 回呼中拋出的例外（與 Tk 相同，不會中斷主迴圈）
+
+    def call_at_ns(self, due_ns, func, *args):
+        """在指定的虛擬時間（ns）執行回呼"""
+        self._sequence += 1
+        after_id = f"after#{self._sequence}"
+        heapq.heappush(self._queue, (due_ns, self._sequence, after_id, func, args))
+        return after_id
+
+    def after(self, ms, func=None, *args):
+        if func is None:
+            self.clock.sleep(ms / 1000)
+            return None
+        return self.call_at_ns(self.clock.now_ns + int(ms * 1_000_000), func, *args)
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, after_id):
+        if after_id is not None:
+            self._cancelled.add(after_id)
+
+    def quit(self):
+        self._quit = True
+
+    def destroy(self):
+        self.destroyed = True
+        self._quit = True
+
+    def mainloop(self, until_ns=None):
+        """
+        依虛擬時間順序執行所有排程，直到 quit()/destroy()、沒有排程，或下一個排程超過 until_ns
+        """
+        self._quit = False
+        while self._queue and not self._quit:
+            due_ns, _, after_id, func, args = self._queue[0]
+            if until_ns is not None and due_ns > until_ns:
+                break
+            heapq.heappop(self._queue)
+            if after_id in self._cancelled:
+                self._cancelled.discard(after_id)
+                continue
+
+            if due_ns > self.clock.now_ns:
+                self.clock.now_ns = due_ns
+            try:
+                func(*args)
+            except Exception:
+                self.callback_errors.append(traceback.format_exc())
+                traceback.print_exc()
+
+
+class _HeadlessTkModule:
+    """取代測試模組中的 tkinter：元件換成無頭替身，常數等其餘屬性沿用真正的 tkinter"""
+
+    Tk = HeadlessWidget
+    Toplevel = HeadlessWidget
+    Frame = HeadlessWidget
+    Canvas = HeadlessWidget
+    Label = HeadlessWidget
+    Button = HeadlessWidget
+    Entry = HeadlessWidget
+
+    def __getattr__(self, name):
+        return getattr(tkinter, name)
+
+
+class ReplayInput(ControllerInput):
+    """
+    重播輸入來源，可取代 ControllerInput
+    events 為 (時間 ns, 事件類型, 軸／按鍵編號, 數值[, 裝置]) 的序列，時間從 start() 呼叫時起算
+    事件在 HeadlessRoot 的虛擬時間上送出，回呼收到的 timestamp_ns 即為虛擬時鐘的時間
+    """
+
+    def __init__(self, events, root, button_callback=None, analog_callback=None, analog_sample_interval_ms=-1):
+        # 在主執行緒上直接分派，不經過環形緩衝區
+        self._init_input_state(button_callback, analog_callback, None, analog_sample_interval_ms)
+        self.input_mode = "replay"
+        self.joystick = None
+        self._track_joystick()
+        self.recorder = None
+
+        self.root = root
+        self.events = sorted(events, key=lambda e: e[0])
+        self._index = 0
+        self._start_ns = None
+        self._wake_id = None
+
+    @property
+    def finished(self):
+        """所有事件都已送出"""
+        return self._index >= len(self.events) and not self._pending_axes
+
+    @property
+    def duration_ns(self):
+        """最後一個事件相對於開始的時間"""
+        return self.events[-1][0] if self.events else 0
+
+    def run(self):
+        self.start()
+
+    def start(self):
+        """從目前的虛擬時間開始重播"""
+        self._start_ns = self.root.clock.now_ns
+        self._schedule_next()
+
+    def _schedule_next(self):
+        wake_ns = None
+        if self._index < len(self.events):
+            wake_ns = self._start_ns + self.events[self._index][0]
+        if self._pending_axes and self.analog_sample_interval_ms:
+            flush_ns = self._last_axis_emit_ns + self.analog_sample_interval_ms * 1_000_000
+            wake_ns = flush_ns if wake_ns is None else min(wake_ns, flush_ns)
+        if wake_ns is not None and self.running:
+            self._wake_id = self.root.call_at_ns(wake_ns, self._wake)
+
+    def _wake(self):
+        """送出所有已到時間的事件（同一時間戳的事件視為同一批）"""
+        now_ns = self.root.clock.now_ns
+        events = self.events
+        while self._index < len(events) and self._start_ns + events[self._index][0] <= now_ns:
+            self._handle_event(_to_pygame_event(events[self._index]), now_ns)
+            self._index += 1
+            if not self.running:
+                return
+
+        if self._pending_axes and self._axis_flush_due(now_ns):
+            self._flush_axes()
+        self._schedule_next()
+
+    def stop(self):
+        """停止重播（不觸碰 pygame 手把資源）"""
+        self.running = False
+        if self._wake_id is not None:
+            self.root.after_cancel(self._wake_id)
+            self._wake_id = None
+
+
+def _to_pygame_event(record):
+    kind, code, value = record[1], record[2], record[3]
+    device = record[4] if len(record) > 4 else 0
+    if kind == EVENT_AXIS:
+        return pygame.event.Event(pygame.JOYAXISMOTION, axis=code, value=value, instance_id=device)
+    if kind == EVENT_BUTTON_DOWN:
+        return pygame.event.Event(pygame.JOYBUTTONDOWN, button=code, instance_id=device)
+    return pygame.event.Event(pygame.JOYBUTTONUP, button=code, instance_id=device)
+
+
+def load_replay_events(path):
+    """
+    讀取原始輸入紀錄檔並轉為重播事件
+
+    Returns:
+        (events, header)：events 的時間為相對於錄製開始的 ns，包含「開始測試」的點擊標記（見 replay_session）
+    """
+    log = load_input_log(path)
+    header = log['header']
+    start_ns = header['start_perf_ns']
+    events = list(zip((log['timestamp_ns'] - start_ns).tolist(),
+                      log['kind'].tolist(),
+                      log['code'].tolist(),
+                      log['value'].tolist(),
+                      log['device'].tolist()))
+    return events, header
+
+
+def scripted_press(at_ms, button, hold_ms=100):
+    """腳本事件：在 at_ms 按下按鍵並於 hold_ms 後放開"""
+    at_ns = int(at_ms * 1_000_000)
+    return [(at_ns, EVENT_BUTTON_DOWN, button, 1.0),
+            (at_ns + int(hold_ms * 1_000_000), EVENT_BUTTON_UP, button, 0.0)]
+
+
+def scripted_tilt(at_ms, x, y):
+    """腳本事件：在 at_ms 將左搖桿推到 (x, y)"""
+    at_ns = int(at_ms * 1_000_000)
+    return [(at_ns, EVENT_AXIS, 0, float(x)),
+            (at_ns, EVENT_AXIS, 1, float(y))]
+
+
+@contextlib.contextmanager
+def headless_environment(module, clock, results_dir=None):
+    """暫時將測試模組的 tkinter 與 time 換成無頭替身與虛擬時鐘"""
+    from . import game_loop, utils
+
+    patched = [(module, 'tk', _HeadlessTkModule()), (module, 'time', clock),
+               (utils, 'time', clock), (game_loop, 'time', clock)]
+    if results_dir is not None:
+        patched.append((config, 'RESULTS_DIR', results_dir))
+
+    originals = []
+    for target, name, value in patched:
+        if target is module and not hasattr(module, name):
+            continue
+        originals.append((target, name, getattr(target, name)))
+        setattr(target, name, value)
+    try:
+        yield
+    finally:
+        for target, name, value in reversed(originals):
+            setattr(target, name, value)
+
+
+def replay_session(test_name, events, user_id="replay", start_delay_ms=0, tail_ms=5000, max_duration_s=None,
+                   seed=0, start_wall_time=None, results_dir=None):
+    """
+    以無頭模式執行一個測試 session，並以 events 取代手把輸入
+
+    Args:
+        test_name: REPLAY_TARGETS 中的測試名稱
+        events: 重播事件（見 ReplayInput）；其中的「開始測試」標記（KIND_MARKER, MARKER_START）
+                在標記時間點擊 App 的開始按鈕，不會送給 ReplayInput
+        start_delay_ms: events 中沒有開始標記時，開始重播後多久點擊「開始測試」按鈕（沒有按鈕的測試忽略）
+        tail_ms: 最後一個事件之後繼續執行的虛擬時間，讓測試完成結算
+        max_duration_s: 虛擬時間上限（None 表示不限制）
+        seed: random 種子，確保目標位置等隨機內容可重現（重播紀錄檔時使用檔頭的 session_seed）
+        results_dir: 測試結果的儲存目錄（None 為 config.REPLAY_RESULTS_DIR）
+
+    Returns:
+        dict: app、listener、虛擬／真實耗時、回呼例外，以及測試是否自行關閉視窗
+    """
+    target = REPLAY_TARGETS[test_name]
+    module = importlib.import_module(target['module'])
+    clock = VirtualClock(start_wall_time)
+    root = HeadlessRoot(clock)
+    start_clicks_ns = [e[0] for e in events if e[1] == KIND_MARKER and e[2] == MARKER_START]
+    events = [e for e in events if e[1] != KIND_MARKER]
+    if not start_clicks_ns:
+        start_clicks_ns = [int(start_delay_ms * 1_000_000)]
+
+    wall_start = time.perf_counter()
+    with headless_environment(module, clock, results_dir or config.REPLAY_RESULTS_DIR):
+        random.seed(seed)
+        app, button_callback, analog_callback, sample_interval_ms = create_test_app(test_name, root, user_id)
+        listener = ReplayInput(events, root,
+                               button_callback=button_callback,
+                               analog_callback=analog_callback,
+                               analog_sample_interval_ms=sample_interval_ms)
+        app.listener = listener
+        if hasattr(app, 'start_button'):
+            # 重新開始時 App 可能建立新的按鈕，點擊時才取得目前的按鈕
+            for click_ns in start_clicks_ns:
+                root.call_at_ns(clock.now_ns + click_ns, lambda: app.start_button.invoke())
+        listener.start()
+
+        last_ns = max([listener.duration_ns] + start_clicks_ns)
+        until_ns = clock.now_ns + last_ns + tail_ms * 1_000_000
+        if max_duration_s is not None:
+            until_ns = min(until_ns, VIRTUAL_START_NS + int(max_duration_s * 1e9))
+        root.mainloop(until_ns=until_ns)
+        listener.stop()
+        flush_trace_jobs()
+
+    return {
+        'app': app,
+        'listener': listener,
+        'virtual_seconds': clock.elapsed_ns / 1e9,
+        'wall_seconds': time.perf_counter() - wall_start,
+        'errors': root.callback_errors,
+        'completed': root.destroyed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless replay of recorded controller input")
+    parser.add_argument("logs", nargs="+", help=get_text('arg_replay_logs'))
+    parser.add_argument("--test", "-t", required=True, choices=sorted(REPLAY_TARGETS), help=get_text('arg_replay_test'))
+    parser.add_argument("--user", "-u", default="replay", help=get_text('arg_user_id'))
+    parser.add_argument("--seed", type=int, default=None, help=get_text('arg_replay_seed'))
+    parser.add_argument("--results-dir", default=config.REPLAY_RESULTS_DIR, help=get_text('arg_replay_results_dir'))
+    parser.add_argument("--english", action="store_true", help=get_text('arg_english'))
+    args = parser.parse_args()
+
+    if args.english:
+        set_language('en')
+
+    failures = 0
+    for path in args.logs:
+        events, header = load_replay_events(path)
+        print(get_text('replay_started', path=path, count=len(events)))
+        seed = args.seed if args.seed is not None else header['session_seed']
+        if seed is None:
+            print(get_text('replay_no_session_seed', path=path))
+            seed = 0
+        if not any(e[1] == KIND_MARKER and e[2] == MARKER_START for e in events):
+            print(get_text('replay_no_start_marker', path=path))
+        result = replay_session(args.test, events, user_id=args.user, seed=seed,
+                                start_wall_time=header['start_wall_time'], results_dir=args.results_dir)
+        print(get_text('replay_summary', virtual=result['virtual_seconds'], wall=result['wall_seconds'],
+                       speedup=result['virtual_seconds'] / max(result['wall_seconds'], 1e-9),
+                       errors=len(result['errors'])))
+        if result['errors']:
+            failures += 1
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+跨使用者結果彙整 - 一次讀取 data/results 下所有使用者的結果，計算族群統計
+- 每個結果檔只保留摘要：使用者資訊（年齡、手把使用頻率）與 metrics 中的純量欄位
+  （巢狀 dict 以「.」串接成欄位名稱，例如 difficulty_analysis.long_large.avg_time；列表與軌跡 sidecar 一律略過）
+- 摘要依檔案的 mtime / 大小快取在 SQLite 中，結果資料夾沒有變動時重新彙整幾乎不需讀檔
+- 需要解析的檔案很多時以多個程序平行解析
+用法：
+    python -m common.result_aggregator --test button_reaction_time --metric average_reaction_time_ms --group-by age --bins 0,20,30,40,60
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sqlite3
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from . import config
+from . import result_index
+from .language import get_text, set_language
+
+# 使用者資訊欄位（與 save_test_result 寫入的欄位相同）
+USER_FIELDS = ("user_id", "test_name", "timestamp", "age", "controller_usage_frequency")
+
+# 需要解析的檔案少於此數量時直接在目前的程序解析（啟動程序池的成本比解析本身高）
+_PARALLEL_MIN_FILES = 64
+
+# 快取查詢每次帶入的路徑數（低於 SQLite 的參數數量上限）
+_LOOKUP_CHUNK = 500
+
+_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    summary TEXT NOT NULL
+);
+"""
+
+
+def _flatten_scalars(value, prefix, out):
+    """把巢狀 dict 中的純量欄位攤平成 {"a.b": 值}，略過列表"""
+    for key, item in value.items():
+        name = f"{prefix}{key}"
+        if isinstance(item, dict):
+            _flatten_scalars(item, name + ".", out)
+        elif isinstance(item, (int, float, str, bool)) or item is None:
+            out[name] = item
+    return out
+
+
+def summarize_result(path):
+    """
+    讀取一個結果檔，回傳摘要 dict（使用者資訊 + metrics 純量欄位）
+    不讀取軌跡 sidecar；檔案無法解析時回傳 None
+    大量的逐點軌跡已存在 sidecar 中，JSON 只剩 trial 明細：以 C 實作的 json 解析整個檔案，
+    比在 Python 中逐字略過不需要的列表還快（實測約 2.5 倍），因此不做選擇性解析
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    summary = {field: data.get(field) for field in USER_FIELDS}
+    summary["metrics"] = _flatten_scalars(data.get("metrics") or {}, "", {})
+    return summary
+
+
+def _summarize_batch(paths):
+    """程序池工作：解析一批檔案"""
+    return [summarize_result(path) for path in paths]
+
+
+def list_result_files(test_name=None, results_dir=None):
+    """
+    列出所有使用者的結果檔案（使用各使用者的結果索引，不列出每個使用者資料夾）
+    索引以唯讀方式開啟，彙整不會在資料夾中建立索引檔；索引不存在或資料夾在索引建立後有變動
+    （例如合併其他測試站的結果）時，該使用者的資料夾在記憶體中重新掃描
+    """
+    root = Path(results_dir or config.RESULTS_DIR)
+    if not root.exists():
+        return []
+    files = []
+    for user_dir in sorted(root.iterdir()):
+        if user_dir.is_dir():
+            files.extend(result_index.query_results(user_dir.name, test_name, results_dir=str(root),
+                                                    read_only=True))
+    return files
+
+
+class SummaryCache:
+    """結果摘要快取：以 (路徑, mtime_ns, 大小) 判斷檔案是否變動"""
+
+    def __init__(self, path=None):
+        self.path = path or config.AGGREGATE_CACHE_FILE
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(_CACHE_SCHEMA)
+
+    def lookup(self, stats):
+        """
+        stats: {路徑: (mtime_ns, 大小)}
+        回傳 (命中的摘要 {路徑: 摘要}, 需要重新解析的路徑列表)
+        只查詢 stats 中的路徑；快取以絕對路徑為鍵，從不同工作目錄執行也能命中
+        """
+        keys = {os.path.abspath(path): path for path in stats}
+        absolute = list(keys)
+        cached = {}
+        for i in range(0, len(absolute), _LOOKUP_CHUNK):
+            chunk = absolute[i:i + _LOOKUP_CHUNK]
+            sql = f"SELECT path, mtime_ns, size, summary FROM summaries WHERE path IN ({','.join('?' * len(chunk))})"
+            for key, mtime_ns, size, summary in self.conn.execute(sql, chunk):
+                path = keys[key]
+                if stats[path] == (mtime_ns, size):
+                    cached[path] = json.loads(summary)
+        missing = [path for path in stats if path not in cached]
+        return cached, missing
+
+    def store(self, stats, summaries):
+        """寫入新解析的摘要（單一交易）"""
+        rows = [(os.path.abspath(path), stats[path][0], stats[path][1], json.dumps(summary, ensure_ascii=False))
+                for path, summary in summaries.items() if summary is not None]
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?)", rows)
+
+    def close(self):
+        self.conn.close()
+
+
+def _parse_files(paths, workers):
+    """解析檔案摘要；檔案多時分批交給程序池平行解析"""
+    if workers <= 1 or len(paths) < _PARALLEL_MIN_FILES:
+        return dict(zip(paths, _summarize_batch(paths)))
+
+    batch_size = max(16, len(paths) // (workers * 4))
+    batches = [paths[i:i + batch_size] for i in range(0, len(paths), batch_size)]
+    summaries = {}
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        for batch, results in zip(batches, executor.map(_summarize_batch, batches)):
+            summaries.update(zip(batch, results))
+    return summaries
+
+
+def load_summaries(test_name=None, results_dir=None, use_cache=True, workers=None):
+    """
+    讀取所有使用者（可限定測試）的結果摘要
+
+    Args:
+        test_name: 只讀取指定測試（None = 所有測試）
+        results_dir: 結果根目錄（預設 config.RESULTS_DIR）
+        use_cache: 是否使用摘要快取
+        workers: 平行解析的程序數（預設 config.AGGREGATE_WORKERS，0 = CPU 核心數）
+
+    Returns:
+        list: 摘要 dict 列表，依使用者與時間排序
+    """
+    files = list_result_files(test_name, results_dir)
+    stats = {}
+    for path in files:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue  # 索引中的檔案已被刪除
+        stats[path] = (st.st_mtime_ns, st.st_size)
+
+    if workers is None:
+        workers = config.AGGREGATE_WORKERS or os.cpu_count() or 1
+
+    cache = SummaryCache() if use_cache else None
+    try:
+        cached, missing = cache.lookup(stats) if cache else ({}, list(stats))
+        parsed = _parse_files(missing, workers)
+        if cache and parsed:
+            cache.store(stats, parsed)
+    finally:
+        if cache:
+            cache.close()
+
+    summaries = dict(cached)
+    summaries.update(parsed)
+    return [summaries[path] for path in stats if summaries.get(path) is not None]
+
+
+def latest_per_user(summaries):
+    """每位使用者每個測試只保留最新的一筆"""
+    latest = {}
+    for summary in summaries:
+        key = (summary["user_id"], summary["test_name"])
+        if key not in latest or (summary["timestamp"] or "") >= (latest[key]["timestamp"] or ""):
+            latest[key] = summary
+    return list(latest.values())
+
+
+def _group_label(value, bins):
+    """依分組邊界回傳組別名稱，例如 bins=[20, 30] 時 25 -> "20-29" """
+    if value is None:
+        return None
+    if not bins:
+        return value
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    for low, high in zip(bins, bins[1:]):
+        if low <= value < high:
+            return f"{low}-{high - 1}" if isinstance(low, int) and isinstance(high, int) else f"{low}-{high}"
+    return None
+
+
+def aggregate(summaries, metric, group_by=None, bins=None):
+    """
+    依 group_by 欄位（使用者資訊或 metrics 欄位）分組，計算 metric 的統計
+
+    Args:
+        summaries: load_summaries 的結果
+        metric: metrics 中的欄位名稱（巢狀欄位以「.」串接）
+        group_by: 分組欄位，例如 "age"、"controller_usage_frequency"；None 為不分組
+        bins: 數值分組邊界，例如 [0, 20, 30, 40, 60]
+
+    Returns:
+        dict: {組別: {"count", "mean", "median", "stdev", "min", "max"}}
+    """
+    groups = {}
+    for summary in summaries:
+        value = summary["metrics"].get(metric)
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            continue
+        if group_by is None:
+            group = "all"
+        else:
+            key = summary[group_by] if group_by in USER_FIELDS else summary["metrics"].get(group_by)
+            group = _group_label(key, bins)
+            if group is None:
+                continue
+        groups.setdefault(group, []).append(value)
+
+    table = {}
+    for group in sorted(groups, key=str):
+        values = groups[group]
+        table[group] = {
+            "count": len(values),
+            "mean": statistics.mean(values),
+            "median": statistics.median(values),
+            "stdev": statistics.stdev(values) if len(values) > 1 else 0.0,
+            "min": min(values),
+            "max": max(values),
+        }
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=get_text('aggregate_description'))
+    parser.add_argument("--test", "-t", default=None, help=get_text('arg_aggregate_test'))
+    parser.add_argument("--metric", "-m", required=True, help=get_text('arg_aggregate_metric'))
+    parser.add_argument("--group-by", "-g", default=None, help=get_text('arg_aggregate_group_by'))
+    parser.add_argument("--bins", default=None, help=get_text('arg_aggregate_bins'))
+    parser.add_argument("--latest", action="store_true", help=get_text('arg_aggregate_latest'))
+    parser.add_argument("--results-dir", default=None, help=get_text('arg_aggregate_results_dir'))
+    parser.add_argument("--no-cache", action="store_true", help=get_text('arg_aggregate_no_cache'))
+    parser.add_argument("--english", action="store_true", help=get_text('arg_english'))
+    args = parser.parse_args()
+
+    if args.english:
+        set_language('en')
+
+    bins = [float(b) if "." in b else int(b) for b in args.bins.split(",")] if args.bins else None
+    summaries = load_summaries(args.test, args.results_dir, use_cache=not args.no_cache)
+    if args.latest:
+        summaries = latest_per_user(summaries)
+    table = aggregate(summaries, args.metric, args.group_by, bins)
+
+    print(get_text('aggregate_summary', files=len(summaries), metric=args.metric))
+    print(f"{args.group_by or '':<12}{'n':>6}{'mean':>12}{'median':>12}{'stdev':>12}{'min':>12}{'max':>12}")
+    for group, row in table.items():
+        print(f"{str(group):<12}{row['count']:>6}{row['mean']:>12.3f}{row['median']:>12.3f}"
+              f"{row['stdev']:>12.3f}{row['min']:>12.3f}{row['max']:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+測試結果索引 - 每位使用者一個 SQLite 索引檔，記錄結果 JSON 的測試名稱與時間
+- save_test_result 儲存結果時同步寫入索引（單一交易，寫入失敗不會留下半筆資料）
+- 查詢最新結果、某個測試的所有結果或時間範圍時，只查詢 (test_name, stamp) 索引，不列出整個資料夾
+- 索引檔不存在時（例如舊資料或從其他電腦複製的結果），第一次查詢時掃描資料夾一次建立索引
+- 索引記錄使用者資料夾的 mtime：檔案在程式外新增、刪除或改名後資料夾 mtime 改變，下次查詢時重新掃描
+  （每次查詢只多一次 stat()；回滾日誌使用 TRUNCATE 模式，寫入索引本身不會改變資料夾的 mtime）
+- 彙整與分析工具以唯讀方式查詢（read_only=True）：只開啟既有的索引，索引不存在時在記憶體中掃描，不寫入資料夾
+"""
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from common import config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    file_name TEXT PRIMARY KEY,
+    test_name TEXT NOT NULL,
+    stamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_by_test ON results (test_name, stamp);
+CREATE INDEX IF NOT EXISTS results_by_stamp ON results (stamp);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def user_result_dir(user_id, results_dir=None):
+    """使用者的結果資料夾（results_dir 預設為 config.RESULTS_DIR）"""
+    return Path(results_dir or config.RESULTS_DIR) / user_id
+
+
+def _index_path(user_id, results_dir=None):
+    return user_result_dir(user_id, results_dir) / config.RESULT_INDEX_FILENAME
+
+
+def parse_result_file_name(file_name):
+    """
+    從結果檔名 (test_name_YYYYMMDD_HHMMSS.json) 取出 (test_name, stamp)
+    不符合格式的檔案回傳 None
+    """
+    if not file_name.endswith(".json"):
+        return None
+    parts = file_name[:-len(".json")].rsplit("_", 2)
+    if len(parts) != 3 or not (parts[1].isdigit() and parts[2].isdigit()):
+        return None
+    return parts[0], f"{parts[1]}_{parts[2]}"
+
+
+def _stamp(value):
+    """時間範圍參數：接受 datetime 或 YYYYMMDD_HHMMSS 字串"""
+    if isinstance(value, datetime):
+        return value.strftime("%Y%m%d_%H%M%S")
+    return value
+
+
+def _dir_mtime_ns(result_dir):
+    return result_dir.stat().st_mtime_ns
+
+
+def _is_fresh(conn, result_dir):
+    """索引記錄的資料夾 mtime 與目前相同（舊版索引沒有 meta 資料表，視為過期）"""
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'dir_mtime_ns'").fetchone()
+    except sqlite3.OperationalError:
+        return False
+    return row is not None and row[0] == _dir_mtime_ns(result_dir)
+
+
+def _mark_fresh(conn, result_dir):
+    """在目前的寫入交易中記錄資料夾 mtime（日誌檔此時已建立，之後的提交不會再改變 mtime）"""
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('dir_mtime_ns', ?)", (_dir_mtime_ns(result_dir),))
+
+
+def _open_writable(path):
+    conn = sqlite3.connect(str(path))
+    # 預設的 DELETE 模式每次提交都會建立再刪除日誌檔，使資料夾 mtime 改變而讓索引看起來過期
+    conn.execute("PRAGMA journal_mode=TRUNCATE")
+    return conn
+
+
+def _connect(user_id, results_dir=None, read_only=False):
+    """
+    開啟索引；索引檔不存在或資料夾在索引建立後有變動時，先掃描資料夾重新建立
+    read_only=True 時以唯讀模式開啟既有索引；需要重新掃描時結果只放在記憶體中，不寫入資料夾
+    """
+    result_dir = user_result_dir(user_id, results_dir)
+    path = _index_path(user_id, results_dir)
+    if path.exists():
+        if read_only:
+            conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+            if _is_fresh(conn, result_dir):
+                return conn
+            conn.close()
+            conn = sqlite3.connect(":memory:")
+        else:
+            conn = _open_writable(path)
+            if _is_fresh(conn, result_dir):
+                return conn
+    else:
+        conn = sqlite3.connect(":memory:") if read_only else _open_writable(path)
+    _rebuild(conn, result_dir)
+    return conn
+
+
+def _rebuild(conn, result_dir):
+    """清空索引並依資料夾中現有的結果檔重新建立"""
+    rows = []
+    for file_path in result_dir.glob("*.json"):
+        parsed = parse_result_file_name(file_path.name)
+        if parsed is not None:
+            rows.append((file_path.name,) + parsed)
+    conn.executescript(_SCHEMA)
+    with conn:
+        conn.execute("DELETE FROM results")
+        conn.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?)", rows)
+        _mark_fresh(conn, result_dir)
+
+
+def rebuild_index(user_id, results_dir=None):
+    """手動重新建立索引（例如結果檔案在程式外被新增、刪除或改名後；results_dir 預設為 config.RESULTS_DIR）"""
+    result_dir = user_result_dir(user_id, results_dir)
+    if not result_dir.exists():
+        return
+    conn = _open_writable(_index_path(user_id, results_dir))
+    try:
+        _rebuild(conn, result_dir)
+    finally:
+        conn.close()
+
+
+def is_index_current(user_id, results_dir=None):
+    """
+    索引檔存在且與資料夾內容一致
+    save_test_result 在寫入結果檔之前呼叫，寫入後把結果交給 add_result(index_current=...)，
+    自己新增的結果檔不會讓索引被當成過期而重新掃描資料夾
+    """
+    result_dir = user_result_dir(user_id, results_dir)
+    path = _index_path(user_id, results_dir)
+    if not path.exists():
+        return False
+    conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        return _is_fresh(conn, result_dir)
+    finally:
+        conn.close()
+
+
+def add_result(user_id, file_path, results_dir=None, index_current=False):
+    """
+    把剛儲存的結果檔加入索引
+    index_current: 寫入結果檔之前 is_index_current() 的結果；False 時先檢查索引是否需要重新掃描
+    """
+    parsed = parse_result_file_name(Path(file_path).name)
+    if parsed is None:
+        return
+    if index_current:
+        conn = _open_writable(_index_path(user_id, results_dir))
+    else:
+        conn = _connect(user_id, results_dir)
+    try:
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)", (Path(file_path).name,) + parsed)
+            _mark_fresh(conn, user_result_dir(user_id, results_dir))
+    finally:
+        conn.close()
+
+
+def query_results(user_id, test_name=None, start=None, end=None, latest=False, results_dir=None, read_only=False):
+    """
+    查詢結果檔案路徑，依時間排序
+
+    Args:
+        results_dir: 結果根目錄（預設 config.RESULTS_DIR）
+        test_name: 只查詢指定測試（None = 所有測試）
+        start / end: 時間範圍（含兩端），datetime 或 YYYYMMDD_HHMMSS 字串
+        latest: 只回傳最新的一筆
+        read_only: 不建立或修改索引檔（彙整其他使用者的資料時使用）
+
+    Returns:
+        list: 結果檔案路徑列表
+    """
+    result_dir = user_result_dir(user_id, results_dir)
+    if not result_dir.exists():
+        return []
+
+    clauses, args = [], []
+    if test_name is not None:
+        clauses.append("test_name = ?")
+        args.append(test_name)
+    if start is not None:
+        clauses.append("stamp >= ?")
+        args.append(_stamp(start))
+    if end is not None:
+        clauses.append("stamp <= ?")
+        args.append(_stamp(end))
+    sql = "SELECT file_name FROM results"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    # 與原本依檔名排序的結果相同：同一秒的檔案再依檔名排序
+    sql += " ORDER BY stamp DESC, file_name DESC LIMIT 1" if latest else " ORDER BY stamp, file_name"
+
+    conn = _connect(user_id, results_dir, read_only)
+    try:
+        rows = conn.execute(sql, args).fetchall()
+    finally:
+        conn.close()
+    prefix = os.path.join(str(result_dir), "")  # 大量結果時逐一 os.path.join 比查詢本身還慢
+    return [prefix + name for (name,) in rows]
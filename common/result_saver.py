@@ -8,8 +8,24 @@ import os
 from datetime import datetime
 from pathlib import Path
 from common import config
+from common import result_index
+from common import trajectory_store
 from common.language import get_text
 
+# 本行程中已儲存的結果檔案（依儲存順序），測試執行器據此找出每個測試產生的結果
+saved_result_files = []
+
+
+def user_info_for(user_id):
+    """
+    取得指定使用者的基本資訊：先查 config.participants（多人同時測試時每位受試者各自一份），
+    再查目前的使用者 config.user_info；都沒有時回傳 None
+    """
+    info = config.participants.get(user_id)
+    if info is None and getattr(config, 'user_info', None) and config.user_info.get('user_id') == user_id:
+        info = config.user_info
+    return info
+
 
 def save_test_result(user_id, test_name, metrics, parameters=None, image_files=None):
     """
@@ -38,12 +54,11 @@ def save_test_result(user_id, test_name, metrics, parameters=None, image_files=N
     }
     
     # 加入使用者基本資訊（如果有設定的話）
-    if hasattr(config, 'user_info') and config.user_info:
-        # 確保 user_id 一致
-        if config.user_info.get('user_id') == user_id:
-            result_data["age"] = config.user_info.get('age')
-            result_data["controller_usage_frequency"] = config.user_info.get('controller_usage_frequency')
-            result_data["controller_usage_frequency_description"] = config.user_info.get('controller_usage_frequency_description')
+    user_info = user_info_for(user_id)
+    if user_info:
+        result_data["age"] = user_info.get('age')
+        result_data["controller_usage_frequency"] = user_info.get('controller_usage_frequency')
+        result_data["controller_usage_frequency_description"] = user_info.get('controller_usage_frequency_description')
     
     # 如果有圖片檔案，加入記錄
     if image_files:
@@ -52,86 +67,129 @@ def save_test_result(user_id, test_name, metrics, parameters=None, image_files=N
     # 建立儲存目錄
     result_dir = Path(config.RESULTS_DIR) / user_id
     result_dir.mkdir(parents=True, exist_ok=True)
+    # 在新增檔案之前確認索引是否與資料夾一致（寫入結果檔本身會改變資料夾的 mtime）
+    index_current = result_index.is_index_current(user_id)
     
     # 建立帶有時間戳記的檔案名稱以避免覆蓋
     timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
     file_path = result_dir / f"{test_name}_{timestamp_str}.json"
     
+    # 以 Columnar 標記的軌跡序列另存為二進位 sidecar，JSON 中只保留參照
+    result_data = trajectory_store.extract_columns(result_data, trajectory_store.sidecar_path_for(file_path),
+                                                   inline=config.TRAJECTORY_STORAGE == "inline")
+    
     # 寫入 JSON 檔案
     with open(file_path, 'w', encoding='utf-8') as f:
         json.dump(result_data, f, indent=2, ensure_ascii=False)
     
+    result_index.add_result(user_id, file_path, index_current=index_current)
+    
     print(f"📄 {get_text('test_results_saved')}：{file_path}")
+    saved_result_files.append(str(file_path))
     return str(file_path)
 
 
-def load_test_result(user_id, test_name):
+def save_session_manifest(user_id, session_id, tests, started_at, finished_at):
+    """
+    儲存完整測試套件的 session 清單，連結這次 session 中每個測試的結果 JSON
+
+    Args:
+        user_id: 使用者 ID
+        session_id: session 編號（開始時間 YYYYMMDD_HHMMSS）
+        tests: 每個測試的紀錄 [{"test": ..., "result_files": [...], ...}]
+        started_at / finished_at: ISO 格式的開始與結束時間
+
+    Returns:
+        str: 儲存的檔案路徑
+    """
+    manifest = {
+        "user_id": user_id,
+        "session_id": session_id,
+        "started_at": started_at,
+        "finished_at": finished_at,
+        "completed_tests": sum(1 for test in tests if test["result_files"]),
+        "total_tests": len(tests),
+        "tests": tests,
+    }
+    user_info = user_info_for(user_id)
+    if user_info:
+        manifest["age"] = user_info.get('age')
+        manifest["controller_usage_frequency"] = user_info.get('controller_usage_frequency')
+
+    session_dir = Path(config.SESSIONS_DIR) / user_id
+    session_dir.mkdir(parents=True, exist_ok=True)
+    file_path = session_dir / f"session_{session_id}.json"
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    print(f"📄 {get_text('session_manifest_saved')}：{file_path}")
+    return str(file_path)
+
+
+def load_test_result(user_id, test_name, load_columns=True, results_dir=None):
     """
     載入測試結果 JSON 檔案（載入最新的檔案）
     
     Args:
         user_id: 使用者 ID
         test_name: 測試名稱
+        load_columns: 是否把軌跡 sidecar 參照換成 numpy 唯讀陣列（False 時保留參照）
+        results_dir: 結果根目錄（預設 config.RESULTS_DIR）
     
     Returns:
         dict: 測試結果資料，若檔案不存在則返回 None
     """
-    user_dir = Path(config.RESULTS_DIR) / user_id
-    
-    if not user_dir.exists():
+    # 從索引取得最新的檔案，不需列出整個資料夾
+    latest_files = result_index.query_results(user_id, test_name, latest=True, results_dir=results_dir)
+    if not latest_files:
         return None
     
-    # 尋找符合模式的檔案 (test_name_YYYYMMDD_HHMMSS.json)
-    pattern = f"{test_name}_*.json"
-    matching_files = list(user_dir.glob(pattern))
+    if not os.path.exists(latest_files[0]):
+        # 結果檔案在程式外被刪除或搬移，重新建立索引後再查一次
+        result_index.rebuild_index(user_id, results_dir)
+        latest_files = result_index.query_results(user_id, test_name, latest=True, results_dir=results_dir)
+        if not latest_files:
+            return None
     
-    if not matching_files:
-        return None
-    
-    # 取得最新的檔案（按檔案名稱排序，最後一個就是最新的）
-    latest_file = sorted(matching_files)[-1]
-    
-    with open(latest_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_result_file(latest_files[0], load_columns)
+
+
+def load_result_file(file_path, load_columns=True):
+    """
+    載入指定的結果 JSON 檔案
+    軌跡 sidecar 以 memmap 讀回，序列在實際存取前不會讀入記憶體
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        result_data = json.load(f)
+    if load_columns:
+        result_data = trajectory_store.load_columns(result_data, file_path)
+    return result_data
 
 
-def get_user_test_results(user_id):
+def get_user_test_results(user_id, start=None, end=None):
     """
     取得使用者的所有測試結果檔案
     
     Args:
         user_id: 使用者 ID
+        start / end: 時間範圍（可選，含兩端），datetime 或 YYYYMMDD_HHMMSS 字串
     
     Returns:
-        list: 測試結果檔案路徑列表
+        list: 測試結果檔案路徑列表，按時間順序排序
     """
-    user_dir = Path(config.RESULTS_DIR) / user_id
-    
-    if not user_dir.exists():
-        return []
-    
-    return [str(f) for f in user_dir.glob("*.json")]
+    return result_index.query_results(user_id, start=start, end=end)
 
 
-def get_test_result_files(user_id, test_name):
+def get_test_result_files(user_id, test_name, start=None, end=None):
     """
     取得使用者特定測試的所有結果檔案
     
     Args:
         user_id: 使用者 ID
         test_name: 測試名稱
+        start / end: 時間範圍（可選，含兩端），datetime 或 YYYYMMDD_HHMMSS 字串
     
     Returns:
         list: 測試結果檔案路徑列表，按時間順序排序
     """
-    user_dir = Path(config.RESULTS_DIR) / user_id
-    
-    if not user_dir.exists():
-        return []
-    
-    # 尋找符合模式的檔案 (test_name_YYYYMMDD_HHMMSS.json)
-    pattern = f"{test_name}_*.json"
-    matching_files = list(user_dir.glob(pattern))
-    
-    # 按檔案名稱排序（時間戳記順序）
-    return [str(f) for f in sorted(matching_files)]
+    return result_index.query_results(user_id, test_name, start=start, end=end)
@@ -0,0 +1,163 @@
+"""
+ISO 9241 多方向指向測試的目標排程（analog_move 使用）
+- 把 距離 × 目標大小 × 測試序列 展開成預先計算好、不可修改的目標表：第一個為暖身目標，其後每個條件一個區塊
+- 每個目標附帶預期移動距離（從上一個目標中心算起）與難度指數 ID = log2(D / W + 1)（W 為目標直徑）
+- 相同參數的排程只計算一次；指定 seed 時以固定亂數打亂條件區塊順序，不同電腦產生的排程完全相同
+- 排程可存成 JSON 檔，各測試站載入同一個檔案即可使用相同的目標順序
+用法：
+    python -m common.target_schedule --output data/schedules/analog_move_long.json --repetitions 10 --seed 42
+"""
+import argparse
+import functools
+import json
+import math
+import random
+from pathlib import Path
+from types import MappingProxyType
+
+from .language import get_text, set_language
+
+SCHEDULE_FORMAT_VERSION = 1
+
+# 原本的測試設計：長距離 300px、短距離 100px；大目標半徑 50px、小目標半徑 20px
+DEFAULT_DISTANCES = (("long", 300), ("short", 100))
+DEFAULT_SIZES = (("large", 50), ("small", 20))
+# 從位置1開始，每次跳到對面順時針的下一個位置
+DEFAULT_TEST_SEQUENCE = (1, 6, 2, 7, 3, 8, 4, 0, 5)
+WARMUP_RADIUS = 30
+
+
+def circle_points(center_x, center_y, radius, count=9):
+    """圓周上等角度的 count 個點，位置 0 在右方（0°），順時針編號"""
+    points = []
+    for i in range(count):
+        angle = i * (360 / count) * math.pi / 180
+        points.append((center_x + radius * math.cos(angle), center_y + radius * math.sin(angle)))
+    return points
+
+
+def _freeze(targets, start_x, start_y):
+    """補上預期距離與難度指數，轉成不可修改的目標表"""
+    frozen = []
+    prev_x, prev_y = start_x, start_y
+    for target in targets:
+        distance = math.hypot(target["x"] - prev_x, target["y"] - prev_y)
+        target["expected_distance"] = distance
+        target["index_of_difficulty"] = math.log2(distance / (target["radius"] * 2) + 1)
+        frozen.append(MappingProxyType(target))
+        prev_x, prev_y = target["x"], target["y"]
+    return tuple(frozen)
+
+
+@functools.lru_cache(maxsize=8)
+def build_schedule(center_x, center_y, distances=DEFAULT_DISTANCES, sizes=DEFAULT_SIZES,
+                   test_sequence=DEFAULT_TEST_SEQUENCE, warmup_radius=WARMUP_RADIUS, repetitions=1, seed=None):
+    """
+    產生目標排程（參數必須可雜湊，相同參數直接回傳同一個目標表）
+
+    Args:
+        center_x / center_y: 圓心（玩家起始位置）
+        distances: ((距離類型, 圓半徑), ...)
+        sizes: ((大小類型, 目標半徑), ...)
+        test_sequence: 圓周位置的拜訪順序
+        warmup_radius: 暖身目標半徑（暖身目標位於第一個距離圓上、序列最後一個位置）
+        repetitions: 每個條件區塊重複的次數
+        seed: None 為固定順序（依 distances × sizes 的順序）；指定時以此亂數種子打亂所有條件區塊
+
+    Returns:
+        tuple: 每個目標為唯讀 mapping，欄位 x、y、radius、sequence_index、position_index、size_type、
+               distance_type、is_warmup、block_index、expected_distance、index_of_difficulty
+    """
+    circles = {name: circle_points(center_x, center_y, radius, 9) for name, radius in distances}
+    first_circle = circles[distances[0][0]]
+
+    last_pos_index = test_sequence[-1]
+    x, y = first_circle[last_pos_index]
+    targets = [{
+        "x": x,
+        "y": y,
+        "radius": warmup_radius,
+        "sequence_index": 0,
+        "position_index": last_pos_index,
+        "size_type": "warmup",
+        "distance_type": distances[0][0],
+        "is_warmup": True,
+        "block_index": 0,
+    }]
+
+    blocks = [(distance_type, size_type, radius)
+              for _ in range(repetitions)
+              for distance_type, _distance in distances
+              for size_type, radius in sizes]
+    if seed is not None:
+        random.Random(seed).shuffle(blocks)
+
+    for block_index, (distance_type, size_type, radius) in enumerate(blocks, start=1):
+        for i, pos_index in enumerate(test_sequence):
+            x, y = circles[distance_type][pos_index]
+            targets.append({
+                "x": x,
+                "y": y,
+                "radius": radius,
+                "sequence_index": i + 1,
+                "position_index": pos_index,
+                "size_type": size_type,
+                "distance_type": distance_type,
+                "is_warmup": False,
+                "block_index": block_index,
+            })
+    return _freeze(targets, center_x, center_y)
+
+
+def save_schedule(schedule, path, **settings):
+    """把排程存成 JSON（settings 為產生排程的參數，一併記錄以便追查）"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "format_version": SCHEDULE_FORMAT_VERSION,
+        "settings": settings,
+        "targets": [dict(target) for target in schedule],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def load_schedule(path, start_x, start_y):
+    """
+    從 JSON 載入排程（可為 save_schedule 的輸出，或只有 "targets" 列表的手寫檔案）
+    預期距離與難度指數依載入的目標順序重新計算，起點為 (start_x, start_y)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    targets = data["targets"] if isinstance(data, dict) else data
+    for index, target in enumerate(targets):
+        target.setdefault("is_warmup", False)
+        target.setdefault("sequence_index", index)
+        target.setdefault("position_index", 0)
+        target.setdefault("size_type", "unknown")
+        target.setdefault("distance_type", "unknown")
+        target.setdefault("block_index", 0)
+    return _freeze(targets, start_x, start_y)
+
+
+def main():
+    from . import config
+
+    parser = argparse.ArgumentParser(description=get_text('schedule_description'))
+    parser.add_argument("--output", "-o", required=True, help=get_text('arg_schedule_output'))
+    parser.add_argument("--repetitions", "-r", type=int, default=1, help=get_text('arg_schedule_repetitions'))
+    parser.add_argument("--seed", "-s", type=int, default=None, help=get_text('arg_schedule_seed'))
+    parser.add_argument("--english", action="store_true", help=get_text('arg_english'))
+    args = parser.parse_args()
+
+    if args.english:
+        set_language('en')
+
+    center_x, center_y = config.WINDOW_WIDTH // 2, config.WINDOW_HEIGHT // 2
+    schedule = build_schedule(center_x, center_y, repetitions=args.repetitions, seed=args.seed)
+    save_schedule(schedule, args.output, center=[center_x, center_y], repetitions=args.repetitions, seed=args.seed)
+    print(get_text('schedule_saved', count=len(schedule), path=args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""
+同一行程內的測試執行器
+- 每個測試模組只匯入一次，之後切換測試不需重新啟動 Python、重新載入 pygame / tkinter
+- 共用一個隱藏的 Tk 根視窗，每個測試在自己的 Toplevel 視窗中執行
+- 共用同一個手把監聽（ControllerInput），切換測試時只重新綁定回呼，不重新列舉與開啟手把
+- 開啟原始輸入紀錄時，每個測試（多人時每位受試者）各自寫入一個紀錄檔
+- 多人同時測試：所有手把由同一個 ControllerInputService 事件迴圈讀取，每位受試者各自一個視窗與頻道
+- 完整測試套件：依序執行所有測試，目前測試進行時即預先載入下一個測試，最後儲存一份 session 清單
+"""
+import importlib
+import time
+import tkinter as tk
+from datetime import datetime
+from threading import Thread
+
+from . import config
+from . import result_saver
+from .input_recorder import default_record_path
+from .language import get_text
+from .trace_plot import flush_trace_jobs, warm_trace_workers, shutdown_trace_workers
+from .utils import collect_user_info_if_needed, seed_session
+
+# 可執行的測試：模組、App 類別、按鍵與搖桿回呼名稱，以及建立 App 後的額外設定（與各測試的 __main__ 相同）
+TEST_TARGETS = {
+    'button_reaction_time': {
+        'module': 'tests.button_reaction_time_test',
+        'app': 'ReactionTestApp',
+        'button_callback': 'on_joycon_input',
+    },
+    'button_prediction_countdown': {
+        'module': 'tests.button_prediction_countdown_test',
+        'app': 'CountdownReactionTestApp',
+        'button_callback': 'on_joycon_input',
+    },
+    'button_smash': {
+        'module': 'tests.button_smash_test',
+        'app': 'ButtonSmashTestApp',
+        'button_callback': 'on_joycon_input',
+    },
+    'button_accuracy': {
+        'module': 'tests.button_accuracy_test',
+        'app': 'AccuracyDirectionTestApp',
+        'button_callback': 'on_joycon_input',
+        'button_bits': {'up': 3, 'down': 0, 'left': 2, 'right': 1},
+    },
+    'analog_move': {
+        'module': 'tests.analog_move_test',
+        'app': 'JoystickTargetTestApp',
+        'button_callback': 'on_joycon_button',
+        'analog_callback': 'on_joycon_input',
+        'analog_sample_interval_ms': config.CONTROLLER_DRAIN_INTERVAL_MS,
+    },
+    'analog_path_follow': {
+        'module': 'tests.analog_path_follow_test',
+        'app': 'PathFollowingTestApp',
+        'analog_callback': 'on_joycon_input',
+        'analog_sample_interval_ms': config.CONTROLLER_DRAIN_INTERVAL_MS,
+    },
+}
+
+
+# 完整測試套件的執行順序（與 main.py 選單 1-6 相同，由簡單到難）
+SUITE_TESTS = list(TEST_TARGETS)
+
+
+def create_test_app(test_name, root, user_id):
+    """
+    建立測試 App 並套用與該測試 __main__ 相同的設定
+
+    Returns:
+        tuple: (app, button_callback, analog_callback, analog_sample_interval_ms)
+    """
+    target = TEST_TARGETS[test_name]
+    module = importlib.import_module(target['module'])
+    app = getattr(module, target['app'])(root, user_id)
+    for direction, bit in target.get('button_bits', {}).items():
+        app.directions[direction]["bit"] = bit
+
+    button_callback = target.get('button_callback')
+    analog_callback = target.get('analog_callback')
+    return (app,
+            getattr(app, button_callback) if button_callback else None,
+            getattr(app, analog_callback) if analog_callback else None,
+            target.get('analog_sample_interval_ms', -1))
+
+
+class _SharedListener:
+    """交給 App 的手把監聽代理：App 關閉時只解除自己的回呼，不關閉共用的手把"""
+
+    def __init__(self, controller):
+        self._controller = controller
+
+    def run(self):
+        pass  # 共用的監聽執行緒由 InProcessTestRunner 啟動
+
+    def stop(self):
+        self._controller.unbind()
+
+    def __getattr__(self, name):
+        return getattr(self._controller, name)
+
+
+class InProcessTestRunner:
+    """
+    在同一個行程中依序執行多個測試
+    用法：
+        runner = InProcessTestRunner()
+        runner.run_test('button_smash', user_id)
+        ...
+        runner.close()
+    """
+
+    def __init__(self):
+        self.root = tk.Tk()
+        self.root.withdraw()  # 根視窗只用來持有 Tcl 直譯器與事件迴圈，測試畫面都在 Toplevel 中
+        self.service = None
+        self.controller = None
+
+    def _ensure_controller(self):
+        """
+        第一次執行測試時才開啟手把（使用 controller_manager 已選擇的手把），之後所有測試共用
+        手把事件由 ControllerInputService 讀取，多人同時測試時其他手把加入同一個事件迴圈
+        """
+        if self.controller is None:
+            from .controller_manager import controller_manager
+            from .input_service import ControllerInputService
+            self.service = ControllerInputService()
+            joystick = None
+            if controller_manager.is_controller_selected():
+                joystick = controller_manager.create_controller()
+            if joystick is None:
+                joystick = controller_manager.acquire_first()
+            if joystick is None:
+                print(get_text('controller_no_pairing'))
+            self.controller = self.service.attach(joystick, tk_root=self.root)
+            self.service.start()
+        return self.controller
+
+    def _open_test_window(self, test_name, user_id, channel):
+        """
+        建立測試視窗與 App，並把手把頻道綁定到 App 的回呼
+        建立 App 前選擇新的 random 種子（與單獨執行測試相同，記錄在原始輸入紀錄中供重播）
+        """
+        window = tk.Toplevel(self.root)
+        # 測試自行關閉或使用者直接關掉視窗時，結束這次的事件迴圈
+        window.bind("<Destroy>", lambda event: event.widget is window and self.root.quit(), add="+")
+        app = None
+        try:
+            seed_session()
+            app, button_callback, analog_callback, sample_interval_ms = create_test_app(test_name, window, user_id)
+        except Exception:
+            self._finish_test(app, window, channel)
+            raise
+        # 每個測試（多人時每位受試者）各自一個原始輸入紀錄檔，_finish_test() 解除綁定時關閉
+        record_path = default_record_path(user_id) if config.RECORD_RAW_INPUT else None
+        channel.bind(button_callback=button_callback,
+                     analog_callback=analog_callback,
+                     analog_sample_interval_ms=sample_interval_ms,
+                     record_path=record_path)
+        app.listener = _SharedListener(channel)
+        return app, window
+
+    def run_test(self, test_name, user_id):
+        """
+        執行一個測試，直到測試視窗關閉才返回
+
+        Returns:
+            object: 測試的 App 物件（可讀取測試結果）
+        """
+        start = time.perf_counter()
+        controller = self._ensure_controller()
+        app, window = self._open_test_window(test_name, user_id, controller)
+        try:
+            print(get_text('test_runner_ready', name=test_name,
+                           ms=(time.perf_counter() - start) * 1000))
+            self.root.mainloop()
+        finally:
+            self._finish_test(app, window, controller)
+            self._cancel_pending_after()
+        return app
+
+    def run_concurrent(self, test_name, user_ids):
+        """
+        多位受試者同時執行同一個測試：每位受試者使用一支手把與一個視窗，
+        所有手把由同一個事件迴圈讀取並依 instance_id 分派，直到所有視窗都關閉才返回
+        第一位受試者使用已選擇的手把，其餘依連線池中的順序分配
+        所有 App 共用同一個 random 狀態，各受試者的原始輸入紀錄無法單獨重播出相同的隨機內容
+        開始前先收集每位受試者的基本資訊（已收集過的不再詢問），各自的結果寫入自己的年齡與手把使用頻率
+
+        Returns:
+            list: 各受試者的 App 物件（手把不足時為空清單）
+        """
+        controller = self._ensure_controller()
+        # 監聽執行緒正在等待 pygame 事件，手把清單交給它重新整理
+        joysticks = [j for j in [controller.joystick] + self.service.refresh_devices() if j is not None]
+        joysticks = list({id(j): j for j in joysticks}.values())  # 已選擇的手把也在連線池中，去除重複
+        if len(joysticks) < len(user_ids):
+            print(get_text('concurrent_not_enough_controllers', needed=len(user_ids), count=len(joysticks)))
+            return []
+
+        current_user = config.user_info
+        try:
+            for user_id in user_ids:
+                collect_user_info_if_needed(user_id)
+        finally:
+            config.user_info = current_user  # 選單中的目前使用者不變
+
+        sessions = []
+        extra_channels = []
+        try:
+            for user_id, joystick in zip(user_ids, joysticks):
+                channel = controller
+                if joystick is not controller.joystick:
+                    channel = self.service.attach(joystick, tk_root=self.root)
+                    extra_channels.append(channel)
+                app, window = self._open_test_window(test_name, user_id, channel)
+                window.title(f"{window.title()} - {user_id}")
+                sessions.append((app, window, channel))
+                print(get_text('concurrent_participant_ready', user_id=user_id, name=joystick.get_name()))
+
+            # 每位受試者結束時 App 會呼叫 root.quit()；仍有視窗開著時繼續執行事件迴圈
+            while any(self._window_exists(window) for _, window, _ in sessions):
+                self.root.mainloop()
+        finally:
+            for app, window, channel in sessions:
+                self._finish_test(app, window, channel)
+            for channel in extra_channels:
+                self.service.detach(channel)
+            self._cancel_pending_after()
+        return [app for app, _, _ in sessions]
+
+    @staticmethod
+    def _window_exists(window):
+        try:
+            return bool(window.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def preload(self, test_name):
+        """在背景執行緒預先匯入測試模組，輪到該測試時不需等待載入"""
+        thread = Thread(target=importlib.import_module, args=(TEST_TARGETS[test_name]['module'],), daemon=True)
+        thread.start()
+        return thread
+
+    def run_suite(self, user_id, test_names=None):
+        """
+        依序執行完整測試套件，並儲存連結每個測試結果 JSON 的 session 清單
+        使用者中途關閉某個測試時繼續下一個測試，該測試在清單中沒有結果檔案
+
+        Returns:
+            str: session 清單的檔案路徑
+        """
+        test_names = list(test_names or SUITE_TESTS)
+        session_id = time.strftime("%Y%m%d_%H%M%S")
+        started_at = datetime.now().isoformat()
+        tests = []
+        try:
+            for index, test_name in enumerate(test_names):
+                next_test = test_names[index + 1] if index + 1 < len(test_names) else None
+                if next_test is not None:
+                    self.preload(next_test)
+                if TEST_TARGETS[test_name].get('analog_callback'):
+                    # 搖桿測試會輸出軌跡圖：在測試開始時就啟動繪圖程序並載入 matplotlib，
+                    # 之後的搖桿測試共用同一個已預熱的程序池
+                    warm_trace_workers()
+
+                print(get_text('suite_progress', index=index + 1, total=len(test_names), name=test_name))
+                first_result = len(result_saver.saved_result_files)
+                test_started_at = datetime.now().isoformat()
+                start = time.perf_counter()
+                self.run_test(test_name, user_id)
+                flush_trace_jobs()
+                tests.append({
+                    "test": test_name,
+                    "started_at": test_started_at,
+                    "duration_seconds": round(time.perf_counter() - start, 3),
+                    "result_files": result_saver.saved_result_files[first_result:],
+                })
+        finally:
+            manifest_path = result_saver.save_session_manifest(user_id, session_id, tests,
+                                                               started_at, datetime.now().isoformat())
+
+        completed = sum(1 for test in tests if test["result_files"])
+        print(get_text('suite_complete', completed=completed, total=len(test_names)))
+        return manifest_path
+
+    def _finish_test(self, app, window, channel):
+        """清除這個測試留下的狀態，讓下一個測試從乾淨的環境開始"""
+        channel.unbind()
+        if app is not None:
+            app.running = False
+            loop = getattr(app, 'loop', None)
+            if loop is not None:
+                loop.stop()
+        try:
+            window.destroy()
+        except tk.TclError:
+            pass  # 測試已自行關閉視窗
+
+    def _cancel_pending_after(self):
+        """取消所有 after 排程（所有測試視窗都結束後呼叫）"""
+        # 獨立行程結束時所有計時器會一起消失；共用直譯器時需要自行取消測試留下的 after 排程
+        for after_id in self.root.tk.splitlist(self.root.tk.call('after', 'info')):
+            try:
+                self.root.after_cancel(after_id)
+            except tk.TclError:
+                pass
+
+    def close(self):
+        """關閉手把監聽、背景繪圖程序與 Tk 根視窗"""
+        shutdown_trace_workers(force=True)
+        if self.service is not None:
+            self.service.stop()
+            self.service = None
+            self.controller = None
+        try:
+            self.root.destroy()
+        except tk.TclError:
+            pass
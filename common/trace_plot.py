@@ -1,33 +1,22 @@
 import os
 import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+from . import config
 from .language import get_text
 
-# 強制設置 matplotlib 為非互動式後端 - 必須在任何 matplotlib 導入之前執行
-import matplotlib
-# 檢查是否已經設置了後端，如果沒有則設置
-if matplotlib.get_backend() != 'Agg':
-    matplotlib.use('Agg', force=True)
-
-# 額外的安全措施：設置環境變數
+# 設置 matplotlib 為非互動式後端 - 必須在任何 matplotlib 導入之前執行
+# matplotlib 本身等到第一次繪圖時才載入（載入約需 0.5 秒），只匯入本模組的測試程式不必等待
 os.environ['MPLBACKEND'] = 'Agg'
 
-import matplotlib.pyplot as plt
-from matplotlib.patches import Polygon, Rectangle, Circle
-from matplotlib.lines import Line2D
-
-# 設置 matplotlib 不使用互動式模式
-plt.ioff()
-
 
 def ensure_matplotlib_thread_safety():
-    """確保 matplotlib 在線程中安全使用"""
-    import threading
+    """載入 matplotlib 並確保使用非互動式的 Agg 後端（可在任何線程或背景程序中呼叫）"""
     import matplotlib
-    
-    # 如果不在主線程中，強制使用 Agg 後端
-    if threading.current_thread() != threading.main_thread():
+
+    # 檢查是否已經設置了後端，如果沒有則設置
+    if matplotlib.get_backend().lower() != 'agg':
         matplotlib.use('Agg', force=True)
-        plt.ioff()
 
 
 def init_trace_output_folder(test_name, user_id=None):
@@ -46,123 +35,410 @@ def init_trace_output_folder(test_name, user_id=None):
     return folder
 
 
+def move_trace_job(trace_points, start, target, radius, player_radius, press_points, index, output_dir):
+    """建立搖桿移動軌跡圖的繪圖工作（純資料，可傳給背景程序）"""
+    return {
+        'kind': 'move',
+        'trace_points': tuple(trace_points),
+        'start': tuple(start),
+        'target': tuple(target),
+        'radius': radius,
+        'player_radius': player_radius,
+        'press_points': tuple(press_points),
+        'index': index,
+        'output_dir': output_dir,
+        'backend': config.TRACE_PLOT_BACKEND,
+    }
+
+
+def single_trace_job(path_obj, index, output_dir="data/images/analog_path_trace"):
+    """從路徑物件擷取繪圖所需資料，建立路徑追蹤軌跡圖的繪圖工作"""
+    shapes = path_obj.get_path_shapes() if hasattr(path_obj, "get_path_shapes") else []
+    checkpoints = [{"area": tuple(cp["area"]), "axis": cp["axis"], "line_pos": cp["line_pos"]}
+                   for cp in getattr(path_obj, "checkpoints", [])]
+    return {
+        'kind': 'single',
+        'path_shapes': tuple(tuple(shape) for shape in shapes),
+        'checkpoints': tuple(checkpoints),
+        'trace_points': tuple(path_obj.player_trace),
+        'goal_polygon': tuple(path_obj.goal_region.polygon()),
+        'index': index,
+        'output_dir': output_dir,
+        'backend': config.TRACE_PLOT_BACKEND,
+    }
+
+
+def render_trace_job(job):
+    """執行一個繪圖工作，回傳輸出的圖片路徑（沒有軌跡資料時回傳 None）"""
+    if job['kind'] == 'move':
+        return _render_move_trace(job)
+    if job['kind'] == 'sheet':
+        return _render_trace_sheet(job)
+    return _render_single_trace(job)
+
+
 def output_move_trace(trace_points, start, target, radius, player_radius, press_points, index, output_dir):
-    # 確保 matplotlib 線程安全
-    ensure_matplotlib_thread_safety()
-    
-    if not trace_points:
-        print(f"⚠️ {get_text('trace_path_no_data', index=index)}")
-        return
+    """同步輸出搖桿移動軌跡圖"""
+    return render_trace_job(move_trace_job(trace_points, start, target, radius,
+                                           player_radius, press_points, index, output_dir))
 
-    xs, ys = zip(*trace_points)
-    fig, ax = plt.subplots(figsize=(6, 6))
 
-    # 🔵 玩家軌跡點
-    ax.plot(xs, ys, 'deepskyblue', marker='.', linestyle='None', markersize=2)
+def output_single_trace(path_obj, index, output_dir="data/images/analog_path_trace"):
+    """同步輸出單一路徑圖：含黑路徑、灰框、紅線、玩家軌跡"""
+    return render_trace_job(single_trace_job(path_obj, index, output_dir))
 
-    # 🔵 玩家起點
-    player_circle = Circle(start, player_radius, color='skyblue', alpha=0.7)
-    ax.add_patch(player_circle)
 
-    # 🔴 目標紅圈
-    target_circle = Circle(target, radius, edgecolor='red', facecolor='none', linewidth=2)
-    ax.add_patch(target_circle)
+class _MoveTracePanel:
+    """搖桿移動軌跡圖：靜態元件只建立一次，之後每個 trial 只替換資料"""
 
-    # 🟠 按下按鍵的所有點（橘色小圓）
-    for px, py in press_points:
-        press_circle = Circle((px, py), player_radius-3, color='orange', alpha=0.9)
-        ax.add_patch(press_circle)
+    figsize = (6, 6)
 
-    ax.set_aspect('equal')
-    ax.invert_yaxis()
-    ax.axis('off')
-    ax.set_title(f"Move Trace {index}")
+    def __init__(self, ax):
+        from matplotlib.patches import Circle
 
-    path = os.path.join(output_dir, f"{index}.png")
-    plt.tight_layout()
-    plt.savefig(path, dpi=200)
-    plt.close()
-    print(f"📷 {get_text('trace_image_saved')}：{path}")
+        self.ax = ax
+        # 🔵 玩家軌跡點
+        self.trace, = ax.plot([], [], 'deepskyblue', marker='.', linestyle='None', markersize=2)
+        # 🔵 玩家起點
+        self.start_circle = ax.add_patch(Circle((0, 0), 1, color='skyblue', alpha=0.7))
+        # 🔴 目標紅圈
+        self.target_circle = ax.add_patch(Circle((0, 0), 1, edgecolor='red', facecolor='none', linewidth=2))
+        self.press_circles = []
+        ax.set_aspect('equal')
+        ax.invert_yaxis()
+        ax.axis('off')
 
+    def update(self, job):
+        from matplotlib.patches import Circle
 
-def output_single_trace(path_obj, index, output_dir="data/images/analog_path_trace"):
-    """輸出單一路徑圖：含黑路徑、灰框、紅線、玩家軌跡"""
-    # 確保 matplotlib 線程安全
-    ensure_matplotlib_thread_safety()
+        xs, ys = zip(*job['trace_points'])
+        self.trace.set_data(xs, ys)
+        self.start_circle.set_center(job['start'])
+        self.start_circle.set_radius(job['player_radius'])
+        self.target_circle.set_center(job['target'])
+        self.target_circle.set_radius(job['radius'])
 
-    trace_list = path_obj.player_trace
-    if not trace_list:
-        print(f"⚠️ {get_text('trace_no_path_data', index=index)}")
-        return
+        # 🟠 按下按鍵的所有點（橘色小圓），數量每次不同
+        for circle in self.press_circles:
+            circle.remove()
+        self.press_circles = [self.ax.add_patch(Circle(point, job['player_radius'] - 3, color='orange', alpha=0.9))
+                              for point in job['press_points']]
 
-    os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, f"{index}.png")
+        self.ax.set_title(f"Move Trace {job['index']}")
+        _autoscale(self.ax)
+
+
+class _PathTracePanel:
+    """路徑追蹤軌跡圖：含黑路徑、灰框、紅線、玩家軌跡；多邊形重複使用，只更新頂點"""
+
+    figsize = (8, 4)
+
+    def __init__(self, ax):
+        from matplotlib.patches import Polygon
 
-    fig, ax = plt.subplots(figsize=(8, 4))
+        self.ax = ax
+        self.path_polygons = []
+        self.checkpoint_artists = []
+        # 以 zorder 固定繪製順序：路徑 < 灰框 < 目標；紅線 < 軌跡 < 起點
+        # ✅ 紅色目標區塊（與遊戲畫面使用同一個目標區域）
+        self.goal_polygon = ax.add_patch(Polygon([[0, 0]] * 4, closed=True, facecolor='red', zorder=1.2))
+        # ✅ 藍色玩家軌跡點
+        self.trace, = ax.plot([], [], 'deepskyblue', marker='.', linestyle='None', markersize=3, zorder=2.1)
+        # ✅ 起點圓形
+        self.start_marker, = ax.plot([], [], 'o', color='deepskyblue', markersize=10, alpha=0.7, zorder=2.2)
+        ax.set_aspect('equal')
+        ax.invert_yaxis()
+        ax.axis('off')
 
-    # ✅ 黑色背景路徑（支援 StraightPath / CornerPath）
-    if hasattr(path_obj, "get_path_shapes"):
-        for shape in path_obj.get_path_shapes():
-            polygon = Polygon(shape, closed=True, facecolor="black")
-            ax.add_patch(polygon)
+    def update(self, job):
+        from matplotlib.patches import Polygon, Rectangle
+        from matplotlib.lines import Line2D
 
-    # ✅ 灰色區塊（未被清除的）
-    if hasattr(path_obj, "checkpoints"):
-        for cp in path_obj.checkpoints:
+        # ✅ 黑色背景路徑（支援 StraightPath / CornerPath）
+        shapes = job['path_shapes']
+        while len(self.path_polygons) < len(shapes):
+            self.path_polygons.append(self.ax.add_patch(
+                Polygon([[0, 0]] * 4, closed=True, facecolor="black", zorder=1)))
+        for i, polygon in enumerate(self.path_polygons):
+            if i < len(shapes):
+                polygon.set_xy(shapes[i])
+                polygon.set_visible(True)
+            else:
+                polygon.set_visible(False)
+
+        # ✅ 灰色區塊（未被清除的）與紅色封鎖線
+        for artist in self.checkpoint_artists:
+            artist.remove()
+        self.checkpoint_artists = []
+        for cp in job['checkpoints']:
             x1, y1, x2, y2 = cp["area"]
-            rect = Rectangle((x1, y1),
-                             x2 - x1,
-                             y2 - y1,
-                             linewidth=2,
-                             edgecolor='gray',
-                             facecolor='none')
-            ax.add_patch(rect)
-
-            # ✅ 紅色封鎖線
-            axis = cp["axis"]
+            self.checkpoint_artists.append(self.ax.add_patch(
+                Rectangle((x1, y1), x2 - x1, y2 - y1, linewidth=2,
+                          edgecolor='gray', facecolor='none', zorder=1.1)))
             pos = cp["line_pos"]
-            if axis == "x":
-                ax.add_line(
-                    Line2D([pos, pos], [y1, y2], color='red', linewidth=2))
+            if cp["axis"] == "x":
+                line = Line2D([pos, pos], [y1, y2], color='red', linewidth=2)
             else:
-                ax.add_line(
-                    Line2D([x1, x2], [pos, pos], color='red', linewidth=2))
-
-    # ✅ 藍色玩家軌跡點
-    xs, ys = zip(*trace_list)
-    ax.plot(xs, ys, 'deepskyblue', marker='.', linestyle='None', markersize=3)
-
-    # ✅ 紅色目標區塊
-    goal_area = path_obj.get_goal_area()
-    if 'points' in goal_area:
-        goal_pts = goal_area['points']
-        polygon = Polygon([[goal_pts[i], goal_pts[i + 1]]
-                           for i in range(0, 8, 2)],
-                          closed=True,
-                          facecolor='red')
-        ax.add_patch(polygon)
+                line = Line2D([x1, x2], [pos, pos], color='red', linewidth=2)
+            self.checkpoint_artists.append(self.ax.add_line(line))
+
+        trace_list = job['trace_points']
+        xs, ys = zip(*trace_list)
+        self.trace.set_data(xs, ys)
+        self.start_marker.set_data([trace_list[0][0]], [trace_list[0][1]])
+
+        goal_pts = job['goal_polygon']
+        self.goal_polygon.set_xy([[goal_pts[i], goal_pts[i + 1]] for i in range(0, 8, 2)])
+
+        self.ax.set_title(f"Path {job['index']}")
+        _autoscale(self.ax)
+
+
+_PANEL_TYPES = {
+    'move': _MoveTracePanel,
+    'single': _PathTracePanel,
+}
+
+
+def _autoscale(ax):
+    """依目前的資料重新計算顯示範圍（保持 y 軸反轉）"""
+    ax.relim(visible_only=True)
+    ax.autoscale_view()
+
+
+def _aspect_key(ax):
+    (x0, x1), (y0, y1) = ax.get_xlim(), ax.get_ylim()
+    return round(abs(y1 - y0) / max(abs(x1 - x0), 1e-9), 4)
+
+
+class TraceFigureRenderer:
+    """
+    重複使用同一個 Figure 的軌跡圖繪製器
+    每種圖只建立一次 Figure、Axes 與靜態元件，版面配置也只計算一次；之後每個 trial 只替換資料並輸出
+    """
+
+    def __init__(self, kind):
+        ensure_matplotlib_thread_safety()
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        panel_class = _PANEL_TYPES[kind]
+        self.figure = Figure(figsize=panel_class.figsize)
+        FigureCanvasAgg(self.figure)
+        self.panel = panel_class(self.figure.add_subplot(1, 1, 1))
+        params = self.figure.subplotpars
+        self._default_subplot_params = {name: getattr(params, name)
+                                        for name in ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')}
+        self._layout_key = None
+
+    def render(self, job, output_path):
+        self.panel.update(job)
+        # 等比例座標下，版面取決於資料範圍的長寬比；長寬比相同時沿用上次計算的版面
+        ax = self.panel.ax
+        layout_key = _aspect_key(ax)
+        if layout_key != self._layout_key:
+            self.figure.subplots_adjust(**self._default_subplot_params)  # 從預設版面重新計算，與新建 Figure 結果相同
+            self.figure.tight_layout()
+            self._layout_key = layout_key
+        self.figure.savefig(output_path, dpi=200)
+
+
+_renderers = {}
+
+
+def _get_renderer(kind):
+    renderer = _renderers.get(kind)
+    if renderer is None:
+        renderer = _renderers[kind] = TraceFigureRenderer(kind)
+    return renderer
+
+
+def _draw_trial_trace(job, output_path):
+    """
+    依工作中的 backend 選擇繪製方式輸出單一 trial 的軌跡圖
+    設定在建立工作時（主程序）讀取；背景程序是另外啟動的，看不到執行中修改的 config
+    """
+    if job['backend'] == "raster":
+        from .trace_raster import render_raster_trace
+        render_raster_trace(job, output_path)
     else:
-        rect = Rectangle((goal_area['left'], goal_area['top']),
-                         goal_area['right'] - goal_area['left'],
-                         goal_area['bottom'] - goal_area['top'],
-                         facecolor='red')
-        ax.add_patch(rect)
-
-    # ✅ 起點圓形
-    start_x, start_y = trace_list[0]
-    ax.plot(start_x,
-            start_y,
-            'o',
-            color='deepskyblue',
-            markersize=10,
-            alpha=0.7)
-
-    # 顯示設定
-    ax.set_aspect('equal')
-    ax.invert_yaxis()
-    ax.axis('off')
-    ax.set_title(f"Path {index}")
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=200)
-    plt.close()
+        _get_renderer(job['kind']).render(job, output_path)
+
+
+def _render_move_trace(job):
+    index, output_dir = job['index'], job['output_dir']
+    if not job['trace_points']:
+        print(f"⚠️ {get_text('trace_path_no_data', index=index)}")
+        return None
+
+    path = os.path.join(output_dir, f"{index}.png")
+    _draw_trial_trace(job, path)
+    print(f"📷 {get_text('trace_image_saved')}：{path}")
+    return path
+
+
+def _render_single_trace(job):
+    index, output_dir = job['index'], job['output_dir']
+    if not job['trace_points']:
+        print(f"⚠️ {get_text('trace_no_path_data', index=index)}")
+        return None
+
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, f"{index}.png")
+    _draw_trial_trace(job, output_path)
     print(f"📷 {get_text('trace_path_saved', index=index, path=output_path)}")
+    return output_path
+
+
+def trace_sheet_job(jobs, output_path, columns=4):
+    """建立整個 session 的多格總表繪圖工作（jobs 為同一種 trial 繪圖工作）"""
+    return {
+        'kind': 'sheet',
+        'jobs': tuple(job for job in jobs if job['trace_points']),
+        'output_path': output_path,
+        'columns': columns,
+        'dpi': config.TRACE_SHEET_DPI,
+    }
+
+
+def _render_trace_sheet(job):
+    """把整個 session 的 trial 畫在同一張多格總表中，只建立與輸出一次 Figure"""
+    ensure_matplotlib_thread_safety()
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    jobs = job['jobs']
+    if not jobs:
+        return None
+
+    panel_class = _PANEL_TYPES[jobs[0]['kind']]
+    columns = min(job['columns'], len(jobs))
+    rows = (len(jobs) + columns - 1) // columns
+    width, height = panel_class.figsize
+    figure = Figure(figsize=(width * columns, height * rows))
+    FigureCanvasAgg(figure)
+    for i, trial_job in enumerate(jobs):
+        panel_class(figure.add_subplot(rows, columns, i + 1)).update(trial_job)
+    figure.tight_layout()
+
+    output_path = job['output_path']
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    figure.savefig(output_path, dpi=job['dpi'])
+    print(f"📷 {get_text('trace_sheet_saved', count=len(jobs), path=output_path)}")
+    return output_path
+
+
+# 背景繪圖：以 spawn 方式啟動的程序池執行繪圖工作，matplotlib 的 Agg 繪製不佔用 Tk 主執行緒與 GIL
+_executor = None
+_pending_jobs = []
+_retain_workers = False  # 預熱後的程序池在測試之間保留，App 關閉時只等待工作完成
+
+
+def _get_executor():
+    global _executor
+    if _executor is None and config.TRACE_PLOT_WORKERS > 0:
+        try:
+            # 使用 spawn 而非 fork，避免複製 Tk 與手把監聽執行緒的狀態
+            _executor = ProcessPoolExecutor(max_workers=config.TRACE_PLOT_WORKERS,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        except Exception as e:
+            print(get_text('trace_worker_unavailable', error=e))
+            config.TRACE_PLOT_WORKERS = 0
+    return _executor
+
+
+def _warm_worker():
+    """在背景程序中預先載入 matplotlib 並建立重複使用的 Figure"""
+    for kind in _PANEL_TYPES:
+        _get_renderer(kind)
+
+
+def warm_trace_workers():
+    """
+    預先啟動背景繪圖程序並載入 matplotlib，之後第一張軌跡圖不需等待程序啟動
+    預熱後的程序池會保留到 shutdown_trace_workers(force=True)，供連續執行的多個測試共用
+    """
+    global _retain_workers
+    executor = _get_executor()
+    if executor is None:
+        return
+    _retain_workers = True
+    for _ in range(config.TRACE_PLOT_WORKERS):
+        executor.submit(_warm_worker)
+
+
+def submit_trace_job(job):
+    """
+    送出繪圖工作後立即返回；背景程序池無法使用（或 TRACE_PLOT_WORKERS = 0）時直接同步繪製
+    """
+    executor = _get_executor()
+    if executor is None:
+        render_trace_job(job)
+        return
+    _pending_jobs.append(executor.submit(render_trace_job, job))
+
+
+def submit_move_trace(trace_points, start, target, radius, player_radius, press_points, index, output_dir):
+    """在背景輸出搖桿移動軌跡圖"""
+    submit_trace_job(move_trace_job(trace_points, start, target, radius,
+                                    player_radius, press_points, index, output_dir))
+
+
+def submit_trace_sheet(jobs, output_path, columns=4):
+    """在背景輸出整個 session 的多格總表"""
+    submit_trace_job(trace_sheet_job(jobs, output_path, columns))
+
+
+def submit_trial_trace(job, session_jobs):
+    """
+    依 config.TRACE_PLOT_LAYOUT 處理單一 trial 的繪圖工作：
+    收進 session_jobs 供 session 結束時輸出總表，需要逐張輸出時立即送出
+    """
+    session_jobs.append(job)
+    if config.TRACE_PLOT_LAYOUT != "sheet":
+        submit_trace_job(job)
+
+
+def submit_session_sheet(session_jobs, output_dir, filename="sheet.png"):
+    """依 config.TRACE_PLOT_LAYOUT 在 session 結束時輸出多格總表"""
+    if config.TRACE_PLOT_LAYOUT != "per_trial" and session_jobs:
+        submit_trace_sheet(session_jobs, os.path.join(output_dir, filename))
+
+
+def submit_single_trace(path_obj, index, output_dir="data/images/analog_path_trace"):
+    """在背景輸出單一路徑圖（資料在呼叫當下即複製，之後修改路徑物件不影響輸出）"""
+    submit_trace_job(single_trace_job(path_obj, index, output_dir))
+
+
+def flush_trace_jobs(timeout=None):
+    """
+    等待所有背景繪圖工作完成（session 結束時呼叫）
+
+    Returns:
+        list: 已輸出的圖片路徑
+    """
+    if not _pending_jobs:
+        return []
+    done, not_done = wait(list(_pending_jobs), timeout=timeout)
+    paths = []
+    for future in done:
+        try:
+            path = future.result()
+            if path:
+                paths.append(path)
+        except Exception as e:
+            print(get_text('trace_render_failed', error=e))
+    _pending_jobs[:] = list(not_done)
+    return paths
+
+
+def shutdown_trace_workers(timeout=None, force=False):
+    """等待剩餘工作並關閉背景程序池（程序池已預熱保留時，只有 force=True 才會關閉）"""
+    global _executor, _retain_workers
+    flush_trace_jobs(timeout)
+    if _retain_workers and not force:
+        return
+    _retain_workers = False
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
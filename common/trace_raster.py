@@ -0,0 +1,236 @@
+"""
+軌跡圖點陣繪製（不經過 matplotlib）
+- 以 pygame Surface 直接把路徑、灰框、目標、軌跡點與按鍵圓點畫成 RGB 影像，再輸出 PNG
+- 繪製只佔輸出時間的一小部分，PNG 改以 zlib 快速壓縮直接編碼（檔案稍大，但編碼快數倍）
+- 版面比照 matplotlib 版：相同圖片尺寸、資料範圍外留 5% 邊界、等比例縮放後置中、標題在上方
+- 給大量重新產生歷史 session 軌跡圖時使用（config.TRACE_PLOT_BACKEND = "raster"）
+"""
+import os
+import struct
+import zlib
+
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+
+import numpy as np
+import pygame
+import pygame.gfxdraw
+
+DPI = 200  # 與 matplotlib 版 savefig(dpi=200) 相同
+FIGURE_SIZES = {'move': (6, 6), 'single': (8, 4)}  # 英吋，與 matplotlib 版的 figsize 相同
+
+DATA_MARGIN = 0.05   # matplotlib 自動縮放時資料範圍外的邊界比例
+PAD_PT = 10.8        # tight_layout 預設邊距（1.08 × 字級 10pt）
+TITLE_PT = 12        # 標題字級
+TITLE_PAD_PT = 6     # 標題與圖框的距離
+
+PNG_COMPRESS_LEVEL = 1
+# 24-bit 且記憶體中依 R、G、B 排列的像素格式，可直接作為 PNG 的 RGB 掃描線
+_RGB_MASKS = (0x0000FF, 0x00FF00, 0xFF0000, 0)
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+GRAY = (128, 128, 128)
+DEEPSKYBLUE = (0, 191, 255)
+SKYBLUE = (135, 206, 235)
+ORANGE = (255, 165, 0)
+
+_title_font = None
+
+
+def _pt(points):
+    """點數（pt）轉為像素"""
+    return points * DPI / 72
+
+
+def _marker_radius(markersize, point_marker=False):
+    """matplotlib 標記的像素半徑（'.' 為 'o' 的一半大小，外加 1pt 的同色外框）"""
+    size = markersize * 0.5 if point_marker else markersize
+    # pygame 的圓直徑為 2r + 1，扣掉中心像素
+    return max(1, round(_pt(size + 1.0) / 2 - 0.5))
+
+
+def _get_title_font():
+    global _title_font
+    if _title_font is None:
+        pygame.font.init()
+        # pygame 內建字型，不依賴系統字型（背景程序與無桌面環境都可使用）
+        _title_font = pygame.font.Font(None, round(_pt(TITLE_PT) * 1.4))
+    return _title_font
+
+
+class RasterTraceCanvas:
+    """把資料座標（與遊戲畫面相同、y 軸向下）對應到圖片像素的畫布"""
+
+    def __init__(self, kind, bounds, title):
+        width_in, height_in = FIGURE_SIZES[kind]
+        width, height = round(width_in * DPI), round(height_in * DPI)
+        self.surface = pygame.Surface((width, height), 0, 24, _RGB_MASKS)
+        self.surface.fill(WHITE)
+
+        # 資料範圍加上邊界
+        xmin, ymin, xmax, ymax = bounds
+        x_margin = (xmax - xmin) * DATA_MARGIN
+        y_margin = (ymax - ymin) * DATA_MARGIN
+        xmin, xmax = xmin - x_margin, xmax + x_margin
+        ymin, ymax = ymin - y_margin, ymax + y_margin
+        x_range = max(xmax - xmin, 1e-9)
+        y_range = max(ymax - ymin, 1e-9)
+
+        # 等比例縮放後置中於扣除邊距的區域；標題超出圖片上緣時才再扣掉標題高度（與 tight_layout 相同）
+        font = _get_title_font()
+        pad = _pt(PAD_PT)
+        title_space = font.get_linesize() + _pt(TITLE_PAD_PT)
+        area_width = width - 2 * pad
+        for reserved in (0, title_space):
+            area_height = height - 2 * pad - reserved
+            self.scale = min(area_width / x_range, area_height / y_range)
+            box_width, box_height = x_range * self.scale, y_range * self.scale
+            box_left = pad + (area_width - box_width) / 2
+            box_top = pad + reserved + (area_height - box_height) / 2
+            if box_top - title_space >= pad:
+                break
+        self.offset_x = box_left - xmin * self.scale
+        self.offset_y = box_top - ymin * self.scale
+
+        text = font.render(title, True, BLACK)
+        self.surface.blit(text, text.get_rect(midbottom=(round(box_left + box_width / 2),
+                                                         round(box_top - _pt(TITLE_PAD_PT)))))
+        # 與 matplotlib 相同，超出座標範圍的部分不繪製
+        self.surface.set_clip(pygame.Rect(round(box_left), round(box_top),
+                                          round(box_width), round(box_height)))
+
+    def to_pixel(self, x, y):
+        return round(self.offset_x + x * self.scale), round(self.offset_y + y * self.scale)
+
+    def fill_polygon(self, points, color):
+        """points 為 [(x, y), ...] 資料座標"""
+        pixels = [self.to_pixel(x, y) for x, y in points]
+        pygame.gfxdraw.filled_polygon(self.surface, pixels, color)
+        pygame.gfxdraw.aapolygon(self.surface, pixels, color)
+
+    def outline_rect(self, x1, y1, x2, y2, color, linewidth_pt):
+        corners = [self.to_pixel(x1, y1), self.to_pixel(x2, y1),
+                   self.to_pixel(x2, y2), self.to_pixel(x1, y2)]
+        pygame.draw.lines(self.surface, color, True, corners, max(1, round(_pt(linewidth_pt))))
+
+    def line(self, x1, y1, x2, y2, color, linewidth_pt):
+        pygame.draw.line(self.surface, color, self.to_pixel(x1, y1), self.to_pixel(x2, y2),
+                         max(1, round(_pt(linewidth_pt))))
+
+    def fill_circle(self, x, y, radius, color, alpha=1.0):
+        """以資料座標的半徑繪製實心圓"""
+        self._dot(self.to_pixel(x, y), max(1, round(radius * self.scale)), color, alpha)
+
+    def outline_circle(self, x, y, radius, color, linewidth_pt):
+        width = max(1, round(_pt(linewidth_pt)))
+        # pygame 的外框向內繪製，放大半徑使線寬中心落在圓周上（與 matplotlib 相同）
+        pygame.draw.circle(self.surface, color, self.to_pixel(x, y),
+                           round(radius * self.scale + width / 2), width)
+
+    def markers(self, points, pixel_radius, color, alpha=1.0):
+        """以固定像素大小繪製標記（不隨資料縮放，與 matplotlib 的 marker 相同）"""
+        for x, y in points:
+            self._dot(self.to_pixel(x, y), pixel_radius, color, alpha)
+
+    def _dot(self, center, radius, color, alpha):
+        rgba = (*color, round(alpha * 255))
+        pygame.gfxdraw.filled_circle(self.surface, center[0], center[1], radius, rgba)
+        pygame.gfxdraw.aacircle(self.surface, center[0], center[1], radius, rgba)
+
+    def save(self, output_path):
+        with open(output_path, "wb") as f:
+            f.write(encode_png(self.surface))
+
+
+def _png_chunk(chunk_type, data):
+    return (struct.pack(">I", len(data)) + chunk_type + data
+            + struct.pack(">I", zlib.crc32(chunk_type + data) & 0xFFFFFFFF))
+
+
+def encode_png(surface):
+    """把 24-bit RGB Surface 編碼為 PNG（8-bit RGB、不使用掃描線預測）"""
+    width, height = surface.get_size()
+    pixels = np.frombuffer(surface.get_buffer(), dtype=np.uint8).reshape(height, surface.get_pitch())
+    # 每條掃描線前加上一個位元組的 filter type（0 = None）
+    scanlines = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    scanlines[:, 1:] = pixels[:, :width * 3]
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n"
+            + _png_chunk(b"IHDR", header)
+            + _png_chunk(b"IDAT", zlib.compress(scanlines.tobytes(), PNG_COMPRESS_LEVEL))
+            + _png_chunk(b"IEND", b""))
+
+
+def _bounds(points):
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _circle_extent(center, radius):
+    x, y = center
+    return [(x - radius, y - radius), (x + radius, y + radius)]
+
+
+def _draw_move_trace(job):
+    trace = job['trace_points']
+    start, target = job['start'], job['target']
+    player_radius = job['player_radius']
+    press_radius = player_radius - 3
+
+    extent = list(trace)
+    extent += _circle_extent(start, player_radius) + _circle_extent(target, job['radius'])
+    for point in job['press_points']:
+        extent += _circle_extent(point, press_radius)
+
+    canvas = RasterTraceCanvas('move', _bounds(extent), f"Move Trace {job['index']}")
+    # 繪製順序與 matplotlib 的 zorder 相同：圓形（依加入順序）在下、軌跡點在上
+    canvas.fill_circle(start[0], start[1], player_radius, SKYBLUE, alpha=0.7)
+    canvas.outline_circle(target[0], target[1], job['radius'], RED, 2)
+    for x, y in job['press_points']:
+        canvas.fill_circle(x, y, press_radius, ORANGE, alpha=0.9)
+    canvas.markers(trace, _marker_radius(2, point_marker=True), DEEPSKYBLUE)
+    return canvas
+
+
+def _draw_single_trace(job):
+    trace = job['trace_points']
+    goal = job['goal_polygon']
+    goal_points = [(goal[i], goal[i + 1]) for i in range(0, 8, 2)]
+
+    extent = list(trace) + goal_points
+    for shape in job['path_shapes']:
+        extent += list(shape)
+    for cp in job['checkpoints']:
+        x1, y1, x2, y2 = cp['area']
+        extent += [(x1, y1), (x2, y2)]
+
+    canvas = RasterTraceCanvas('single', _bounds(extent), f"Path {job['index']}")
+    # 路徑 < 灰框 < 目標 < 紅線 < 軌跡 < 起點
+    for shape in job['path_shapes']:
+        canvas.fill_polygon(shape, BLACK)
+    for cp in job['checkpoints']:
+        canvas.outline_rect(*cp['area'], GRAY, 2)
+    canvas.fill_polygon(goal_points, RED)
+    for cp in job['checkpoints']:
+        x1, y1, x2, y2 = cp['area']
+        pos = cp['line_pos']
+        if cp['axis'] == 'x':
+            canvas.line(pos, y1, pos, y2, RED, 2)
+        else:
+            canvas.line(x1, pos, x2, pos, RED, 2)
+    canvas.markers(trace, _marker_radius(3, point_marker=True), DEEPSKYBLUE)
+    canvas.markers(trace[:1], _marker_radius(10), DEEPSKYBLUE, alpha=0.7)
+    return canvas
+
+
+_DRAW_FUNCTIONS = {
+    'move': _draw_move_trace,
+    'single': _draw_single_trace,
+}
+
+
+def render_raster_trace(job, output_path):
+    """把 trial 繪圖工作（'move' 或 'single'）直接點陣化並輸出 PNG"""
+    _DRAW_FUNCTIONS[job['kind']](job).save(output_path)
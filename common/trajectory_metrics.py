@@ -0,0 +1,122 @@
+"""
+逐點更新的軌跡統計 - 每個模擬步長加入一個點時只做 O(1) 計算
+trial 結束時直接讀出統計，不需要再走訪整條軌跡
+"""
+import math
+
+
+class TrajectoryAccumulator:
+    """
+    累計單一 trial 的移動軌跡統計
+    - 路徑長度、淨位移與移動效率（從第一個軌跡點算起，與原本由完整軌跡計算的定義相同）
+    - 峰值速度、開始移動前的反應時間
+    - 次移動數：速度曲線中「下降後再上升超過 submovement_hysteresis」的次數（第一次起步算一次）
+    - 過衝：沿起點→目標方向超過目標中心的最大距離，以及進入目標圓的次數
+    """
+
+    def __init__(self, submovement_hysteresis=0.0):
+        self.submovement_hysteresis = submovement_hysteresis  # 速度變化門檻（像素/秒），過濾微小抖動
+        self.reset(0, 0, 0, 0, 0)
+
+    def reset(self, start_x, start_y, target_x, target_y, target_radius):
+        """開始新的 trial：起點為目標出現時的玩家位置"""
+        self.start_x = start_x
+        self.start_y = start_y
+        self.target_x = target_x
+        self.target_y = target_y
+        self.target_radius = target_radius
+        self.target_distance = math.hypot(target_x - start_x, target_y - start_y)
+        self._axis = None  # 起點→目標的單位向量
+        if self.target_distance > 0:
+            self._axis = ((target_x - start_x) / self.target_distance,
+                          (target_y - start_y) / self.target_distance)
+
+        self.count = 0
+        self.first_point = None
+        self.last_point = None
+        self.elapsed_seconds = 0.0
+        self.path_length = 0.0
+        self.peak_speed = 0.0
+        self.time_to_first_move = None
+        self.submovement_count = 0
+        self._speed_falling = True  # 起步前視為速度已降到谷底
+        self._speed_extreme = 0.0   # 目前上升段的峰值或下降段的谷值
+        self.max_overshoot = 0.0
+        self.target_entries = 0
+        self._inside_target = math.hypot(start_x - target_x, start_y - target_y) <= target_radius
+
+    def add(self, x, y, dt):
+        """加入一個軌跡點（dt 為這一步的模擬時間，秒）"""
+        prev_x, prev_y = self.last_point if self.last_point is not None else (self.start_x, self.start_y)
+        step = math.hypot(x - prev_x, y - prev_y)
+        if self.first_point is None:
+            self.first_point = (x, y)
+        else:
+            self.path_length += step
+        self.last_point = (x, y)
+        self.count += 1
+
+        if step > 0 and self.time_to_first_move is None:
+            self.time_to_first_move = self.elapsed_seconds
+        self.elapsed_seconds += dt
+
+        speed = step / dt if dt > 0 else 0.0
+        if speed > self.peak_speed:
+            self.peak_speed = speed
+        self._update_submovements(speed)
+
+        if self._axis is not None:
+            overshoot = ((x - self.start_x) * self._axis[0] + (y - self.start_y) * self._axis[1]
+                         - self.target_distance)
+            if overshoot > self.max_overshoot:
+                self.max_overshoot = overshoot
+
+        inside = math.hypot(x - self.target_x, y - self.target_y) <= self.target_radius
+        if inside and not self._inside_target:
+            self.target_entries += 1
+        self._inside_target = inside
+
+    def _update_submovements(self, speed):
+        """以遲滯門檻追蹤速度曲線的峰谷，每次由谷底重新加速算一個次移動"""
+        if self._speed_falling:
+            if speed > self._speed_extreme + self.submovement_hysteresis:
+                self.submovement_count += 1
+                self._speed_falling = False
+                self._speed_extreme = speed
+            elif speed < self._speed_extreme:
+                self._speed_extreme = speed
+        else:
+            if speed < self._speed_extreme - self.submovement_hysteresis:
+                self._speed_falling = True
+                self._speed_extreme = speed
+            elif speed > self._speed_extreme:
+                self._speed_extreme = speed
+
+    @property
+    def net_displacement(self):
+        """第一個與最後一個軌跡點之間的直線距離"""
+        if self.count < 2:
+            return 0.0
+        return math.hypot(self.last_point[0] - self.first_point[0], self.last_point[1] - self.first_point[1])
+
+    def summary(self, initial_distance):
+        """
+        trial 的 movement_analysis
+        initial_distance: 軌跡點不足兩個時作為直線距離的參考值（與原本的計算方式相同）
+        """
+        straight_line = self.net_displacement if self.count >= 2 else initial_distance
+        efficiency = 1.0
+        if self.count > 1 and self.path_length > 0:
+            efficiency = self.net_displacement / self.path_length
+        return {
+            "total_distance_pixels": self.path_length,
+            "straight_line_distance": straight_line,
+            "movement_efficiency_ratio": efficiency,
+            "initial_distance_reference": initial_distance,
+            "trace_based_calculation": True,
+            "peak_speed_px_per_s": self.peak_speed,
+            "time_to_first_move_seconds": self.time_to_first_move,
+            "submovement_count": self.submovement_count,
+            "max_overshoot_px": self.max_overshoot,
+            "target_entries": self.target_entries,
+        }
@@ -0,0 +1,114 @@
+"""
+軌跡欄位式儲存 - 把結果 JSON 中大量的座標序列另存為二進位 sidecar 檔
+- 測試以 Columnar(序列) 標記要另存的資料（[x, y] 座標列表或一維數值列表），其餘欄位照常寫入 JSON
+- 儲存時同一個結果的所有序列依序寫入同一個 sidecar（little-endian float64，連續排列），
+  JSON 中原本的列表改為 {"sidecar": 檔名, "offset": 位元組位移, "shape": [n, 2]} 參照
+- load_columns 以 numpy.memmap 讀回：每個參照都是 sidecar 檔案的唯讀視圖，不複製資料
+- config.TRAJECTORY_STORAGE = "inline" 時維持舊格式，直接把列表寫入 JSON
+"""
+import os
+import sys
+from array import array
+
+SIDECAR_SUFFIX = ".columns.bin"
+_ITEM_SIZE = 8  # float64
+
+
+class Columnar:
+    """標記要另存到 sidecar 的序列；width 為每列的欄數（座標為 2，一維數值為 None）"""
+
+    __slots__ = ('values', 'width')
+
+    def __init__(self, values, width=None):
+        self.values = values
+        self.width = width
+
+    def to_list(self):
+        """inline 儲存：轉回 JSON 列表"""
+        if self.width is None:
+            return list(self.values)
+        return [list(row) for row in self.values]
+
+
+def sidecar_path_for(result_path):
+    """結果 JSON 對應的 sidecar 路徑（同一資料夾、同檔名）"""
+    return os.path.splitext(str(result_path))[0] + SIDECAR_SUFFIX
+
+
+def _pack(column, buffer, sidecar_name):
+    """把一個序列附加到緩衝區，回傳 JSON 中的參照"""
+    offset = len(buffer) * _ITEM_SIZE
+    rows = len(column.values)
+    if column.width is None:
+        buffer.extend(column.values)
+        shape = [rows]
+    else:
+        for row in column.values:
+            buffer.extend(row)
+        shape = [rows, column.width]
+    return {"sidecar": sidecar_name, "offset": offset, "shape": shape}
+
+
+def extract_columns(data, sidecar_path, inline=False):
+    """
+    把 data 中所有 Columnar 寫入 sidecar 並換成參照（inline=True 時換回列表）
+    沒有 Columnar 時不建立 sidecar
+
+    Returns:
+        替換後的資料（新的 dict / list，不修改原本的物件）
+    """
+    buffer = array('d')
+    sidecar_name = os.path.basename(sidecar_path)
+
+    def convert(value):
+        if isinstance(value, Columnar):
+            return value.to_list() if inline else _pack(value, buffer, sidecar_name)
+        if isinstance(value, dict):
+            return {key: convert(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [convert(item) for item in value]
+        return value
+
+    converted = convert(data)
+    if buffer:
+        if sys.byteorder != "little":
+            buffer.byteswap()
+        with open(sidecar_path, 'wb') as f:
+            buffer.tofile(f)
+    return converted
+
+
+def is_column_ref(value):
+    """是否為 sidecar 參照"""
+    return isinstance(value, dict) and "sidecar" in value and "offset" in value and "shape" in value
+
+
+def load_columns(data, result_path):
+    """
+    把結果資料中的 sidecar 參照換成 numpy 唯讀陣列
+    同一個 sidecar 只建立一次 memmap，每個參照都是它的切片視圖（不複製資料）
+    """
+    directory = os.path.dirname(str(result_path))
+    maps = {}
+
+    def resolve(value):
+        if is_column_ref(value):
+            import numpy as np
+            shape = tuple(value["shape"])
+            count = 1
+            for size in shape:
+                count *= size
+            if count == 0:
+                return np.empty(shape, dtype='<f8')
+            name = value["sidecar"]
+            if name not in maps:
+                maps[name] = np.memmap(os.path.join(directory, name), dtype='<f8', mode='r')
+            start = value["offset"] // _ITEM_SIZE
+            return maps[name][start:start + count].reshape(shape)
+        if isinstance(value, dict):
+            return {key: resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [resolve(item) for item in value]
+        return value
+
+    return resolve(data)
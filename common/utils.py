@@ -13,10 +13,37 @@ def setup_window_topmost(root):
 工具函式模組
 包含視窗設定、使用者資訊收集等共用功能
 """
+import random
+import time
 import tkinter as tk
 from . import config
 from .language import get_text
 
+def event_time(timestamp_ns=None):
+    """
+    將手把事件時間戳轉換為秒（與 time.perf_counter() 同一時鐘）
+    timestamp_ns 為 ControllerInput 取出事件時記錄的 time.perf_counter_ns()；
+    未提供時（例如鍵盤備用輸入）使用目前時間
+    """
+    if timestamp_ns is None:
+        return time.perf_counter()
+    return timestamp_ns / 1e9
+
+
+def event_time_ns(timestamp_ns=None):
+    """與 event_time 相同，但以 perf_counter_ns 整數回傳，供與刺激出現時間精確比較"""
+    if timestamp_ns is None:
+        return time.perf_counter_ns()
+    return timestamp_ns
+
+
+def event_wall_time(timestamp_ns=None):
+    """事件發生時的系統時間（time.time() 秒），由事件時間戳與目前兩個時鐘的差推算，不受緩衝區取出延遲影響"""
+    if timestamp_ns is None:
+        return time.time()
+    return time.time() - (time.perf_counter_ns() - timestamp_ns) / 1e9
+
+
 def setup_window_topmost(root):
     """
     設定視窗置頂並取得焦點
@@ -77,17 +104,24 @@ def setup_pygame_window_topmost():
 def collect_user_info_if_needed(user_id):
     """
     收集使用者基本資訊（如果尚未收集）
-    包括年齡和手把使用頻率
+    包括年齡和手把使用頻率；收集後成為目前的使用者（config.user_info），並記錄在 config.participants
+
+    Returns:
+        dict: 該使用者的資訊
     """
     
     # 檢查是否已經有完整的使用者資訊
+    known = config.participants.get(user_id)
     if (hasattr(config, 'user_info') and config.user_info and 
-        config.user_info.get('user_id') == user_id and
-        config.user_info.get('age') is not None and
-        config.user_info.get('controller_usage_frequency') is not None):
+        config.user_info.get('user_id') == user_id):
+        known = config.user_info
+    if (known and
+        known.get('age') is not None and
+        known.get('controller_usage_frequency') is not None):
         # 資訊已完整，無需重新收集
         print(get_text('user_info_exists', user_id=user_id))
-        return
+        config.participants[user_id] = known
+        return known
     
     # 判斷是否為首次收集（從 main.py 呼叫）或補充收集（從個別測試呼叫）
     if not hasattr(config, 'user_info') or not config.user_info:
@@ -129,5 +163,32 @@ def collect_user_info_if_needed(user_id):
         "controller_usage_frequency": controller_usage_frequency,
         "controller_usage_frequency_description": "1=從來沒用過, 7=每天使用"  # 保持原始說明在 JSON 中
     }
+    config.participants[user_id] = config.user_info
     
     print(f"\n{get_text('user_info_recorded', user_id=user_id, age=age, frequency=controller_usage_frequency)}")
+    return config.user_info
+
+
+def seed_session(seed=None):
+    """
+    為這次測試 session 選擇 random 種子並套用（在建立測試 App 之前呼叫）
+    種子記錄在 config.session_seed，原始輸入紀錄的檔頭會一併保存，重播時可重建相同的目標位置與延遲時間
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(1 << 32)
+    random.seed(seed)
+    config.session_seed = seed
+    return seed
+
+
+def recorded_click(app, command):
+    """
+    包裝「開始測試」按鈕的 command：點擊時在原始輸入紀錄中寫入開始標記
+    滑鼠點擊不是手把事件，重播時依標記的時間點擊同一個按鈕
+    """
+    def on_click():
+        listener = getattr(app, 'listener', None)
+        if listener is not None:
+            listener.mark_start()
+        return command()
+    return on_click
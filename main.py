@@ -15,6 +15,7 @@ from common.controller_manager import controller_manager
 from common import config
 from common.utils import collect_user_info_if_needed
 from common.language import set_language, get_text
+from common.test_runner import InProcessTestRunner
 
 def show_menu():
     """顯示測試選單"""
@@ -31,24 +32,43 @@ def show_menu():
     print(f"5. {get_text('menu_analog_move')}")
     print(f"6. {get_text('menu_path_follow')}")
     print("")
+    print(f"7. {get_text('menu_concurrent')}")
+    print(f"8. {get_text('menu_full_suite')}")
     print(f"9. {get_text('menu_exit')}")
     print("="*50)
 
+# 選單編號對應的測試（TEST_TARGETS 中的名稱）
+MENU_TESTS = {
+    1: 'button_reaction_time',
+    2: 'button_prediction_countdown',
+    3: 'button_smash',
+    4: 'button_accuracy',
+    5: 'analog_move',
+    6: 'analog_path_follow',
+}
+
+# 同一行程內共用的測試執行器（第一次執行測試時才建立 Tk 根視窗與開啟手把）
+_runner = None
+
+
+def get_runner():
+    global _runner
+    if _runner is None:
+        _runner = InProcessTestRunner()
+    return _runner
+
+
 def run_single_test(test_num, user_id="test_user", age=None, controller_usage_frequency=None, use_english=False):
-    """執行單一測試"""
-    # 建構基本命令
-    test_commands = {
-        0: f"uv run python common/connection_test.py --user {user_id}",
-        1: f"uv run python tests/button_reaction_time_test.py --user {user_id}",
-        2: f"uv run python tests/button_prediction_countdown_test.py --user {user_id}",
-        3: f"uv run python tests/button_smash_test.py --user {user_id}",
-        4: f"uv run python tests/button_accuracy_test.py --user {user_id}",
-        5: f"uv run python tests/analog_move_test.py --user {user_id}",
-        6: f"uv run python tests/analog_path_follow_test.py --user {user_id}",
-    }
-    
-    if test_num in test_commands:
-        command = test_commands[test_num]
+    """
+    執行單一測試
+    1-6 在目前的行程中執行：測試模組、Tk 根視窗與已開啟的手把在測試之間共用，切換測試不需重新啟動
+    0（連線測試）為獨立腳本，仍以子行程執行
+    """
+    if test_num in MENU_TESTS:
+        print(f"\n{get_text('running_test', num=test_num)}")
+        get_runner().run_test(MENU_TESTS[test_num], user_id)
+    elif test_num == 0:
+        command = f"uv run python common/connection_test.py --user {user_id}"
         
         # 如果有使用者資訊，加入命令列參數
         if age is not None:
@@ -117,9 +137,16 @@ def main():
             if choice == 9:
                 print(get_text('thank_you'))
                 break
+            elif choice == 7:
+                test_num = int(input(get_text('concurrent_choose_test')))
+                if test_num in MENU_TESTS:
+                    user_ids = [uid.strip() for uid in input(get_text('concurrent_enter_user_ids')).split(",") if uid.strip()]
+                    get_runner().run_concurrent(MENU_TESTS[test_num], user_ids or [user_id])
+                else:
+                    print(get_text('invalid_test_number'))
             elif choice == 8:
                 print(f"\n{get_text('running_full_suite', user_id=user_id)}")
-                os.system(f"./run_all_tests.sh {user_id}")
+                get_runner().run_suite(user_id)
             elif 0 <= choice <= 6:
                 run_single_test(choice, user_id, age, controller_usage_frequency, args.english)
             else:
@@ -133,5 +160,9 @@ def main():
         
         input(f"\n{get_text('press_enter')}")
 
+    if _runner is not None:
+        _runner.close()
+    controller_manager.close()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+ControllerInput 的搖桿事件合併
+- 取樣間隔內的軸事件只保留最新值，到期時分派一次；靜止與移動之間的切換立即分派
+- 按鍵事件前先送出合併中的搖桿狀態
+- raw_axis_events / emitted_axis_events 計數與 get_input_stats() 的節省比例
+- 服務頻道每次 bind() 開啟新的原始輸入紀錄檔，unbind() 時關閉
+事件直接交給 _handle_event（時間戳由測試指定），不需要手把
+"""
+import pygame
+import pytest
+
+from common import config
+from common.controller_input import ControllerInput
+from common.input_recorder import load_input_log
+
+MS = 1_000_000
+
+
+@pytest.fixture
+def make_input(monkeypatch):
+    monkeypatch.setattr(config, "RECORD_RAW_INPUT", False)
+    created = []
+
+    def make(analog_sample_interval_ms):
+        calls = []
+        record = lambda **kwargs: calls.append(kwargs)
+        controller = ControllerInput(button_callback=record, analog_callback=record, shared_loop=True,
+                                     joystick=None, analog_sample_interval_ms=analog_sample_interval_ms)
+        created.append(controller)
+        return controller, calls
+
+    yield make
+    for controller in created:
+        controller.stop()
+
+
+def _axis(controller, at_ms, axis, value):
+    controller._handle_event(pygame.event.Event(pygame.JOYAXISMOTION, axis=axis, value=value, instance_id=0),
+                             at_ms * MS)
+
+
+def _button_down(controller, at_ms, button):
+    controller._handle_event(pygame.event.Event(pygame.JOYBUTTONDOWN, button=button, instance_id=0), at_ms * MS)
+
+
+def test_axis_events_coalesce_within_interval(make_input):
+    controller, calls = make_input(16)
+    _axis(controller, 0, 0, 0.5)  # 靜止 → 移動：立即分派
+    assert [(c["leftX"], c["timestamp_ns"]) for c in calls] == [(0.5, 0)]
+
+    _axis(controller, 1, 0, 0.6)
+    _axis(controller, 2, 1, 0.3)
+    _axis(controller, 3, 0, 0.7)
+    _axis(controller, 3, 2, 0.9)  # 左搖桿以外的軸不計入
+    assert len(calls) == 1
+    assert not controller._axis_flush_due(10 * MS)
+    assert controller._axis_flush_due(16 * MS)
+    controller._flush_axes()
+    assert (calls[-1]["leftX"], calls[-1]["leftY"], calls[-1]["timestamp_ns"]) == (0.7, 0.3, 3 * MS)
+
+    _axis(controller, 20, 0, 0.05)  # 另一軸仍超出死區：繼續合併
+    assert len(calls) == 2
+    _axis(controller, 21, 1, 0.1)   # 兩軸都回到死區內：立即分派
+    assert (calls[-1]["leftX"], calls[-1]["leftY"], calls[-1]["last_key_down"]) == (0, 0, False)
+
+    stats = controller.get_input_stats()
+    assert stats["raw_axis_events"] == 6
+    assert stats["emitted_axis_events"] == 3
+    assert stats["saved_percentage"] == pytest.approx(50)
+
+
+def test_button_flushes_pending_axes_first(make_input):
+    controller, calls = make_input(16)
+    _axis(controller, 0, 0, 0.8)
+    _axis(controller, 1, 0, 0.9)
+    _button_down(controller, 2, 3)
+
+    assert [c["last_key_bit"] for c in calls] == [0, 0, 3]
+    assert calls[1]["leftX"] == 0.9  # 合併中的座標先送出
+    assert calls[2]["leftX"] == 0.9 and calls[2]["buttons"] == 1 << 3
+    assert controller.get_input_stats()["emitted_axis_events"] == 2
+
+
+def test_no_coalescing_dispatches_every_axis_event(make_input):
+    controller, calls = make_input(None)
+    for i, value in enumerate([0.2, 0.4, 0.6, 0.1]):
+        _axis(controller, i, 0, value)
+
+    assert [c["leftX"] for c in calls] == [0.2, 0.4, 0.6, 0]
+    stats = controller.get_input_stats()
+    assert stats["raw_axis_events"] == stats["emitted_axis_events"] == 4
+    assert stats["saved_percentage"] == 0
+
+
+def test_bind_opens_a_recorder_per_test(make_input, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "RECORD_RAW_INPUT", True)
+    controller, _ = make_input(None)
+    assert controller.recorder is None  # 頻道建立時不開啟紀錄檔
+
+    controller.bind(record_path=tmp_path / "first.stin")
+    first = controller.recorder
+    _button_down(controller, 1, 0)
+    controller.bind(record_path=tmp_path / "second.stin")
+    _button_down(controller, 2, 1)
+    _button_down(controller, 3, 2)
+    controller.unbind()
+    _button_down(controller, 4, 3)  # 測試結束後的事件不寫入
+
+    assert first.path != controller.recorder.path
+    assert load_input_log(first.path)["code"].tolist() == [0]
+    assert load_input_log(controller.recorder.path)["code"].tolist() == [1, 2]
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+ControllerManager 的手把連線池
+- refresh() 以 instance id 保存已開啟的手把，重複掃描不重新開啟，拔除的手把移出連線池
+- 已選擇的手把以 GUID 辨識：拔除後重新插上（instance id 改變）仍對應到同一支實體手把
+以假的 Joystick 取代 pygame.joystick.Joystick，不需要實體手把
+"""
+import pygame
+import pytest
+
+from common.controller_manager import controller_manager
+
+
+class FakeJoystick:
+    opened = 0  # init() 被呼叫的次數
+
+    def __init__(self, instance_id, guid, name="Pad"):
+        self.instance_id = instance_id
+        self.guid = guid
+        self.name = name
+        self.closed = False
+
+    def get_instance_id(self):
+        return self.instance_id
+
+    def get_guid(self):
+        return self.guid
+
+    def get_name(self):
+        return self.name
+
+    def init(self):
+        FakeJoystick.opened += 1
+
+    def quit(self):
+        self.closed = True
+
+
+@pytest.fixture
+def devices(monkeypatch):
+    """目前連接的手把：(instance id, GUID) 列表；每次開啟都建立新的 Joystick 物件（與 pygame 相同）"""
+    connected = []
+    monkeypatch.setattr(pygame.joystick, "Joystick", lambda index: FakeJoystick(*connected[index]))
+    monkeypatch.setattr(pygame.joystick, "get_count", lambda: len(connected))
+    monkeypatch.setattr(controller_manager, "_joysticks", {})
+    for name in ("_selected_controller_index", "_selected_controller_name",
+                 "_selected_controller_guid", "_selected_instance_id"):
+        monkeypatch.setattr(controller_manager, name, None)
+    FakeJoystick.opened = 0
+    return connected
+
+
+def _select(guid, instance_id):
+    controller_manager._selected_controller_guid = guid
+    controller_manager._selected_controller_name = "Pad"
+    controller_manager._selected_instance_id = instance_id
+
+
+def test_refresh_keeps_opened_joysticks(devices):
+    devices += [(1, "GUID-A"), (2, "GUID-B")]
+    first = controller_manager.refresh()
+    assert [j.get_instance_id() for j in first] == [1, 2]
+
+    again = controller_manager.refresh()
+    assert [a is b for a, b in zip(first, again)] == [True, True]
+    assert FakeJoystick.opened == 2  # 第二次掃描沒有重新開啟
+    assert controller_manager.is_pooled(first[0])
+
+    devices.pop(0)
+    assert [j.get_instance_id() for j in controller_manager.refresh()] == [2]
+    assert not controller_manager.is_pooled(first[0])
+
+
+def test_selected_joystick_is_matched_by_guid_after_reconnect(devices):
+    devices += [(1, "GUID-A"), (2, "GUID-B")]
+    controller_manager.refresh()
+    _select("GUID-B", 2)
+    selected = controller_manager.create_controller()
+    assert selected.get_instance_id() == 2
+
+    controller_manager.handle_device_event(pygame.event.Event(pygame.JOYDEVICEREMOVED, instance_id=2))
+    assert controller_manager.get_selected_controller_info()["instance_id"] is None
+
+    # 另一支不同 GUID 的手把插上時不會被當成已選擇的手把
+    devices[:] = [(1, "GUID-A"), (5, "GUID-C")]
+    controller_manager.handle_device_event(pygame.event.Event(pygame.JOYDEVICEADDED, device_index=1))
+    assert controller_manager.get_selected_controller_info()["instance_id"] is None
+
+    # 同一支手把重新插上：instance id 改變，仍以 GUID 對應
+    devices[:] = [(1, "GUID-A"), (5, "GUID-C"), (9, "GUID-B")]
+    added = controller_manager.handle_device_event(pygame.event.Event(pygame.JOYDEVICEADDED, device_index=2))
+    assert added.get_instance_id() == 9
+    assert controller_manager.get_selected_controller_info()["instance_id"] == 9
+    assert controller_manager.create_controller() is added
+
+
+def test_create_controller_rescans_when_selected_is_not_pooled(devices):
+    devices.append((3, "GUID-A"))
+    controller_manager.refresh()
+    _select("GUID-A", 3)
+    controller_manager.close()
+
+    devices[:] = [(4, "GUID-A")]  # 連線池已關閉，期間手把重新插上、instance id 改變
+    joystick = controller_manager.create_controller()
+    assert joystick.get_instance_id() == 4
+    assert controller_manager.get_selected_controller_info()["instance_id"] == 4
+
+
+def test_close_quits_pooled_joysticks(devices):
+    devices.append((1, "GUID-A"))
+    joystick = controller_manager.refresh()[0]
+    _select("GUID-A", 1)
+    controller_manager.close()
+    assert joystick.closed
+    assert controller_manager.get_selected_controller_info()["instance_id"] is None
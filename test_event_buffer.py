@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+手把事件環形緩衝區（EventRingBuffer）
+- 寫入位置繞回陣列開頭後，讀出的順序與內容不變
+- 緩衝區已滿時捨棄新事件並計數，不覆寫尚未讀取的事件
+"""
+from common.event_buffer import EVENT_AXIS, EVENT_BUTTON_DOWN, EVENT_BUTTON_UP, EventRingBuffer
+
+
+def _drain_all(buffer, max_events=None):
+    events = []
+    buffer.drain(lambda *event: events.append(event), max_events)
+    return events
+
+
+def test_ring_buffer_wraps_around():
+    """寫入位置繞回陣列開頭後，讀出的順序與內容不變"""
+    buffer = EventRingBuffer(capacity=4)
+    for i in range(3):
+        buffer.push(i, EVENT_BUTTON_DOWN, i, True, 1 << i, 0.0, 0.0)
+    assert [event[0] for event in _drain_all(buffer)] == [0, 1, 2]
+
+    for i in range(3, 7):  # 第 4、5、6 筆寫在 slot 3、0、1、2
+        assert buffer.push(i, EVENT_AXIS, 0, True, 0, i / 10, -i / 10)
+    events = _drain_all(buffer)
+    assert [event[0] for event in events] == [3, 4, 5, 6]
+    assert events[-1] == (6, EVENT_AXIS, 0, True, 0, 0.6, -0.6)
+    assert len(buffer) == 0
+    assert buffer.dropped == 0
+
+
+def test_ring_buffer_drops_when_full():
+    """已滿時捨棄新事件（不覆寫未讀的事件）；讀出部分後可繼續寫入"""
+    buffer = EventRingBuffer(capacity=3)
+    results = [buffer.push(i, EVENT_BUTTON_DOWN, i, True, 0, 0.0, 0.0) for i in range(5)]
+    assert results == [True, True, True, False, False]
+    assert buffer.dropped == 2
+    assert len(buffer) == 3
+
+    assert [event[0] for event in _drain_all(buffer, max_events=2)] == [0, 1]
+    assert buffer.push(10, EVENT_BUTTON_UP, 0, False, 0, 0.0, 0.0)
+    assert buffer.push(11, EVENT_BUTTON_UP, 1, False, 0, 0.0, 0.0)
+    assert not buffer.push(12, EVENT_BUTTON_UP, 2, False, 0, 0.0, 0.0)
+    assert buffer.dropped == 3
+    assert [event[0] for event in _drain_all(buffer)] == [2, 10, 11]
+
+
+def test_ring_buffer_clear():
+    buffer = EventRingBuffer(capacity=4)
+    buffer.push(1, EVENT_BUTTON_DOWN, 0, True, 1, 0.0, 0.0)
+    buffer.clear()
+    assert _drain_all(buffer) == []
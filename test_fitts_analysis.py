@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Fitts 分析（fitts_analysis）
+- 已知端點的有效寬度 We、有效難度 IDe 與吞吐量 TP
+- 沒有 spawn_position 的舊結果由第一個軌跡點的方向回推起點
+"""
+import math
+
+import pytest
+
+from common.fitts_analysis import EFFECTIVE_WIDTH_FACTOR, fitts_analysis
+
+
+def _trial(target, endpoint, time_ms, radius, condition, spawn=None, start_position=None, initial_distance=None):
+    distance_type, size_type = condition.split("_")
+    trial = {
+        "target_x": target[0], "target_y": target[1], "target_radius": radius,
+        "distance_type": distance_type, "size_type": size_type,
+        "completion_time_ms": time_ms,
+        "press_locations": {"coordinates": [(0, 0), endpoint]},  # 只有最後一次按鍵是端點
+    }
+    if spawn is not None:
+        trial["spawn_position"] = spawn
+    else:  # 沒有 spawn_position 的舊結果
+        trial["joystick_trajectory"] = {"start_position": start_position}
+        trial["initial_distance"] = initial_distance
+    return trial
+
+
+def test_fitts_effective_width_and_throughput():
+    trials = [
+        # 水平移動 100 px：端點偏移 dx = -2, 0, +5
+        _trial((100, 0), (98, 3), 500, 10, "long_large", spawn=(0, 0)),
+        _trial((100, 0), (100, -4), 600, 10, "long_large", spawn=(0, 0)),
+        _trial((100, 0), (105, 0), 700, 10, "long_large", spawn=(0, 0)),
+        # 往上移動 200 px：dx = +10, -6；第二筆為舊結果，起點由第一個軌跡點的方向回推
+        _trial((50, -150), (53, -160), 900, 5, "short_small", spawn=(50, 50)),
+        _trial((50, -150), (50, -144), 1100, 5, "short_small", start_position=(50, 40), initial_distance=200),
+    ]
+    analysis = fitts_analysis(trials)
+    large = analysis["conditions"]["long_large"]
+    small = analysis["conditions"]["short_small"]
+
+    # long_large：平均 dx = 1，SD = sqrt((9 + 1 + 16) / 2)
+    sd = math.sqrt(13)
+    we = EFFECTIVE_WIDTH_FACTOR * sd
+    ide = math.log2(101 / we + 1)
+    assert large["count"] == 3
+    assert large["nominal_distance_px"] == pytest.approx(100)
+    assert large["id_bits"] == pytest.approx(math.log2(100 / 20 + 1))
+    assert large["endpoint_sd_px"] == pytest.approx(sd)
+    assert large["effective_width_px"] == pytest.approx(we)
+    assert large["effective_distance_px"] == pytest.approx(101)
+    assert large["effective_id_bits"] == pytest.approx(ide)
+    assert large["throughput_bits_per_s"] == pytest.approx(ide / 0.6)
+
+    # short_small：平均 dx = 2，SD = sqrt((64 + 64) / 1)
+    sd = math.sqrt(128)
+    small_ide = math.log2(202 / (EFFECTIVE_WIDTH_FACTOR * sd) + 1)
+    assert small["nominal_distance_px"] == pytest.approx(200)
+    assert small["endpoint_sd_px"] == pytest.approx(sd)
+    assert small["effective_id_bits"] == pytest.approx(small_ide)
+    assert small["throughput_bits_per_s"] == pytest.approx(small_ide / 1.0)
+
+    assert analysis["throughput_bits_per_s"] == pytest.approx((ide / 0.6 + small_ide) / 2)
+    regression = analysis["regression"]["effective"]
+    slope = (1.0 - 0.6) / (small_ide - ide)
+    assert regression["slope_s_per_bit"] == pytest.approx(slope)
+    assert regression["intercept_s"] == pytest.approx(0.6 - slope * ide)
+    assert regression["r_squared"] == pytest.approx(1.0)
+
+
+def test_fitts_single_trial_has_no_effective_width():
+    analysis = fitts_analysis([_trial((100, 0), (98, 0), 500, 10, "long_large", spawn=(0, 0))])
+    assert analysis["conditions"]["long_large"]["effective_width_px"] is None
+    assert analysis["throughput_bits_per_s"] is None
+    assert fitts_analysis([]) is None
+
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+固定時間步長迴圈（FixedTimestepLoop）
+- 每幀依實際經過的時間執行整數個步長，餘數留到下一幀
+- 落後時補跑的步長不超過上限，超過的時間記為 dropped_seconds 並標記 degraded
+- 重新 start() 時統計歸零（每個 trial 各自統計）
+以虛擬時鐘控制每幀經過的時間，直接呼叫 _tick()
+"""
+import pytest
+
+from common import game_loop
+from common.game_loop import FixedTimestepLoop
+from common.replay import HeadlessRoot, VirtualClock
+
+MS = 1_000_000
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = VirtualClock()
+    monkeypatch.setattr(game_loop, "time", clock)
+    return clock
+
+
+def _frame(loop, clock, ms):
+    clock.now_ns += ms * MS
+    loop._tick()
+
+
+def test_steps_follow_elapsed_time_and_drop_beyond_cap(clock):
+    steps = []
+    loop = FixedTimestepLoop(HeadlessRoot(clock), steps.append, step_ms=10, max_catch_up_steps=3)
+    loop.start()
+
+    _frame(loop, clock, 10)
+    assert steps == [0.01]
+    assert loop.late_frames == 0
+
+    _frame(loop, clock, 25)  # 補跑 2 步，剩下 5ms 留到下一幀
+    assert len(steps) == 3
+    assert loop.late_frames == 1
+    assert loop.frame_dt == pytest.approx(0.025)
+
+    _frame(loop, clock, 60)  # 累積 65ms：補跑 3 步後捨棄剩餘的 35ms
+    assert len(steps) == 6
+    assert set(steps) == {0.01}
+    stats = loop.get_timing_stats()
+    assert stats["late_frames"] == 2
+    assert stats["dropped_seconds"] == pytest.approx(0.035)
+    assert stats["degraded"] is True
+
+    _frame(loop, clock, 9)  # 捨棄後不再帶著餘數：9ms 不足一步
+    assert len(steps) == 6
+
+
+def test_start_resets_timing_stats(clock):
+    loop = FixedTimestepLoop(HeadlessRoot(clock), lambda dt: None, step_ms=10, max_catch_up_steps=2)
+    loop.start()
+    _frame(loop, clock, 50)
+    assert loop.get_timing_stats()["degraded"] is True
+
+    loop.start()
+    assert loop.get_timing_stats() == {"simulation_step_seconds": 0.01, "late_frames": 0,
+                                       "dropped_seconds": 0.0, "degraded": False}
+    clock.now_ns += 100 * MS  # 兩個 trial 之間經過的時間不會被補跑
+    loop.start()
+    _frame(loop, clock, 10)
+    assert loop.get_timing_stats()["late_frames"] == 0
+
+
+def test_scheduled_ticks_and_stop(clock):
+    """由 root.after 排程執行：每個步長到期時執行一次，stop() 後不再執行"""
+    root = HeadlessRoot(clock)
+    steps = []
+    loop = FixedTimestepLoop(root, steps.append, step_ms=16)
+    loop.start()
+    root.mainloop(until_ns=clock.now_ns + 160 * MS)
+    assert len(steps) == 10
+    assert loop.late_frames == 0
+
+    loop.stop()
+    root.mainloop(until_ns=clock.now_ns + 160 * MS)
+    assert len(steps) == 10
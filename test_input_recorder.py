@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+原始輸入紀錄（InputRecorder / load_input_log）
+- 寫入後以 memmap 讀回的欄位與寫入的內容相同
+- 不會接在既有紀錄檔之後寫入；錄製中斷留下的不完整紀錄不會被讀出
+- 檔頭記錄 session 種子，開始標記與手把事件寫在同一個紀錄序列；第 1 版紀錄檔仍可讀取
+"""
+from common.event_buffer import EVENT_AXIS, EVENT_BUTTON_DOWN, EVENT_BUTTON_UP
+from common.input_recorder import (HEADER_SIZE, HEADER_STRUCTS, KIND_MARKER, MAGIC, MARKER_START, RECORD_SIZE,
+                                   RECORD_STRUCT, InputRecorder, load_input_log)
+
+
+def test_input_log_round_trip(tmp_path):
+    """寫入的每一筆紀錄都能以 load_input_log 讀回"""
+    records = [
+        (1_000, EVENT_BUTTON_DOWN, 3, 1.0, 0),
+        (2_500, EVENT_AXIS, 0, -0.5, 1),
+        (4_000, EVENT_AXIS, 1, 0.25, 1),
+        (9_000, EVENT_BUTTON_UP, 3, 0.0, 0),
+    ]
+    recorder = InputRecorder(tmp_path / "raw" / "session.stin")
+    for timestamp_ns, kind, code, value, device in records:
+        recorder.record(timestamp_ns, kind, code, value, device)
+    recorder.close()
+    recorder.close()  # 可重複呼叫
+
+    log = load_input_log(recorder.path)
+    assert log["timestamp_ns"].tolist() == [r[0] for r in records]
+    assert log["kind"].tolist() == [r[1] for r in records]
+    assert log["code"].tolist() == [r[2] for r in records]
+    assert log["value"].tolist() == [r[3] for r in records]
+    assert log["device"].tolist() == [r[4] for r in records]
+    assert log["header"]["timestamp_mode"] == "batch"
+    assert log["header"]["start_perf_ns"] > 0
+
+
+def test_input_log_never_appends_to_existing_file(tmp_path):
+    """同一路徑再建立紀錄器時改用新檔名，不會接在舊檔頭之後"""
+    path = tmp_path / "session.stin"
+    first = InputRecorder(path)
+    first.record(1, EVENT_BUTTON_DOWN, 0, 1.0)
+    first.close()
+    second = InputRecorder(path)
+    second.record(2, EVENT_BUTTON_DOWN, 0, 1.0)
+    second.record(3, EVENT_BUTTON_UP, 0, 0.0)
+    second.close()
+
+    assert first.path != second.path
+    assert load_input_log(first.path)["timestamp_ns"].tolist() == [1]
+    assert load_input_log(second.path)["timestamp_ns"].tolist() == [2, 3]
+
+
+def test_input_log_ignores_truncated_record(tmp_path):
+    """錄製中斷留下不完整的最後一筆時，只讀回完整的紀錄"""
+    recorder = InputRecorder(tmp_path / "session.stin")
+    recorder.record(1, EVENT_BUTTON_DOWN, 0, 1.0)
+    recorder.record(2, EVENT_BUTTON_UP, 0, 0.0)
+    recorder.close()
+    with open(recorder.path, "r+b") as f:
+        f.truncate(HEADER_SIZE + RECORD_SIZE + 5)
+
+    assert load_input_log(recorder.path)["timestamp_ns"].tolist() == [1]
+
+
+def test_input_log_records_session_seed_and_start_marker(tmp_path):
+    recorder = InputRecorder(tmp_path / "session.stin", session_seed=123456789)
+    recorder.record(1, EVENT_BUTTON_DOWN, 0, 1.0)
+    recorder.mark(MARKER_START, timestamp_ns=2)
+    recorder.close()
+
+    log = load_input_log(recorder.path)
+    assert log["header"]["session_seed"] == 123456789
+    assert log["kind"].tolist() == [EVENT_BUTTON_DOWN, KIND_MARKER]
+    assert log["code"].tolist() == [0, MARKER_START]
+
+    unseeded = InputRecorder(tmp_path / "unseeded.stin")
+    unseeded.close()
+    assert load_input_log(unseeded.path)["header"]["session_seed"] is None
+
+
+def test_input_log_reads_version_1_files(tmp_path):
+    """第 1 版檔頭沒有 session 種子欄位"""
+    path = tmp_path / "v1.stin"
+    with open(path, "wb") as f:
+        f.write(HEADER_STRUCTS[1].pack(MAGIC, 1, RECORD_SIZE, 1, 1700000000.0, 500))
+        f.write(RECORD_STRUCT.pack(700, 1.0, 2, EVENT_BUTTON_DOWN, 0))
+
+    log = load_input_log(path)
+    assert log["header"]["format_version"] == 1
+    assert log["header"]["session_seed"] is None
+    assert log["header"]["start_perf_ns"] == 500
+    assert log["timestamp_ns"].tolist() == [700]
+    assert log["code"].tolist() == [2]
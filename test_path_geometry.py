@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+路徑幾何
+- 批次判斷 contains() 與逐點判斷 is_inside() / contains_point() 的結果一致（含收縮後的路徑）
+"""
+import numpy as np
+import pytest
+
+from common.path_geometry import CircleGeometry, PathGeometry, RectGeometry, SegmentGeometry
+from common.replay import HeadlessWidget
+from tests.analog_path_follow_test import CornerPath, StraightPath
+
+GRID_XS, GRID_YS = (grid.ravel() for grid in np.meshgrid(np.arange(50, 760, 7.5), np.arange(80, 560, 7.5)))
+
+
+@pytest.mark.parametrize("geometry", [
+    SegmentGeometry(100, 300, 700, 300, 30),
+    SegmentGeometry(150, 450, 550, 120, 20),
+    SegmentGeometry(300, 300, 300, 300, 20),  # 零長度的路徑段不包含任何點
+    RectGeometry(200, 150, 420, 380),
+    CircleGeometry(400, 300, 95),
+    PathGeometry([SegmentGeometry(100, 500, 400, 500, 30), SegmentGeometry(400, 500, 400, 150, 30),
+                  RectGeometry(370, 150, 430, 250)]),
+], ids=["horizontal", "diagonal", "zero_length", "rect", "circle", "composite"])
+def test_geometry_contains_matches_contains_point(geometry):
+    expected = [geometry.contains_point(x, y) for x, y in zip(GRID_XS.tolist(), GRID_YS.tolist())]
+    assert geometry.contains(GRID_XS, GRID_YS).tolist() == expected
+
+
+def _paths():
+    canvas = HeadlessWidget()
+    return [
+        StraightPath(canvas, 100, 300, 700, 300, 60),
+        StraightPath(canvas, 150, 450, 550, 120, 40),
+        CornerPath(canvas, 100, 500, 400, 500, 400, 150, 60),
+        CornerPath(canvas, 700, 120, 300, 120, 300, 480, 50),
+    ]
+
+
+@pytest.mark.parametrize("path", _paths(), ids=["straight", "diagonal", "corner", "corner_left"])
+def test_contains_matches_is_inside(path):
+    path.create_path()
+    xs, ys = GRID_XS, GRID_YS
+    for _ in range(4):  # 完整路徑與收縮後的路徑
+        expected = [path.is_inside(x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+        assert path.contains(xs, ys).tolist() == expected
+        assert any(expected)
+        for _ in range(40):
+            path.shrink()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+路徑追蹤逐步記錄的摘要（summarize_samples）
+由逐步記錄計算偏離次數、持續時間、深度與偏移分佈
+"""
+import pytest
+
+from common.path_samples import summarize_samples
+
+
+def test_summarize_samples():
+    """兩次偏離：第 2–3 筆（0.2 秒，最深 5 px）與第 6–9 筆（0.4 秒，最深 10 px）"""
+    inside = [1, 0, 0, 1, 1, 0, 0, 0, 0, 1]
+    lateral = [0, 12, 15, 5, 0, -11, -20, -13, -12, 3]
+    time_s = [0.1 * (i + 1) for i in range(10)]
+    progress = [10.0 * i for i in range(10)]
+
+    summary = summarize_samples(time_s, lateral, progress, inside, 0.1, 10, 100)
+    assert summary["sample_count"] == 10
+    assert summary["off_path_samples"] == 6
+    assert summary["off_path_time_seconds"] == pytest.approx(0.6)
+    assert summary["excursion_count"] == 2
+    first, second = summary["excursions"]
+    assert first == pytest.approx({"start_s": 0.1, "duration_s": 0.2, "start_progress_px": 10, "max_depth_px": 5})
+    assert second == pytest.approx({"start_s": 0.5, "duration_s": 0.4, "start_progress_px": 50, "max_depth_px": 10})
+    assert summary["duration_histogram"] == {"<0.1s": 0, "0.1-0.25s": 1, "0.25-0.5s": 1, "0.5-1.0s": 0,
+                                             "1.0-2.0s": 0, ">=2.0s": 0}
+    assert summary["max_lateral_px"] == 20
+    assert summary["max_excursion_depth_px"] == 10
+    # 每一段路徑剛好一筆記錄，均方根即為該筆的橫向距離
+    assert summary["deviation_profile"]["rms_lateral_px"] == pytest.approx([abs(v) for v in lateral])
+
+
+def test_summarize_samples_without_excursions():
+    summary = summarize_samples([], [], [], [], 0.01, 10, 100)
+    assert summary["sample_count"] == 0
+    assert summary["excursion_count"] == 0
+    assert summary["excursions"] == []
+    assert summary["max_lateral_px"] == 0.0
+    assert summary["deviation_profile"]["rms_lateral_px"] == []
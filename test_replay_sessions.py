@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+以無頭重播引擎執行各測試 App，檢查儲存的結果
+- 按鍵與搖桿輸入以 scripted_press / scripted_tilt 產生，在虛擬時鐘上送出，不需要手把與螢幕
+- 刺激出現的時間由 random 決定：replay_session 以固定 seed 初始化 random，
+  這裡用相同 seed 的 random.Random 依 App 的抽取順序推算，讓腳本在刺激出現後才按鍵
+- 錄製的紀錄檔以檔頭的 session 種子與「開始測試」標記重播，結果存到重播專用的資料夾
+"""
+import json
+import math
+import random
+
+import pytest
+
+from common import config
+from common.event_buffer import EVENT_BUTTON_DOWN, EVENT_BUTTON_UP
+from common.input_recorder import MARKER_START, InputRecorder, read_input_log_header
+from common.replay import (HeadlessRoot, VirtualClock, headless_environment, load_replay_events, replay_session,
+                           scripted_press, scripted_tilt)
+from common.result_saver import load_test_result
+from common.test_runner import create_test_app
+from tests import analog_path_follow_test
+
+SEED = 7
+USER_ID = "replay_user"
+
+
+@pytest.fixture
+def results_dir(tmp_path, monkeypatch):
+    """結果、軌跡圖與 session 資料都寫到暫存資料夾；軌跡圖在目前的程序同步繪製"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "TRACE_PLOT_WORKERS", 0)
+    monkeypatch.setattr(config, "RECORD_RAW_INPUT", False)
+    return str(tmp_path / "results")
+
+
+def _run(test_name, events, results_dir, **kwargs):
+    session = replay_session(test_name, events, user_id=USER_ID, seed=SEED, results_dir=results_dir, **kwargs)
+    assert session["errors"] == []
+    result = load_test_result(USER_ID, test_name, results_dir=results_dir)
+    assert result is not None, f"{test_name} 沒有儲存結果"
+    return result["metrics"]
+
+
+def test_reaction_time(results_dir):
+    """每次刺激出現 250ms 後按鍵；第一回合先提早按一次，該回合重新開始"""
+    rng = random.Random(SEED)
+    events = []
+    t = 1000  # 開始後 1 秒進入準備狀態
+    delay = rng.randint(1000, 3000)
+    events += scripted_press(t + delay - 300, 0)  # 變紅前按下：太早
+    t = t + delay - 300 + 1000  # 重新開始：1 秒後再進入準備狀態
+    for _ in range(10):
+        red = t + rng.randint(1000, 3000)
+        events += scripted_press(red + 250, 0)
+        t = red + 250 + 2000  # 1 秒後下一回合，再 1 秒後進入準備狀態
+
+    metrics = _run("button_reaction_time", events, results_dir)
+    assert metrics["total_trials"] == 10
+    assert [trial["trial_number"] for trial in metrics["trials"]] == list(range(1, 11))
+    for trial in metrics["trials"]:
+        assert trial["reaction_time_ms"] == pytest.approx(250, abs=0.01)
+
+
+def test_recorded_log_replays_with_session_seed_and_start_click(results_dir, tmp_path):
+    """錄製時 1.5 秒後才點擊開始，每次刺激出現 250ms 後按鍵；重播不指定結果資料夾"""
+    session_seed = 2024
+    recorder = InputRecorder(tmp_path / "raw" / "session.stin", session_seed=session_seed)
+    recorder.flush()
+    start_ns = read_input_log_header(recorder.path)["start_perf_ns"]
+    ms = 1_000_000
+
+    rng = random.Random(session_seed)
+    t = 1500
+    recorder.mark(MARKER_START, start_ns + t * ms)
+    t += 1000
+    for _ in range(10):
+        red = t + rng.randint(1000, 3000)
+        recorder.record(start_ns + (red + 250) * ms, EVENT_BUTTON_DOWN, 0, 1.0)
+        recorder.record(start_ns + (red + 350) * ms, EVENT_BUTTON_UP, 0, 0.0)
+        t = red + 250 + 2000
+    recorder.close()
+
+    events, header = load_replay_events(recorder.path)
+    session = replay_session("button_reaction_time", events, user_id=USER_ID, seed=header["session_seed"])
+    assert session["errors"] == []
+    assert load_test_result(USER_ID, "button_reaction_time", results_dir=config.RESULTS_DIR) is None
+    metrics = load_test_result(USER_ID, "button_reaction_time", results_dir=config.REPLAY_RESULTS_DIR)["metrics"]
+    assert metrics["total_trials"] == 10
+    for trial in metrics["trials"]:
+        assert trial["reaction_time_ms"] == pytest.approx(250, abs=0.01)
+
+
+def test_button_accuracy(results_dir):
+    """熱身與 10 回合都在方向亮起 300ms 後按鍵，第 3 回合故意按錯"""
+    bits = {"up": 3, "down": 0, "left": 2, "right": 1}
+    wrong = {"up": "down", "down": "up", "left": "right", "right": "left"}
+    rng = random.Random(SEED)
+    events = []
+    t = 0
+    for round_index in range(11):
+        shown = t + rng.randint(1000, 3000)
+        target = rng.choice(list(bits))
+        answer = wrong[target] if round_index == 3 else target
+        events += scripted_press(shown + 300, bits[answer])
+        t = shown + 300 + 1000
+
+    metrics = _run("button_accuracy", events, results_dir)
+    assert metrics["total_trials"] == 10
+    assert metrics["correct_responses"] == 9
+    assert metrics["trials"][2]["correct"] is False
+    assert metrics["average_response_time_ms"] == pytest.approx(300, abs=0.01)
+
+
+def test_button_smash(results_dir):
+    """10 秒內每 100ms 按一次指定按鍵；其他按鍵不計入"""
+    events = []
+    for i in range(120):
+        events += scripted_press(500 + i * 100, 1, hold_ms=40)
+    events += scripted_press(550, 2, hold_ms=20)
+
+    metrics = _run("button_smash", events, results_dir, tail_ms=1000)
+    assert metrics["total_clicks"] == 100
+    assert metrics["clicks_per_second"] == pytest.approx(10)
+    relative = [click["relative_time_ms"] for click in metrics["click_timestamps"]]
+    assert relative[:3] == pytest.approx([0, 100, 200])
+
+
+def test_button_prediction_countdown(results_dir):
+    """每顆球在抵達目標時間後 30ms 按鍵"""
+    events = []
+    for i in range(10):
+        events += scripted_press(i * 500 + 1000 + 30, 0, hold_ms=40)
+
+    metrics = _run("button_prediction_countdown", events, results_dir)
+    assert metrics["successful_responses"] == 10
+    assert metrics["average_error_ms"] == pytest.approx(30, abs=0.01)
+
+
+def test_analog_move(results_dir, tmp_path, monkeypatch):
+    """沿水平線來回移動到目標後按鍵，檢查每個 trial 的起點與 Fitts 分析"""
+    center_x, center_y = config.WINDOW_WIDTH // 2, config.WINDOW_HEIGHT // 2
+    far_x = center_x + 130  # 搖桿推到底 10 個模擬步長的距離
+    targets = [{"x": far_x, "y": center_y, "radius": 30, "is_warmup": True}]
+    for i in range(4):
+        targets.append({"x": center_x if i % 2 == 0 else far_x, "y": center_y, "radius": 30,
+                        "distance_type": "long", "size_type": "large"})
+    schedule_path = tmp_path / "schedule.json"
+    schedule_path.write_text(json.dumps({"targets": targets}), encoding="utf-8")
+    monkeypatch.setattr(config, "ANALOG_MOVE_SCHEDULE_FILE", str(schedule_path))
+
+    events = []
+    t = 200
+    x = center_x
+    for target, steps in zip(targets, (10, 10, 9, 11, 10)):
+        direction = 1 if target["x"] > x else -1
+        events += scripted_tilt(t, direction, 0)
+        events += scripted_tilt(t + steps * config.SIMULATION_STEP_MS, 0, 0)
+        events += scripted_press(t + steps * config.SIMULATION_STEP_MS + 200, 0)
+        t += steps * config.SIMULATION_STEP_MS + 200 + 1200  # 成功後 1 秒才出現下一個目標
+        x = target["x"]
+
+    metrics = _run("analog_move", events, results_dir)
+    trials = metrics["trials"]
+    assert len(trials) == 4
+    previous_end = trials[0]["press_locations"]["coordinates"][-1]
+    for trial in trials[1:]:
+        assert trial["spawn_position"] == pytest.approx(previous_end)
+        previous_end = trial["press_locations"]["coordinates"][-1]
+
+    condition = metrics["fitts_analysis"]["conditions"]["long_large"]
+    assert condition["count"] == 4
+    assert condition["effective_width_px"] > 0
+    assert metrics["fitts_analysis"]["throughput_bits_per_s"] > 0
+
+
+def _path_script(path, start_ms, speed):
+    """沿路徑中心線移動的搖桿腳本：直線一路推到終點區域；轉彎在抵達轉角的步長改變方向"""
+    step_ms = config.SIMULATION_STEP_MS
+    points = [(path.start_x, path.start_y)]
+    if isinstance(path, analog_path_follow_test.CornerPath):
+        points.append((path.corner_x, path.corner_y))
+    points.append((path.end_x, path.end_y))
+
+    events = []
+    t = start_ms
+    for (x1, y1), (x2, y2) in zip(points, points[1:]):
+        length = math.hypot(x2 - x1, y2 - y1)
+        events += scripted_tilt(t, (x2 - x1) / length, (y2 - y1) / length)
+        t += round(length / speed) * step_ms
+    # 多推一段確保進入終點區域，再放開讓下一條路徑重新開始
+    events += scripted_tilt(t + 300, 0, 0)
+    return events, t + 300
+
+
+def test_analog_path_follow(results_dir):
+    """依相同 seed 建立一次 App 取得打亂後的路徑順序，再沿每條路徑的中心線移動"""
+    clock = VirtualClock()
+    with headless_environment(analog_path_follow_test, clock, results_dir):
+        random.seed(SEED)
+        probe = create_test_app("analog_path_follow", HeadlessRoot(clock), "probe")[0]
+
+    events = []
+    t = 200
+    for path in probe.paths:
+        path_events, released = _path_script(path, t, probe.speed)
+        events += path_events
+        t = released + 1500  # 抵達終點 1 秒後載入下一條路徑
+
+    metrics = _run("analog_path_follow", events, results_dir)
+    trials = metrics["trials"]
+    assert len(trials) == 12
+    assert [(trial["path_info"]["start_x"], trial["path_info"]["start_y"],
+             trial["path_info"]["end_x"], trial["path_info"]["end_y"]) for trial in trials] == \
+        [(path.start_x, path.start_y, path.end_x, path.end_y) for path in probe.paths]
+    for trial in trials:
+        assert trial["path_accuracy"] == pytest.approx(100)
+        assert trial["timing_degraded"] is False
+        samples = trial["off_path_events"]
+        assert samples["sample_count"] == trial["trace_points_count"] == len(trial["player_trace"])
+        assert samples["excursion_count"] == 0
+        corners = trial["movement_analysis"]["corner_segments"]
+        assert len(corners) == (1 if trial["path_type"] == "corner" else 0)
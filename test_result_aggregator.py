@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+跨使用者結果彙整（result_aggregator）
+- 摘要只保留使用者資訊與 metrics 的純量欄位
+- SummaryCache 以 (mtime_ns, 大小) 判斷檔案是否變動：未變動的檔案不重新解析，變動後重新解析
+- 快取以絕對路徑為鍵，從不同工作目錄、以相對或絕對路徑執行都能命中
+"""
+import json
+import os
+
+import pytest
+
+from common import config, result_aggregator
+
+
+def _write_result(results_dir, user_id, test_name, stamp, average, age=30):
+    path = results_dir / user_id / f"{test_name}_{stamp}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {"user_id": user_id, "test_name": test_name, "timestamp": stamp, "age": age,
+            "controller_usage_frequency": 3,
+            "metrics": {"average_reaction_time_ms": average, "trials": [{"reaction_time_ms": average}],
+                        "difficulty_analysis": {"long_large": {"avg_time": average / 1000}}}}
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def results_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "AGGREGATE_CACHE_FILE", str(tmp_path / "cache" / "aggregate_cache.sqlite"))
+    results_dir = tmp_path / "results"
+    _write_result(results_dir, "U1", "button_reaction_time", "20250101_090000", 250, age=25)
+    _write_result(results_dir, "U2", "button_reaction_time", "20250101_100000", 310, age=45)
+    _write_result(results_dir, "U2", "button_smash", "20250101_110000", 0, age=45)
+    return results_dir
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """記錄實際解析的檔案"""
+    paths = []
+    summarize = result_aggregator.summarize_result
+    monkeypatch.setattr(result_aggregator, "summarize_result", lambda path: paths.append(path) or summarize(path))
+    return paths
+
+
+def _load(results_dir, test_name="button_reaction_time"):
+    return result_aggregator.load_summaries(test_name, str(results_dir), workers=1)
+
+
+def test_summary_keeps_user_fields_and_metric_scalars(results_dir):
+    summaries = _load(results_dir)
+    assert [(s["user_id"], s["age"]) for s in summaries] == [("U1", 25), ("U2", 45)]
+    assert summaries[0]["metrics"] == {"average_reaction_time_ms": 250, "difficulty_analysis.long_large.avg_time": 0.25}
+    table = result_aggregator.aggregate(summaries, "average_reaction_time_ms", "age", [0, 40, 100])
+    assert {group: row["mean"] for group, row in table.items()} == {"0-39": 250, "40-99": 310}
+
+
+def test_cache_skips_unchanged_files_and_reparses_changed_ones(results_dir, parsed):
+    first = _load(results_dir)
+    assert len(parsed) == 2
+
+    parsed.clear()
+    assert _load(results_dir) == first
+    assert parsed == []
+
+    # 內容改變（大小不同）或只有 mtime 改變都會重新解析
+    changed = _write_result(results_dir, "U1", "button_reaction_time", "20250101_090000", 1250, age=25)
+    touched = results_dir / "U2" / "button_reaction_time_20250101_100000.json"
+    st = touched.stat()
+    os.utime(touched, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    summaries = _load(results_dir)
+    assert sorted(parsed) == sorted([str(changed), str(touched)])
+    assert [s["metrics"]["average_reaction_time_ms"] for s in summaries] == [1250, 310]
+
+
+def test_cache_hits_from_relative_paths(results_dir, parsed, monkeypatch):
+    _load(results_dir)
+    parsed.clear()
+    monkeypatch.chdir(results_dir.parent)
+    assert len(_load("results")) == 2
+    assert parsed == []
+
+
+def test_lookup_returns_only_requested_paths(results_dir):
+    _load(results_dir, test_name=None)
+    paths = [str(p) for p in sorted(results_dir.glob("*/button_reaction_time_*.json"))]
+    stats = {path: (os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in paths}
+    stats[paths[1]] = (stats[paths[1]][0] + 1, stats[paths[1]][1])
+
+    cache = result_aggregator.SummaryCache()
+    try:
+        cached, missing = cache.lookup(stats)
+    finally:
+        cache.close()
+    assert list(cached) == [paths[0]]
+    assert missing == [paths[1]]
+
+
+def test_results_copied_in_after_indexing_are_aggregated(results_dir):
+    """使用者資料夾已有索引時，之後從其他測試站合併進來的結果仍會被彙整（不寫入索引檔）"""
+    from common import result_index
+
+    result_index.rebuild_index("U1", str(results_dir))
+    assert len(_load(results_dir)) == 2
+
+    _write_result(results_dir, "U1", "button_reaction_time", "20250102_090000", 270, age=25)
+    index_mtime = (results_dir / "U1" / config.RESULT_INDEX_FILENAME).stat().st_mtime_ns
+    summaries = _load(results_dir)
+    assert [s["timestamp"] for s in summaries] == ["20250101_090000", "20250102_090000", "20250101_100000"]
+    assert (results_dir / "U1" / config.RESULT_INDEX_FILENAME).stat().st_mtime_ns == index_mtime
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+結果索引（result_index）
+- 新增、查詢（測試名稱、時間範圍、最新一筆）與重新建立索引
+- 唯讀查詢不會在結果資料夾建立索引檔
+"""
+import json
+
+from common import config, result_index
+
+USER_ID = "P001"
+
+
+def _write_result(results_dir, test_name, stamp):
+    path = results_dir / USER_ID / f"{test_name}_{stamp}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"test_name": test_name, "stamp": stamp}), encoding="utf-8")
+    return path
+
+
+def _names(paths):
+    return [path.rsplit("/", 1)[-1] for path in paths]
+
+
+def test_index_add_and_query(tmp_path):
+    results_dir = tmp_path / "results"
+    for test_name, stamp in [("button_smash", "20250101_090000"),
+                             ("analog_move", "20250101_100000"),
+                             ("button_smash", "20250102_090000"),
+                             ("analog_move", "20250103_100000")]:
+        path = _write_result(results_dir, test_name, stamp)
+        result_index.add_result(USER_ID, path, results_dir=results_dir)
+
+    query = result_index.query_results
+    assert _names(query(USER_ID, "button_smash", results_dir=results_dir)) == \
+        ["button_smash_20250101_090000.json", "button_smash_20250102_090000.json"]
+    assert _names(query(USER_ID, "analog_move", latest=True, results_dir=results_dir)) == \
+        ["analog_move_20250103_100000.json"]
+    assert _names(query(USER_ID, start="20250101_093000", end="20250102_235959", results_dir=results_dir)) == \
+        ["analog_move_20250101_100000.json", "button_smash_20250102_090000.json"]
+    assert query("nobody", results_dir=results_dir) == []
+
+
+def test_index_ignores_unrelated_file_names():
+    assert result_index.parse_result_file_name("analog_move_20250101_120000.json") == \
+        ("analog_move", "20250101_120000")
+    assert result_index.parse_result_file_name("analog_move_20250101_120000.columns.bin") is None
+    assert result_index.parse_result_file_name("notes.json") is None
+
+
+def test_index_rebuild_after_external_changes(tmp_path):
+    """索引檔不存在時第一次查詢掃描資料夾；檔案在程式外變動後 rebuild_index 重新整理"""
+    results_dir = tmp_path / "results"
+    _write_result(results_dir, "button_smash", "20250101_090000")
+    old = _write_result(results_dir, "button_smash", "20250102_090000")
+
+    assert len(result_index.query_results(USER_ID, "button_smash", results_dir=results_dir)) == 2
+    assert (results_dir / USER_ID / config.RESULT_INDEX_FILENAME).exists()
+
+    old.unlink()
+    _write_result(results_dir, "button_smash", "20250103_090000")
+    result_index.rebuild_index(USER_ID, results_dir)
+    assert _names(result_index.query_results(USER_ID, "button_smash", results_dir=results_dir)) == \
+        ["button_smash_20250101_090000.json", "button_smash_20250103_090000.json"]
+
+
+def test_index_read_only_query_does_not_create_index(tmp_path):
+    results_dir = tmp_path / "results"
+    _write_result(results_dir, "button_smash", "20250101_090000")
+
+    paths = result_index.query_results(USER_ID, results_dir=results_dir, read_only=True)
+    assert _names(paths) == ["button_smash_20250101_090000.json"]
+    assert not (results_dir / USER_ID / config.RESULT_INDEX_FILENAME).exists()
+
+
+def test_index_picks_up_results_copied_in(tmp_path):
+    """索引建立後從其他電腦複製進來的結果，下次查詢（含唯讀查詢）即可看到，不需手動 rebuild_index"""
+    results_dir = tmp_path / "results"
+    path = _write_result(results_dir, "button_smash", "20250101_090000")
+    result_index.add_result(USER_ID, path, results_dir=results_dir)
+    assert len(result_index.query_results(USER_ID, "button_smash", results_dir=results_dir)) == 1
+
+    _write_result(results_dir, "button_smash", "20250105_090000")
+    assert _names(result_index.query_results(USER_ID, "button_smash", latest=True, read_only=True,
+                                             results_dir=results_dir)) == ["button_smash_20250105_090000.json"]
+    assert _names(result_index.query_results(USER_ID, "button_smash", latest=True, results_dir=results_dir)) == \
+        ["button_smash_20250105_090000.json"]
+
+
+def _save(results_dir, stamp):
+    """與 save_test_result 相同的順序：寫入前檢查索引，寫入後加入索引"""
+    current = result_index.is_index_current(USER_ID, results_dir)
+    path = _write_result(results_dir, "button_smash", stamp)
+    result_index.add_result(USER_ID, path, results_dir=results_dir, index_current=current)
+
+
+def test_index_is_not_rescanned_when_directory_is_unchanged(tmp_path, monkeypatch):
+    """程式自己儲存結果與寫入索引不會讓索引過期；資料夾沒有變動時查詢不掃描資料夾"""
+    results_dir = tmp_path / "results"
+    _save(results_dir, "20250101_090000")
+    assert result_index.is_index_current(USER_ID, results_dir)
+
+    scans = []
+    rebuild = result_index._rebuild
+    monkeypatch.setattr(result_index, "_rebuild", lambda conn, result_dir: scans.append(result_dir) or
+                        rebuild(conn, result_dir))
+    _save(results_dir, "20250102_090000")
+    _save(results_dir, "20250103_090000")
+    for read_only in (False, True, False):
+        assert len(result_index.query_results(USER_ID, results_dir=results_dir, read_only=read_only)) == 3
+    assert scans == []
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+結果儲存（result_saver）的使用者基本資訊
+- 多人同時測試時，每位受試者的結果與 session 清單寫入自己的年齡與手把使用頻率
+- 已收集過的受試者不再詢問
+"""
+import builtins
+
+import pytest
+
+from common import config, result_saver
+from common.utils import collect_user_info_if_needed
+
+
+@pytest.fixture
+def results_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "RESULTS_DIR", str(tmp_path / "results"))
+    monkeypatch.setattr(config, "SESSIONS_DIR", str(tmp_path / "sessions"))
+    monkeypatch.setattr(config, "participants", {})
+    monkeypatch.setattr(config, "user_info", {})
+    return tmp_path
+
+
+def _answer(monkeypatch, answers):
+    """依序回答 input() 的提問"""
+    answers = iter(answers)
+    monkeypatch.setattr(builtins, "input", lambda prompt="": next(answers))
+
+
+def test_each_participant_gets_own_demographics(results_dir, monkeypatch):
+    _answer(monkeypatch, ["25", "2", "61", "7"])
+    collect_user_info_if_needed("P1")
+    collect_user_info_if_needed("P2")
+    assert config.user_info["user_id"] == "P2"
+
+    _answer(monkeypatch, [])  # 已收集過，不再詢問
+    assert collect_user_info_if_needed("P1")["age"] == 25
+
+    for user_id, age, frequency in [("P1", 25, 2), ("P2", 61, 7)]:
+        result_saver.save_test_result(user_id, "button_smash", {"total_clicks": 1})
+        result = result_saver.load_test_result(user_id, "button_smash", results_dir=config.RESULTS_DIR)
+        assert (result["age"], result["controller_usage_frequency"]) == (age, frequency)
+
+
+def test_unknown_user_has_no_demographics(results_dir):
+    config.user_info = {"user_id": "P1", "age": 30, "controller_usage_frequency": 3}
+    result_saver.save_test_result("P9", "button_smash", {"total_clicks": 1})
+    result = result_saver.load_test_result("P9", "button_smash", results_dir=config.RESULTS_DIR)
+    assert "age" not in result
+    assert result_saver.user_info_for("P1")["age"] == 30  # 只以命令列參數設定的目前使用者
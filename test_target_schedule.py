@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+analog_move 的目標排程（target_schedule）
+- 第一個為暖身目標，其後每個 距離 × 大小 條件一個區塊
+- 每個目標的預期距離從上一個目標中心算起，ID = log2(D / 直徑 + 1)
+- 指定 seed 時區塊順序固定打亂，相同參數只計算一次
+- save_schedule / load_schedule 來回後目標表不變
+"""
+import json
+import math
+
+import pytest
+
+from common.target_schedule import DEFAULT_TEST_SEQUENCE, build_schedule, load_schedule, save_schedule
+
+CENTER = (400, 300)
+
+
+def _block_order(schedule):
+    return [(t["distance_type"], t["size_type"]) for t in schedule if t["sequence_index"] == 1]
+
+
+def test_schedule_layout_and_difficulty():
+    schedule = build_schedule(*CENTER)
+    assert len(schedule) == 1 + 4 * len(DEFAULT_TEST_SEQUENCE)
+    assert [t["is_warmup"] for t in schedule].count(True) == 1
+
+    warmup, first = schedule[0], schedule[1]
+    assert warmup["is_warmup"] and warmup["radius"] == 30
+    assert warmup["position_index"] == DEFAULT_TEST_SEQUENCE[-1]
+    assert warmup["expected_distance"] == pytest.approx(300)  # 從圓心出發
+    assert warmup["index_of_difficulty"] == pytest.approx(math.log2(300 / 60 + 1))
+
+    # 暖身位置 5 → 位置 1：圓周上相隔 160° 的弦長
+    chord = 2 * 300 * math.sin(math.radians(80))
+    assert first["expected_distance"] == pytest.approx(chord)
+    assert first["index_of_difficulty"] == pytest.approx(math.log2(chord / 100 + 1))
+    assert _block_order(schedule) == [("long", "large"), ("long", "small"), ("short", "large"), ("short", "small")]
+    assert [t["block_index"] for t in schedule[1::len(DEFAULT_TEST_SEQUENCE)]] == [1, 2, 3, 4]
+
+    with pytest.raises(TypeError):
+        first["radius"] = 1  # 唯讀
+
+
+def test_seed_shuffles_blocks_reproducibly():
+    unshuffled = sorted(_block_order(build_schedule(*CENTER, repetitions=2)))
+    orders = {tuple(_block_order(build_schedule(*CENTER, repetitions=2, seed=seed))) for seed in range(10)}
+    assert len(orders) > 1
+    assert all(sorted(order) == unshuffled for order in orders)
+
+    first = build_schedule(*CENTER, repetitions=2, seed=3)
+    build_schedule.cache_clear()
+    again = build_schedule(*CENTER, repetitions=2, seed=3)
+    assert first is not again
+    assert [dict(t) for t in first] == [dict(t) for t in again]
+    assert len(first) == 1 + 8 * len(DEFAULT_TEST_SEQUENCE)
+
+
+def test_same_parameters_return_cached_schedule():
+    assert build_schedule(*CENTER, seed=5) is build_schedule(*CENTER, seed=5)
+    assert build_schedule(*CENTER, seed=5) is not build_schedule(*CENTER, seed=6)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    schedule = build_schedule(*CENTER, seed=11)
+    path = tmp_path / "schedules" / "analog_move.json"
+    save_schedule(schedule, path, center=list(CENTER), seed=11)
+    assert json.loads(path.read_text(encoding="utf-8"))["settings"] == {"center": [400, 300], "seed": 11}
+
+    loaded = load_schedule(path, *CENTER)
+    assert [dict(t) for t in loaded] == pytest.approx([dict(t) for t in schedule])
+
+
+def test_load_hand_written_target_list(tmp_path):
+    path = tmp_path / "targets.json"
+    path.write_text(json.dumps([{"x": 100, "y": 0, "radius": 10}, {"x": 100, "y": 50, "radius": 5}]))
+    first, second = load_schedule(path, 0, 0)
+    assert first["is_warmup"] is False and second["sequence_index"] == 1
+    assert first["expected_distance"] == pytest.approx(100)
+    assert second["index_of_difficulty"] == pytest.approx(math.log2(50 / 10 + 1))
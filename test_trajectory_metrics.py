@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+逐點更新的軌跡統計（TrajectoryAccumulator）
+以手算的軌跡檢查路徑長度、移動效率、峰值速度、開始移動時間、次移動數（含遲滯門檻）、過衝與進入目標次數
+"""
+import pytest
+
+from common.trajectory_metrics import TrajectoryAccumulator
+
+# 沿 x 軸往目標 (100, 0) 移動：兩次加速（中間減速到 50 px/s），超過目標到 112 後退回
+POINTS = [(0, 0), (0, 0), (10, 0), (30, 0), (50, 0), (55, 0), (75, 0), (95, 0), (112, 0), (104, 0), (100, 0)]
+DT = 0.1
+
+
+def _accumulate(hysteresis=0.0, points=POINTS, start=(0, 0)):
+    accumulator = TrajectoryAccumulator(submovement_hysteresis=hysteresis)
+    accumulator.reset(start[0], start[1], 100, 0, 10)
+    for x, y in points:
+        accumulator.add(x, y, DT)
+    return accumulator
+
+
+def test_trajectory_summary():
+    summary = _accumulate().summary(initial_distance=100)
+    assert summary["total_distance_pixels"] == pytest.approx(124)  # 從第一個軌跡點算起
+    assert summary["straight_line_distance"] == pytest.approx(100)
+    assert summary["movement_efficiency_ratio"] == pytest.approx(100 / 124)
+    assert summary["peak_speed_px_per_s"] == pytest.approx(200)
+    assert summary["time_to_first_move_seconds"] == pytest.approx(0.2)
+    assert summary["submovement_count"] == 2
+    assert summary["max_overshoot_px"] == pytest.approx(12)
+    assert summary["target_entries"] == 2  # 95 進入、112 離開、104 再次進入
+
+
+def test_submovement_hysteresis_ignores_small_dips():
+    """速度從 200 降到 50 再回到 200：門檻 160 px/s 時這次減速不算新的次移動"""
+    assert _accumulate(hysteresis=140).submovement_count == 2
+    assert _accumulate(hysteresis=160).submovement_count == 1
+
+
+def test_short_trace_uses_initial_distance():
+    summary = _accumulate(points=[(3, 4)]).summary(initial_distance=90)
+    assert summary["straight_line_distance"] == 90
+    assert summary["movement_efficiency_ratio"] == 1.0
+    assert summary["total_distance_pixels"] == 0.0
+    assert summary["time_to_first_move_seconds"] == 0.0  # 第一步就離開起點
+
+
+def test_reset_starts_a_new_trial():
+    accumulator = _accumulate()
+    accumulator.reset(100, 0, 100, 0, 10)  # 起點已在目標內：不算進入目標
+    for x in (101, 102, 102):
+        accumulator.add(x, 0, DT)
+    summary = accumulator.summary(initial_distance=0)
+    assert accumulator.count == 3
+    assert summary["target_entries"] == 0
+    assert summary["total_distance_pixels"] == pytest.approx(1)
+    assert summary["max_overshoot_px"] == 0.0  # 起點與目標重合，沒有方向
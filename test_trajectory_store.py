@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+軌跡 sidecar（trajectory_store）
+- Columnar 序列寫入 sidecar 後以 memmap 讀回，JSON 只保留參照
+- inline 模式與 sidecar 模式儲存的結果讀回後相同
+"""
+import json
+
+import numpy as np
+import pytest
+
+from common import config, trajectory_store
+from common.trajectory_store import Columnar
+
+USER_ID = "P001"
+
+
+def test_sidecar_round_trip(tmp_path):
+    """座標與一維序列寫入同一個 sidecar，JSON 只保留參照，讀回的數值相同"""
+    trace = [(1.5, 2.5), (3.0, -4.0), (5.25, 6.0)]
+    dts = [0.016, 0.017, 0.015]
+    data = {"trials": [{"player_trace": Columnar(trace, width=2),
+                        "frame_dt_seconds": Columnar(dts),
+                        "empty": Columnar([], width=2),
+                        "score": 3}]}
+    result_path = tmp_path / "analog_path_follow_20250101_120000.json"
+    sidecar = trajectory_store.sidecar_path_for(result_path)
+
+    stored = trajectory_store.extract_columns(data, sidecar)
+    trial = stored["trials"][0]
+    assert trajectory_store.is_column_ref(trial["player_trace"])
+    assert trial["player_trace"]["shape"] == [3, 2]
+    assert trial["frame_dt_seconds"]["offset"] == 6 * 8
+    assert trial["score"] == 3
+    result_path.write_text(json.dumps(stored), encoding="utf-8")
+
+    loaded = trajectory_store.load_columns(json.loads(result_path.read_text(encoding="utf-8")), result_path)
+    trial = loaded["trials"][0]
+    assert isinstance(trial["player_trace"], np.memmap)
+    np.testing.assert_array_equal(trial["player_trace"], np.array(trace))
+    np.testing.assert_array_equal(trial["frame_dt_seconds"], np.array(dts))
+    assert trial["empty"].shape == (0, 2)
+
+
+def test_sidecar_inline_storage(tmp_path):
+    """inline 模式不建立 sidecar，序列直接寫成列表"""
+    sidecar = tmp_path / "result.columns.bin"
+    stored = trajectory_store.extract_columns({"trace": Columnar([(1, 2)], width=2)}, sidecar, inline=True)
+    assert stored == {"trace": [[1, 2]]}
+    assert not sidecar.exists()
+
+
+@pytest.mark.parametrize("storage", ["sidecar", "inline"])
+def test_saved_result_loads_the_same(tmp_path, monkeypatch, storage):
+    """save_test_result 寫入、load_test_result 讀回的軌跡與儲存格式無關"""
+    from common import result_saver
+
+    monkeypatch.setattr(config, "RESULTS_DIR", str(tmp_path / "results"))
+    monkeypatch.setattr(config, "TRAJECTORY_STORAGE", storage)
+    trace = [(float(i), float(i * i)) for i in range(50)]
+    result_saver.save_test_result(USER_ID, "analog_move", {"trace": Columnar(trace, width=2)})
+
+    result = result_saver.load_test_result(USER_ID, "analog_move")
+    np.testing.assert_array_equal(np.asarray(result["metrics"]["trace"]), np.array(trace))
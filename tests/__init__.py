@@ -2,22 +2,25 @@
 Tests package
 包含所有手把測試模組
 """
+import importlib
 
-# 可以在這裡匯入所有測試模組，方便統一調用
-from ..common import connection_test
-from . import button_reaction_time_test
-from . import button_prediction_countdown_test
-from . import button_accuracy_test
-from . import button_smash_test
-from . import analog_move_test
-from . import analog_path_follow_test
-
+# 可以在這裡統一調用所有測試模組；模組在第一次存取時才匯入，
+# 載入單一測試（例如 `tests.button_smash_test`）不會連帶載入其他測試與 matplotlib
 __all__ = [
     'connection_test',
-    'button_reaction_time_test', 
+    'button_reaction_time_test',
     'button_prediction_countdown_test',
     'button_accuracy_test',
     'button_smash_test',
     'analog_move_test',
     'analog_path_follow_test'
 ]
+
+
+def __getattr__(name):
+    if name == 'connection_test':
+        # connection_test 在匯入時就會開始偵測手把
+        return importlib.import_module('common.connection_test')
+    if name in __all__:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -9,8 +9,6 @@ Analog Move Test - ISO9241 九點圓形指向測試
 
 import tkinter as tk
 import random
-import time
-from threading import Thread
 import sys
 from pathlib import Path
 
@@ -19,10 +17,19 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from common import config
 from common.result_saver import save_test_result
-from common.trace_plot import init_trace_output_folder, output_move_trace
-from common.utils import setup_window_topmost, collect_user_info_if_needed
+from common.trajectory_store import Columnar
+from common.trajectory_metrics import TrajectoryAccumulator
+from common.fitts_analysis import fitts_analysis
+from common.target_schedule import DEFAULT_TEST_SEQUENCE, build_schedule, circle_points, load_schedule
+from common.trace_plot import (init_trace_output_folder, move_trace_job, submit_trial_trace,
+                               submit_session_sheet, flush_trace_jobs, shutdown_trace_workers)
+from common.game_loop import FixedTimestepLoop
+from common.utils import setup_window_topmost, collect_user_info_if_needed, event_time, recorded_click, seed_session
 from common.language import set_language, get_text
 
+MOVE_SPEED_PX = 13  # 搖桿推到底時每個模擬步長移動的像素
+SUBMOVEMENT_SPEED_FRACTION = 0.1  # 次移動判定：速度變化超過最高速度的 10% 才視為新的加速段
+
 
 class JoystickTargetTestApp:
 
@@ -58,7 +65,7 @@ class JoystickTargetTestApp:
         self.start_button = tk.Button(root,
                                       text=get_text('gui_start_test'),
                                       font=("Arial", 24),
-                                      command=self.start_test,
+                                      command=recorded_click(self, self.start_test),
                                       bg=button_default_color,
                                       fg=text_color)
         self.start_button.place(relx=0.5, rely=0.95, anchor='s')
@@ -92,8 +99,13 @@ class JoystickTargetTestApp:
         self.leftY = 0
 
         self.trace_points = []  # 當前軌跡
+        self.trace_dts = []  # 每個軌跡點所在幀的實際間隔（秒）
         self.press_trace = []
+        # 軌跡統計隨每個模擬步長累計，trial 結束時不需重新走訪整條軌跡
+        max_speed = MOVE_SPEED_PX / (config.SIMULATION_STEP_MS / 1000)
+        self.trajectory = TrajectoryAccumulator(submovement_hysteresis=max_speed * SUBMOVEMENT_SPEED_FRACTION)
         self.output_dir = init_trace_output_folder("analog_move", self.user_id)
+        self.trace_jobs = []  # 本次 session 的繪圖工作，結束時可輸出多格總表
 
         # ISO9241 標準九點圓形測試設計
         # 從中心點 (600, 400) 距離 300 像素的圓周上設置 9 個點
@@ -103,118 +115,47 @@ class JoystickTargetTestApp:
         self.distance = 300  # 長距離
         self.short_distance = 100  # 短距離
         
-        # 生成 9 個長距離圓周點的座標
-        import math
-        self.circle_points = []
-        for i in range(9):
-            angle = i * (360 / 9) * math.pi / 180  # 轉換為弧度
-            x = self.center_x + self.distance * math.cos(angle)
-            y = self.center_y + self.distance * math.sin(angle)
-            self.circle_points.append((x, y))
-        
-        # 生成 9 個短距離圓周點的座標
-        self.short_circle_points = []
-        for i in range(9):
-            angle = i * (360 / 9) * math.pi / 180  # 轉換為弧度
-            x = self.center_x + self.short_distance * math.cos(angle)
-            y = self.center_y + self.short_distance * math.sin(angle)
-            self.short_circle_points.append((x, y))
+        # 9 個長距離與短距離圓周點的座標
+        self.circle_points = circle_points(self.center_x, self.center_y, self.distance)
+        self.short_circle_points = circle_points(self.center_x, self.center_y, self.short_distance)
         
         # 測試序列：從位置1開始，到對面順時針的下一個位置
         # 位置編號：0=右(0°), 1=右下(40°), 2=下右(80°), 3=下左(120°), 4=左下(160°), 
         #          5=左(200°), 6=左上(240°), 7=上左(280°), 8=上右(320°)
-        self.test_sequence = [1, 6, 2, 7, 3, 8, 4, 0, 5]  # 從1開始，每次跳到對面順時針下一個
-        
-        # 固定目標組合：增加第零次測試 + 先測試所有大目標，再測試所有小目標
-        self.fixed_targets = []
-        
-        # 第零次測試：移動到最後一個位置（不計入正式結果）
-        last_pos_index = self.test_sequence[-1]  # 最後一個位置
-        x, y = self.circle_points[last_pos_index]
-        self.fixed_targets.append({
-            "x": x,
-            "y": y,
-            "radius": 30,  # 使用中等大小的目標
-            "sequence_index": 0,
-            "position_index": last_pos_index,
-            "size_type": "warmup",
-            "is_warmup": True
-        })
-        
-        # 先添加大目標 (radius=50) - 完整的9個位置 (長距離)
-        for i, pos_index in enumerate(self.test_sequence):
-            x, y = self.circle_points[pos_index]
-            self.fixed_targets.append({
-                "x": x,
-                "y": y,
-                "radius": 50,
-                "sequence_index": i + 1,
-                "position_index": pos_index,
-                "size_type": "large",
-                "is_warmup": False,
-                "distance_type": "long"
-            })
-        
-        # 再添加小目標 (radius=20) - 完整的9個位置 (長距離)
-        for i, pos_index in enumerate(self.test_sequence):
-            x, y = self.circle_points[pos_index]
-            self.fixed_targets.append({
-                "x": x,
-                "y": y,
-                "radius": 20,
-                "sequence_index": i + 1,
-                "position_index": pos_index,
-                "size_type": "small",
-                "is_warmup": False,
-                "distance_type": "long"
-            })
+        self.test_sequence = list(DEFAULT_TEST_SEQUENCE)  # 從1開始，每次跳到對面順時針下一個
         
-        # 添加短距離大目標 (radius=50) - 完整的9個位置 (短距離)
-        for i, pos_index in enumerate(self.test_sequence):
-            x, y = self.short_circle_points[pos_index]
-            self.fixed_targets.append({
-                "x": x,
-                "y": y,
-                "radius": 50,
-                "sequence_index": i + 1,
-                "position_index": pos_index,
-                "size_type": "large",
-                "is_warmup": False,
-                "distance_type": "short"
-            })
-        
-        # 添加短距離小目標 (radius=20) - 完整的9個位置 (短距離)
-        for i, pos_index in enumerate(self.test_sequence):
-            x, y = self.short_circle_points[pos_index]
-            self.fixed_targets.append({
-                "x": x,
-                "y": y,
-                "radius": 20,
-                "sequence_index": i + 1,
-                "position_index": pos_index,
-                "size_type": "small",
-                "is_warmup": False,
-                "distance_type": "short"
-            })
-        
-        # 不打亂順序，保持測試的一致性
+        # 固定目標組合：第零次暖身測試 + 長距離大、小目標，再短距離大、小目標（預先計算的唯讀目標表）
+        # 設定排程檔時改為載入檔案，各測試站使用完全相同的目標順序
+        self.schedule_file = config.ANALOG_MOVE_SCHEDULE_FILE
+        if self.schedule_file:
+            self.fixed_targets = load_schedule(self.schedule_file, self.center_x, self.center_y)
+            print(get_text('schedule_loaded', count=len(self.fixed_targets), path=self.schedule_file))
+        else:
+            self.fixed_targets = build_schedule(
+                self.center_x, self.center_y,
+                distances=(("long", self.distance), ("short", self.short_distance)),
+                test_sequence=tuple(self.test_sequence),
+                repetitions=config.ANALOG_MOVE_REPETITIONS,
+                seed=config.ANALOG_MOVE_SCHEDULE_SEED)
 
         # 計算正式測試總數（扣除暖身測試）
         self.total_formal_tests = len([t for t in self.fixed_targets if not t.get("is_warmup", False)])
 
         self.spawn_target()
-        Thread(target=self.player_loop, daemon=True).start()
-
-    def player_loop(self):
-        while self.running:
-            if self.testing and self.running:
-                try:
-                    self.update_player_position()
-                except Exception as e:
-                    if self.running:  # 只在仍在運行時報告錯誤
-                        print(get_text('update_position_error', error=e))
-                    break
-            time.sleep(0.016)  # 約 60fps
+        self.loop = FixedTimestepLoop(self.root, self.player_step)
+        self.loop.start()
+
+    def player_step(self, dt):
+        """固定步長模擬一步，由 FixedTimestepLoop 在 Tk 主執行緒上呼叫"""
+        if not self.running:
+            self.loop.stop()
+            return
+        if self.testing:
+            try:
+                self.update_player_position()
+            except Exception as e:
+                print(get_text('update_position_error', error=e))
+                self.loop.stop()
 
     def start_test(self):
         if self.success_count >= len(self.fixed_targets):
@@ -249,6 +190,8 @@ class JoystickTargetTestApp:
         # 計算從當前位置到目標的實際距離
         self.initial_distance = ((self.player_x - self.target_x)**2 +
                                  (self.player_y - self.target_y)**2)**0.5
+        self.spawn_position = (self.player_x, self.player_y)  # 目標出現時的玩家位置（移動起點）
+        self.trajectory.reset(self.player_x, self.player_y, self.target_x, self.target_y, self.target_radius)
 
         target_color = f"#{config.COLORS['TARGET'][0]:02x}{config.COLORS['TARGET'][1]:02x}{config.COLORS['TARGET'][2]:02x}"
         self.target = self.canvas.create_oval(
@@ -267,8 +210,8 @@ class JoystickTargetTestApp:
 
     def update_player_position(self):
         # 將 -1 ~ 1 值轉換為 -13 ~ +13 的速度
-        dx = (self.leftX) * 13
-        dy = (self.leftY) * 13
+        dx = (self.leftX) * MOVE_SPEED_PX
+        dy = (self.leftY) * MOVE_SPEED_PX
 
         self.player_x += dx
         self.player_y += dy
@@ -288,19 +231,21 @@ class JoystickTargetTestApp:
 
         if self.testing:
             self.trace_points.append((self.player_x, self.player_y))
+            self.trace_dts.append(self.loop.frame_dt)
+            self.trajectory.add(self.player_x, self.player_y, self.loop.step_seconds)
 
     def on_joycon_input(self, buttons, leftX, leftY, last_key_bit,
-                        last_key_down):
+                        last_key_down, timestamp_ns=None):
         self.leftX = leftX
         self.leftY = leftY
 
         # 如果第一次移動，開始計時
         if not self.has_moved and (leftX != 0 or leftY != 0):
-            self.start_time = time.time()
+            self.start_time = event_time(timestamp_ns)
             self.has_moved = True
 
     def on_joycon_button(self, buttons, leftX, leftY, last_key_bit,
-                         last_key_down):
+                         last_key_down, timestamp_ns=None):
         # 標準化測試條件：到達目標後可按任何按鍵確認
         if not last_key_down:
             return  # 只處理按下事件（不處理放開）
@@ -314,7 +259,7 @@ class JoystickTargetTestApp:
         distance = ((self.player_x - self.target_x)**2 +
                     (self.player_y - self.target_y)**2)**0.5
         if distance <= self.target_radius:
-            elapsed = time.time() - self.start_time
+            elapsed = event_time(timestamp_ns) - self.start_time
             self.success_count += 1
 
             # 獲取當前目標資訊
@@ -343,6 +288,7 @@ class JoystickTargetTestApp:
                     "target_y": self.target_y,
                     "target_radius": self.target_radius,
                     "initial_distance": self.initial_distance,
+                    "spawn_position": self.spawn_position,
                     "completion_time_ms": elapsed * 1000,  # 轉換為毫秒
                     "efficiency_s_per_px": efficiency,
                     "trace_points_count": len(self.trace_points),
@@ -351,40 +297,23 @@ class JoystickTargetTestApp:
                     "position_index": current_target_info.get("position_index", 0),
                     "size_type": current_target_info.get("size_type", "unknown"),
                     "distance_type": current_target_info.get("distance_type", "unknown"),
+                    "expected_distance": current_target_info.get("expected_distance"),
+                    "index_of_difficulty": current_target_info.get("index_of_difficulty"),
                     "joystick_trajectory": {
                         "description": "玩家移動軌跡座標序列",
-                        "sampling_note": "約60fps取樣，實際間隔16.67ms",
+                        "sampling_note": f"固定模擬步長 {self.loop.step_seconds * 1000:.0f}ms 取樣，frame_dt_seconds 為每點所在幀的實際間隔",
                         "coordinate_format": "[x, y] 畫布座標",
-                        "coordinates": self.trace_points.copy() if self.trace_points else [],
+                        # 軌跡列表在 trial 結束後換成新的列表，不需複製
+                        "coordinates": Columnar(self.trace_points, width=2),
+                        "frame_dt_seconds": Columnar(self.trace_dts),
                         "start_position": start_position,
                         "end_position": (self.player_x, self.player_y)
                     },
                     "press_locations": {
                         "description": "確認按鍵時的位置記錄",
-                        "coordinates": self.press_trace.copy() if self.press_trace else []
+                        "coordinates": Columnar(self.press_trace, width=2)
                     },
-                    "movement_analysis": {
-                        "total_distance_pixels": sum(
-                            ((self.trace_points[i][0] - self.trace_points[i-1][0])**2 + 
-                             (self.trace_points[i][1] - self.trace_points[i-1][1])**2)**0.5 
-                            for i in range(1, len(self.trace_points))
-                        ) if len(self.trace_points) > 1 else 0,
-                        "straight_line_distance": (
-                            ((self.trace_points[-1][0] - self.trace_points[0][0])**2 + 
-                             (self.trace_points[-1][1] - self.trace_points[0][1])**2)**0.5 
-                            if len(self.trace_points) >= 2 else self.initial_distance
-                        ),
-                        "movement_efficiency_ratio": (
-                            (((self.trace_points[-1][0] - self.trace_points[0][0])**2 + 
-                              (self.trace_points[-1][1] - self.trace_points[0][1])**2)**0.5) / 
-                            sum(((self.trace_points[i][0] - self.trace_points[i-1][0])**2 + 
-                                 (self.trace_points[i][1] - self.trace_points[i-1][1])**2)**0.5 
-                                for i in range(1, len(self.trace_points)))
-                            if len(self.trace_points) > 1 else 1.0
-                        ),
-                        "initial_distance_reference": self.initial_distance,
-                        "trace_based_calculation": True
-                    }
+                    "movement_analysis": self.trajectory.summary(self.initial_distance)
                 }
                 self.test_results.append(trial_result)
 
@@ -408,43 +337,32 @@ class JoystickTargetTestApp:
                 
             self.testing = False
             
-            # 輸出軌跡圖（包括暖身測試）
-            if not is_warmup:
-                # 正式測試使用實際的測試編號
-                start_position = (self.trace_points[0] if self.trace_points else (self.player_x, self.player_y))
-                output_move_trace(
-                    trace_points=self.trace_points,
-                    start=start_position,
-                    target=(self.target_x, self.target_y),
-                    radius=self.target_radius,
-                    player_radius=self.player_radius,
-                    press_points=self.press_trace,
-                    index=formal_count,  # 使用正式測試編號
-                    output_dir=self.output_dir
-                )
-            else:
-                # 暖身測試使用特殊編號
-                start_position = (self.trace_points[0] if self.trace_points else (self.player_x, self.player_y))
-                output_move_trace(
-                    trace_points=self.trace_points,
-                    start=start_position,
-                    target=(self.target_x, self.target_y),
-                    radius=self.target_radius,
-                    player_radius=self.player_radius,
-                    press_points=self.press_trace,
-                    index=0,  # 暖身測試編號為0
-                    output_dir=self.output_dir
-                )
+            # 在背景輸出軌跡圖（包括暖身測試），不延遲下一個目標
+            # 正式測試使用實際的測試編號，暖身測試編號為 0
+            start_position = (self.trace_points[0] if self.trace_points else (self.player_x, self.player_y))
+            submit_trial_trace(move_trace_job(
+                trace_points=self.trace_points,
+                start=start_position,
+                target=(self.target_x, self.target_y),
+                radius=self.target_radius,
+                player_radius=self.player_radius,
+                press_points=self.press_trace,
+                index=0 if is_warmup else formal_count,
+                output_dir=self.output_dir
+            ), self.trace_jobs)
             
             self.trace_points = []  # 清空以便下次測試
+            self.trace_dts = []
             self.press_trace = []
             
             # 如果測試完成，儲存 JSON 結果
             if self.success_count >= len(self.fixed_targets):
                 self.save_test_results()
+                submit_session_sheet(self.trace_jobs, self.output_dir)
+                flush_trace_jobs()
             
-            time.sleep(1)  # 等待 1 秒後再開始下一個目標
-            self.start_test()  # 重新開始測試
+            # 等待 1 秒後再開始下一個目標（不阻塞 Tk 主執行緒與事件讀取）
+            self.root.after(1000, self.start_test)
 
     def save_test_results(self):
         """儲存測試結果為 JSON 檔案"""
@@ -474,7 +392,13 @@ class JoystickTargetTestApp:
                     "movement_start_detection": "joystick輸入值偏離(0,0)時開始計時",
                     "efficiency_calculation": "完成時間(秒) ÷ 直線距離(像素)",
                     "trace_sampling": "移動軌跡以約60fps頻率記錄座標點",
-                    "coordinate_system": "畫布座標系統，左上角為(0,0)"
+                    "coordinate_system": "畫布座標系統，左上角為(0,0)",
+                    "peak_speed_definition": "相鄰模擬步長之間移動距離 ÷ 步長時間的最大值（像素/秒）",
+                    "time_to_first_move_definition": "目標出現後到玩家位置第一次改變的模擬時間（秒）",
+                    "submovement_definition": f"速度曲線由谷底重新加速超過最高速度 {SUBMOVEMENT_SPEED_FRACTION:.0%} 的次數（第一次起步算一次）",
+                    "overshoot_definition": "沿起點→目標方向超過目標中心的最大距離（像素）；target_entries 為進入目標圓的次數",
+                    "index_of_difficulty_definition": "排程中的 ID = log2(expected_distance / 目標直徑 + 1)，expected_distance 為上一個目標中心到此目標中心的距離",
+                    "throughput_definition": "fitts_analysis：各條件 We = 4.133 × 端點沿移動方向偏移的標準差，IDe = log2(De / We + 1)，吞吐量 = IDe ÷ 平均完成時間；整體吞吐量為各條件平均"
                 }
             },
             "window_size": {
@@ -482,10 +406,15 @@ class JoystickTargetTestApp:
                 "height": self.canvas_height
             },
             "player_radius": self.player_radius,
-            "movement_speed_multiplier": 13,
+            "movement_speed_multiplier": MOVE_SPEED_PX,
             "total_targets": len(self.fixed_targets),
-            "formal_test_count": len(self.fixed_targets) - 1,  # 扣除暖身測試
-            "has_warmup": True,
+            "formal_test_count": self.total_formal_tests,  # 扣除暖身測試
+            "has_warmup": any(t.get("is_warmup") for t in self.fixed_targets),
+            "target_schedule": {
+                "source": self.schedule_file or "generated",
+                "repetitions": None if self.schedule_file else config.ANALOG_MOVE_REPETITIONS,
+                "seed": None if self.schedule_file else config.ANALOG_MOVE_SCHEDULE_SEED
+            },
             "iso9241_config": {
                 "standard": "ISO9241多方向指向測試",
                 "center_point": [self.center_x, self.center_y],
@@ -548,7 +477,8 @@ class JoystickTargetTestApp:
                 "short_circle_radius": self.short_distance,
                 "test_sequence": self.test_sequence,
                 "position_angles": [i * 40 for i in range(9)]  # 每個位置的角度
-            }
+            },
+            "fitts_analysis": fitts_analysis(self.test_results)
         }
         
         # 儲存結果
@@ -569,6 +499,9 @@ class JoystickTargetTestApp:
         print(get_text('test_summary_total_time', time=self.total_time))
         print(get_text('test_summary_avg_time', time=avg_time))
         print(get_text('test_summary_avg_efficiency', efficiency=avg_efficiency))
+        fitts = metrics["fitts_analysis"]
+        if fitts and fitts["throughput_bits_per_s"] is not None:
+            print(get_text('test_summary_throughput', throughput=fitts["throughput_bits_per_s"]))
         print(get_text('test_summary_standard'))
         print(get_text('test_summary_distances', long=self.distance, short=self.short_distance))
         print(get_text('test_summary_combinations'))
@@ -589,10 +522,14 @@ class JoystickTargetTestApp:
         # 停止所有執行緒
         self.running = False
         self.testing = False
+        self.loop.stop()
         
         # 停止控制器執行緒（如果存在）
         if hasattr(self, 'listener') and self.listener:
             self.listener.stop()
+
+        # 等待尚未完成的軌跡圖
+        shutdown_trace_workers()
         
         # 關閉視窗
         self.root.quit()
@@ -602,7 +539,6 @@ class JoystickTargetTestApp:
 if __name__ == "__main__":
     import argparse
     from threading import Thread
-    from common.controller_input import ControllerInput
 
     # 檢查是否有 --english 參數來提前設定語言
     if '--english' in sys.argv:
@@ -638,14 +574,23 @@ if __name__ == "__main__":
         # 收集使用者基本資訊（如果尚未收集）
         collect_user_info_if_needed(user_id)
 
+    seed_session()  # 目標位置等隨機內容的種子，記錄在原始輸入紀錄中供重播
     root = tk.Tk()
     app = JoystickTargetTestApp(root, user_id)
 
-    # 使用新的遙控器管理系統 - 會自動使用已配對的遙控器
-    app.listener = ControllerInput(analog_callback=app.on_joycon_input,
-                                   button_callback=app.on_joycon_button,
-                                   use_existing_controller=True)
-    Thread(target=app.listener.run, daemon=True).start()
+    def connect_controller():
+        """視窗出現後才載入手把模組並連接手把（pygame 初始化需數百毫秒，不延後第一個畫面）"""
+        from common.controller_input import ControllerInput
+
+        # 使用新的遙控器管理系統 - 會自動使用已配對的遙控器
+        app.listener = ControllerInput(analog_callback=app.on_joycon_input,
+                                       button_callback=app.on_joycon_button,
+                                       use_existing_controller=True,
+                                       tk_root=root,
+                                       analog_sample_interval_ms=config.CONTROLLER_DRAIN_INTERVAL_MS)
+        Thread(target=app.listener.run, daemon=True).start()
+
+    root.after_idle(connect_controller)
 
     try:
         root.mainloop()
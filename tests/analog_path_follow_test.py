@@ -17,8 +17,14 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from common import config
 from common.result_saver import save_test_result
-from common.utils import get_directional_offset, setup_window_topmost, collect_user_info_if_needed
-from common.trace_plot import output_single_trace
+from common.trajectory_store import Columnar
+from common.utils import get_directional_offset, setup_window_topmost, collect_user_info_if_needed, seed_session
+from common.trace_plot import (single_trace_job, submit_trial_trace, submit_session_sheet,
+                               flush_trace_jobs, shutdown_trace_workers)
+from common.game_loop import FixedTimestepLoop
+from common.path_geometry import PathGeometry, SegmentGeometry, CircleGeometry, RectGeometry, Centerline
+from common.path_samples import PathSampleBuffer
+from common.path_analysis import analyze_corner_trace, analyze_straight_trace, corner_segment2_start
 from common.language import set_language, get_text
 
 DEBUG = False  # 是否啟用除錯模式
@@ -35,6 +41,9 @@ class Path(ABC):
         self.shrink_speed = 3
         self.is_active = True
         self.player_trace = []  # 玩家軌跡點
+        self.trace_dts = []  # 每個軌跡點所在幀的實際間隔（秒）
+        self._geometry = None  # 目前（收縮後）路徑的幾何快取，收縮時失效
+        self._goal_region = None  # 目標區域（不受收縮影響，只計算一次）
 
     @abstractmethod
     def create_path(self):
@@ -42,20 +51,50 @@ class Path(ABC):
         pass
 
     @abstractmethod
-    def is_inside(self, x, y):
-        """檢查點是否在路徑內，子類必須實現"""
+    def _build_geometry(self):
+        """依目前收縮進度建立路徑幾何，子類必須實現"""
         pass
 
+    @property
+    def geometry(self):
+        """目前路徑的 PathGeometry（只在收縮後重新計算）"""
+        if self._geometry is None:
+            self._geometry = self._build_geometry()
+        return self._geometry
+
+    def invalidate_geometry(self):
+        """收縮進度改變後呼叫，下次判斷時重新建立幾何"""
+        self._geometry = None
+
+    def is_inside(self, x, y):
+        """檢查點是否在收縮後的路徑內"""
+        return self.geometry.contains_point(x, y)
+
+    def contains(self, xs, ys):
+        """批次檢查整條軌跡是否在路徑內，回傳布林陣列"""
+        return self.geometry.contains(xs, ys)
+
     @abstractmethod
     def shrink(self):
         """收縮路徑，子類必須實現"""
         pass
 
     @abstractmethod
-    def get_goal_area(self):
-        """獲取目標區域座標，子類必須實現"""
+    def _build_goal_region(self):
+        """建立目標區域（SegmentGeometry 或 RectGeometry），子類必須實現"""
         pass
 
+    @property
+    def goal_region(self):
+        """目標區域的幾何形狀，提供 contains_point() 與 polygon()"""
+        if self._goal_region is None:
+            self._goal_region = self._build_goal_region()
+        return self._goal_region
+
+    def get_goal_area(self):
+        """獲取目標區域座標（結果 JSON 格式）"""
+        return self.goal_region.as_goal_area()
+
     def destroy(self):
         """銷毀路徑圖形"""
         for element in self.path_elements:
@@ -84,6 +123,7 @@ class StraightPath(Path):
         self.dx = end_x - start_x
         self.dy = end_y - start_y
         self.path_length = math.sqrt(self.dx**2 + self.dy**2)
+        self.centerline = Centerline([(start_x, start_y), (end_x, end_y)])
 
         # 當前路徑長度（用於收縮）
         self.current_length = self.path_length
@@ -144,48 +184,24 @@ class StraightPath(Path):
             current_start_y - perp_y  # 左下
         ]
 
-    def is_inside(self, x, y):
-        """檢查點是否在收縮後的直線路徑內"""
+    def _build_geometry(self):
+        """收縮後的直線路徑：current_start → end 的矩形（零長度路徑為圓形）"""
         if self.path_length == 0:
-            distance = math.hypot(x - self.start_x, y - self.start_y)
-            return distance <= self.width / 2
+            return PathGeometry([CircleGeometry(self.start_x, self.start_y, self.width / 2)])
 
-        # 目前黑色段的起點（從 end 回推）
+        # 目前黑色段的起點（從 end 回推）；玩家若跑在 current_start 前面（已被收掉），也算偏離
         ratio = self.current_length / self.path_length
         current_start_x = self.end_x - self.dx * ratio
         current_start_y = self.end_y - self.dy * ratio
-
-        # 使用 current_start → end 這段作為合法區段
-        # 玩家若跑在 current_start 前面（已被收掉），也要算偏離
-        dx = x - current_start_x
-        dy = y - current_start_y
-
-        segment_dx = self.end_x - current_start_x
-        segment_dy = self.end_y - current_start_y
-        segment_len_sq = segment_dx**2 + segment_dy**2
-
-        if segment_len_sq == 0:
-            return False
-
-        # 投影參數 t：投影在 segment 上的相對位置（0~1）
-        t = (dx * segment_dx + dy * segment_dy) / segment_len_sq
-
-        # ⛔ 超出 segment 範圍（不是黑色段）
-        if t < 0 or t > 1:
-            return False
-
-        # 找到投影點
-        nearest_x = current_start_x + t * segment_dx
-        nearest_y = current_start_y + t * segment_dy
-
-        distance = math.hypot(x - nearest_x, y - nearest_y)
-        return distance <= self.width / 2
+        return PathGeometry([SegmentGeometry(current_start_x, current_start_y,
+                                             self.end_x, self.end_y, self.width / 2)])
 
     def shrink(self):
         """從起點向終點方向收縮路徑"""
         if self.current_length > 0:
             self.current_length = max(0,
                                       self.current_length - self.shrink_speed)
+            self.invalidate_geometry()
 
             # 使用 coords 更新現有圖形，避免閃爍
             if self.path_length > 0:
@@ -201,17 +217,15 @@ class StraightPath(Path):
                                    self.start_x + half_width,
                                    self.start_y + half_width)
 
-    def get_goal_area(self):
-        """獲取目標區域座標"""
+    def _build_goal_region(self):
+        """目標區域：路徑終點前 100 px 的矩形"""
         goal_length = 100  # 目標區域長度
 
         if self.path_length == 0:
-            return {
-                'left': self.start_x - self.width // 2,
-                'top': self.start_y - self.width // 2,
-                'right': self.start_x + self.width // 2,
-                'bottom': self.start_y + self.width // 2
-            }
+            return RectGeometry(self.start_x - self.width // 2,
+                                self.start_y - self.width // 2,
+                                self.start_x + self.width // 2,
+                                self.start_y + self.width // 2)
 
         # 計算目標區域起點
         if self.path_length > goal_length:
@@ -222,20 +236,7 @@ class StraightPath(Path):
             goal_start_x = self.start_x
             goal_start_y = self.start_y
 
-        # 計算垂直向量
-        ux = self.dx / self.path_length
-        uy = self.dy / self.path_length
-        perp_x = -uy * self.width / 2
-        perp_y = ux * self.width / 2
-
-        return {
-            'points': [
-                goal_start_x + perp_x, goal_start_y + perp_y,
-                self.end_x + perp_x, self.end_y + perp_y, self.end_x - perp_x,
-                self.end_y - perp_y, goal_start_x - perp_x,
-                goal_start_y - perp_y
-            ]
-        }
+        return SegmentGeometry(goal_start_x, goal_start_y, self.end_x, self.end_y, self.width / 2)
 
 
 class CornerPath(Path):
@@ -265,7 +266,14 @@ class CornerPath(Path):
         self.segment2_length = math.sqrt((end_x - corner_x)**2 +
                                          (end_y - corner_y)**2)
         self.total_length = self.segment1_length + self.segment2_length
+        self.centerline = Centerline([(start_x, start_y), (corner_x, corner_y), (end_x, end_y)])
         self.current_progress = 1.0  # 1.0 表示完整路徑，0.0 表示完全收縮
+        self.segment2_start_x, self.segment2_start_y = self._calculate_segment2_start()
+
+    def _calculate_segment2_start(self):
+        """第二段起點：轉彎時往回延伸半個路寬，與第一段完全銜接"""
+        return corner_segment2_start(self.start_x, self.start_y, self.corner_x, self.corner_y,
+                                     self.end_x, self.end_y, self.width)
 
     def get_path_shapes(self):
         """回傳未收縮的兩段轉角路徑 polygon 點位陣列（供圖像輸出用）"""
@@ -277,30 +285,8 @@ class CornerPath(Path):
         shape1 = [(points1[i], points1[i + 1]) for i in range(0, 8, 2)]
         shapes.append(shape1)
 
-        # 第二段：使用與 create_path 相同的邏輯計算起點
-        dx1 = self.corner_x - self.start_x
-        dy1 = self.corner_y - self.start_y
-        length1 = math.sqrt(dx1**2 + dy1**2)
-        
-        dx2 = self.end_x - self.corner_x
-        dy2 = self.end_y - self.corner_y
-        length2 = math.sqrt(dx2**2 + dy2**2)
-        
-        if length1 > 0 and length2 > 0:
-            ux2 = dx2 / length2
-            uy2 = dy2 / length2
-            
-            cross_product = dx1 * dy2 - dy1 * dx2
-            
-            if abs(cross_product) > 1e-6:
-                seg2_start_x = self.corner_x - ux2 * (self.width / 2)
-                seg2_start_y = self.corner_y - uy2 * (self.width / 2)
-            else:
-                seg2_start_x = self.corner_x
-                seg2_start_y = self.corner_y
-        else:
-            seg2_start_x = self.corner_x
-            seg2_start_y = self.corner_y
+        # 第二段：使用與 create_path 相同的起點
+        seg2_start_x, seg2_start_y = self.segment2_start_x, self.segment2_start_y
 
         points2 = self._create_segment_points(seg2_start_x, seg2_start_y,
                                               self.end_x, self.end_y)
@@ -316,57 +302,8 @@ class CornerPath(Path):
                                              self.corner_x, self.corner_y,
                                              'blue')
         
-        # 計算第一段的方向向量
-        dx1 = self.corner_x - self.start_x
-        dy1 = self.corner_y - self.start_y
-        length1 = math.sqrt(dx1**2 + dy1**2)
-        
-        # 計算第二段的方向向量
-        dx2 = self.end_x - self.corner_x
-        dy2 = self.end_y - self.corner_y
-        length2 = math.sqrt(dx2**2 + dy2**2)
-        
-        # 動態調整第二段起點來確保完全銜接
-        if length1 > 0 and length2 > 0:
-            # 第一段的單位向量
-            ux1 = dx1 / length1
-            uy1 = dy1 / length1
-            
-            # 第二段的單位向量  
-            ux2 = dx2 / length2
-            uy2 = dy2 / length2
-            
-            # 第一段在轉角處的垂直向量
-            perp1_x = -uy1 * self.width / 2
-            perp1_y = ux1 * self.width / 2
-            
-            # 第二段在轉角處的垂直向量
-            perp2_x = -uy2 * self.width / 2
-            perp2_y = ux2 * self.width / 2
-            
-            # 根據轉彎方向調整第二段起點
-            # 計算叉積來判斷轉彎方向
-            cross_product = dx1 * dy2 - dy1 * dx2
-            
-            if abs(cross_product) > 1e-6:  # 避免除零錯誤
-                if cross_product > 0:  # 左轉
-                    # 延伸第二段起點，使其與第一段的外側邊緣銜接
-                    segment2_start_x = self.corner_x - ux2 * (self.width / 2)
-                    segment2_start_y = self.corner_y - uy2 * (self.width / 2)
-                else:  # 右轉
-                    # 延伸第二段起點，使其與第一段的內側邊緣銜接
-                    segment2_start_x = self.corner_x - ux2 * (self.width / 2)
-                    segment2_start_y = self.corner_y - uy2 * (self.width / 2)
-            else:
-                # 直線情況（理論上不會發生在轉角路徑中）
-                segment2_start_x = self.corner_x
-                segment2_start_y = self.corner_y
-        else:
-            # 後備方案
-            segment2_start_x = self.corner_x
-            segment2_start_y = self.corner_y
-            
-        self.segment2 = self._create_segment(segment2_start_x, segment2_start_y,
+        # 第二段起點（__init__ 已以 corner_segment2_start 計算）：有轉彎時從轉角往回延伸半個路寬
+        self.segment2 = self._create_segment(self.segment2_start_x, self.segment2_start_y,
                                              self.end_x, self.end_y, 'green')
 
         if self.segment1:
@@ -413,99 +350,29 @@ class CornerPath(Path):
                                           fill=self.color,
                                           outline=self.color)
 
-    def is_inside(self, x, y):
-        """檢查點是否在收縮後的黑色轉彎路徑內"""
+    def _build_geometry(self):
+        """收縮後的黑色轉彎路徑：從終點往起點收縮的兩段矩形"""
         remaining_length = self.total_length * self.current_progress
         if remaining_length <= 0:
-            return False
-
-        # 計算第二段的正確起點（與其他方法保持一致）
-        dx1 = self.corner_x - self.start_x
-        dy1 = self.corner_y - self.start_y
-        length1 = math.sqrt(dx1**2 + dy1**2)
-        
-        dx2 = self.end_x - self.corner_x
-        dy2 = self.end_y - self.corner_y
-        length2 = math.sqrt(dx2**2 + dy2**2)
-        
-        if length1 > 0 and length2 > 0:
-            ux2 = dx2 / length2
-            uy2 = dy2 / length2
-            
-            cross_product = dx1 * dy2 - dy1 * dx2
-            
-            if abs(cross_product) > 1e-6:
-                segment2_start_x = self.corner_x - ux2 * (self.width / 2)
-                segment2_start_y = self.corner_y - uy2 * (self.width / 2)
-            else:
-                segment2_start_x = self.corner_x
-                segment2_start_y = self.corner_y
-        else:
-            segment2_start_x = self.corner_x
-            segment2_start_y = self.corner_y
+            return PathGeometry()
 
+        half_width = self.width / 2
         if remaining_length <= self.segment2_length:
             ratio = remaining_length / self.segment2_length
-            seg2_start_x = self.end_x - (self.end_x - segment2_start_x) * ratio
-            seg2_start_y = self.end_y - (self.end_y - segment2_start_y) * ratio
-
-            polygon = self._create_segment_points(seg2_start_x, seg2_start_y,
-                                                  self.end_x, self.end_y)
-            return self._point_in_polygon(x, y, polygon)
-        else:
-            remain_len = remaining_length - self.segment2_length
-            ratio = remain_len / self.segment1_length
-            seg1_start_x = self.corner_x - (self.corner_x -
-                                            self.start_x) * ratio
-            seg1_start_y = self.corner_y - (self.corner_y -
-                                            self.start_y) * ratio
-
-            polygon1 = self._create_segment_points(seg1_start_x, seg1_start_y,
-                                                   self.corner_x,
-                                                   self.corner_y)
-            polygon2 = self._create_segment_points(segment2_start_x,
-                                                   segment2_start_y,
-                                                   self.end_x, self.end_y)
-
-            return self._point_in_polygon(x, y, polygon1) or \
-                self._point_in_polygon(x, y, polygon2)
-
-    def _point_in_segment(self, px, py, x1, y1, x2, y2):
-        """檢查點是否在路徑段內"""
-        # 計算點到線段的距離
-        dx = x2 - x1
-        dy = y2 - y1
-        length_sq = dx**2 + dy**2
-
-        if length_sq == 0:
-            return False
-
-        # 計算投影參數
-        t = ((px - x1) * dx + (py - y1) * dy) / length_sq
-        t = max(0, min(1, t))
-
-        # 計算最近點
-        nearest_x = x1 + t * dx
-        nearest_y = y1 + t * dy
-
-        # 計算距離
-        distance = math.sqrt((px - nearest_x)**2 + (py - nearest_y)**2)
-
-        return distance <= self.width / 2
-
-    def _point_in_polygon(self, px, py, polygon_points):
-        """使用 ray casting 演算法判斷點是否在多邊形內"""
-        num = len(polygon_points)
-        inside = False
-        j = num - 2
-        for i in range(0, num, 2):
-            xi, yi = polygon_points[i], polygon_points[i + 1]
-            xj, yj = polygon_points[j], polygon_points[j + 1]
-            if ((yi > py) != (yj > py)) and \
-            (px < (xj - xi) * (py - yi) / ((yj - yi) + 1e-9) + xi):
-                inside = not inside
-            j = i
-        return inside
+            seg2_start_x = self.end_x - (self.end_x - self.segment2_start_x) * ratio
+            seg2_start_y = self.end_y - (self.end_y - self.segment2_start_y) * ratio
+            return PathGeometry([SegmentGeometry(seg2_start_x, seg2_start_y,
+                                                 self.end_x, self.end_y, half_width)])
+
+        remain_len = remaining_length - self.segment2_length
+        ratio = remain_len / self.segment1_length
+        seg1_start_x = self.corner_x - (self.corner_x - self.start_x) * ratio
+        seg1_start_y = self.corner_y - (self.corner_y - self.start_y) * ratio
+        return PathGeometry([
+            SegmentGeometry(seg1_start_x, seg1_start_y, self.corner_x, self.corner_y, half_width),
+            SegmentGeometry(self.segment2_start_x, self.segment2_start_y,
+                            self.end_x, self.end_y, half_width),
+        ])
 
     def shrink(self):
         """收縮轉彎路徑"""
@@ -513,6 +380,7 @@ class CornerPath(Path):
             self.current_progress = max(
                 0,
                 self.current_progress - self.shrink_speed / self.total_length)
+            self.invalidate_geometry()
             self._update_path()
 
     def _update_path(self):
@@ -524,30 +392,8 @@ class CornerPath(Path):
                 self.canvas.coords(element, 0, 0, 0, 0)
             return
 
-        # 計算第二段的正確起點（與 create_path 使用相同邏輯）
-        dx1 = self.corner_x - self.start_x
-        dy1 = self.corner_y - self.start_y
-        length1 = math.sqrt(dx1**2 + dy1**2)
-        
-        dx2 = self.end_x - self.corner_x
-        dy2 = self.end_y - self.corner_y
-        length2 = math.sqrt(dx2**2 + dy2**2)
-        
-        if length1 > 0 and length2 > 0:
-            ux2 = dx2 / length2
-            uy2 = dy2 / length2
-            
-            cross_product = dx1 * dy2 - dy1 * dx2
-            
-            if abs(cross_product) > 1e-6:
-                segment2_start_x = self.corner_x - ux2 * (self.width / 2)
-                segment2_start_y = self.corner_y - uy2 * (self.width / 2)
-            else:
-                segment2_start_x = self.corner_x
-                segment2_start_y = self.corner_y
-        else:
-            segment2_start_x = self.corner_x
-            segment2_start_y = self.corner_y
+        # 第二段的正確起點（與 create_path 使用相同邏輯）
+        segment2_start_x, segment2_start_y = self.segment2_start_x, self.segment2_start_y
 
         if remaining_length <= self.segment2_length:
             # segment2 正在收縮
@@ -613,9 +459,8 @@ class CornerPath(Path):
             y1 - perp_y  # 左下
         ]
 
-    def get_goal_area(self):
-        """獲取目標區域座標"""
-        # 計算終點附近的目標區域
+    def _build_goal_region(self):
+        """目標區域：沿第二段方向、終點前 100 px 的矩形"""
         goal_length = 100  # 目標區域長度
 
         # 計算第二段的方向向量
@@ -624,33 +469,12 @@ class CornerPath(Path):
         length = math.sqrt(dx**2 + dy**2)
 
         if length == 0:
-            return {
-                'left': self.end_x,
-                'top': self.end_y,
-                'right': self.end_x,
-                'bottom': self.end_y
-            }
-
-        # 單位向量
-        ux = dx / length
-        uy = dy / length
+            return RectGeometry(self.end_x, self.end_y, self.end_x, self.end_y)
 
         # 目標區域起點
-        goal_start_x = self.end_x - ux * goal_length
-        goal_start_y = self.end_y - uy * goal_length
-
-        # 垂直向量
-        perp_x = -uy * self.width / 2
-        perp_y = ux * self.width / 2
-
-        return {
-            'points': [
-                goal_start_x + perp_x, goal_start_y + perp_y,
-                self.end_x + perp_x, self.end_y + perp_y, self.end_x - perp_x,
-                self.end_y - perp_y, goal_start_x - perp_x,
-                goal_start_y - perp_y
-            ]
-        }
+        goal_start_x = self.end_x - dx / length * goal_length
+        goal_start_y = self.end_y - dy / length * goal_length
+        return SegmentGeometry(goal_start_x, goal_start_y, self.end_x, self.end_y, self.width / 2)
 
 
 class PathFollowingTestApp:
@@ -685,16 +509,18 @@ class PathFollowingTestApp:
 
         self.off_path_time = 0
         self.total_time = 0
-        self.start_time = None
         self.running = False
         self.reached_goal = False
 
         # 記錄所有測試結果用於 JSON 儲存
         self.test_results = []
+        # 每個模擬步長的偏離記錄（預先配置，每條路徑重複使用）
+        self.samples = PathSampleBuffer()
 
         # 創建路徑（可以選擇不同類型的路徑）
         self.paths = self.create_paths()
         self.current_path_index = 0
+        self.loop = FixedTimestepLoop(self.root, self.player_step)
         self.setup_player()
         self.load_path(self.current_path_index)
 
@@ -703,6 +529,7 @@ class PathFollowingTestApp:
         self.session_output_dir = os.path.join("data", "images", "analog_path_trace", self.user_id, timestamp)
         os.makedirs(self.session_output_dir, exist_ok=True)
         print(f"📂 {get_text('path_data_saved')}：{self.session_output_dir}")
+        self.trace_jobs = []  # 本次 session 的繪圖工作，結束時可輸出多格總表
 
     def create_paths(self):
         """回傳多條路徑清單 - 包含4種直線和8種L型轉彎路徑"""
@@ -768,6 +595,7 @@ class PathFollowingTestApp:
 
         self.path = self.paths[index]
         self.path.create_path()  # ✅ 在這裡才繪製當前路徑
+        self.goal_region = self.path.goal_region  # 每幀的抵達判斷直接使用，不再重新計算
         self.setup_goal()
 
         # 重設玩家位置（可根據每條 path 決定）
@@ -795,9 +623,9 @@ class PathFollowingTestApp:
         self.canvas.tag_raise(self.player)
 
         # 重設狀態
-        self.start_time = None
         self.total_time = 0
         self.off_path_time = 0
+        self.samples.clear()
         self.reached_goal = False
         self.running = False
         self.leftX = 0
@@ -807,26 +635,16 @@ class PathFollowingTestApp:
             self.path.current_length = self.path.path_length
         elif isinstance(self.path, CornerPath):
             self.path.current_progress = 1.0
+        self.path.invalidate_geometry()
 
-        self.player_loop()
+        self.loop.start()
 
     def setup_goal(self):
         """設置目標區域"""
-        goal_area = self.path.get_goal_area()
-
-        if 'points' in goal_area:
-            # 多邊形目標區域
-            self.goal_rect = self.canvas.create_polygon(
-                goal_area['points'],
-                fill=self.goal_color,
-                outline=self.goal_color)
-        else:
-            # 矩形目標區域
-            self.goal_rect = self.canvas.create_rectangle(goal_area['left'],
-                                                          goal_area['top'],
-                                                          goal_area['right'],
-                                                          goal_area['bottom'],
-                                                          fill=self.goal_color)
+        self.goal_rect = self.canvas.create_polygon(
+            self.goal_region.polygon(),
+            fill=self.goal_color,
+            outline=self.goal_color)
         self.canvas.tag_raise(self.goal_rect)
 
     def setup_player(self):
@@ -840,7 +658,8 @@ class PathFollowingTestApp:
             fill=primary_color)
         self.canvas.tag_raise(self.player)  # ← 初始時也拉最上面
 
-    def player_loop(self):
+    def player_step(self, dt):
+        """固定步長模擬一步（dt 秒），由 FixedTimestepLoop 呼叫"""
         if self.running and not self.reached_goal:
             dx = self.leftX * self.speed
             dy = self.leftY * self.speed
@@ -861,10 +680,11 @@ class PathFollowingTestApp:
                                self.player_y + self.player_radius)
             self.canvas.tag_raise(self.player)
 
+            inside = self.path.is_inside(self.player_x, self.player_y)
             if DEBUG:
                 primary_color = f"#{config.COLORS['PRIMARY'][0]:02x}{config.COLORS['PRIMARY'][1]:02x}{config.COLORS['PRIMARY'][2]:02x}"
                 error_color = f"#{config.COLORS['ERROR'][0]:02x}{config.COLORS['ERROR'][1]:02x}{config.COLORS['ERROR'][2]:02x}"
-                if self.path.is_inside(self.player_x, self.player_y):
+                if inside:
                     self.canvas.itemconfig(self.player, fill=primary_color)
                 else:
                     self.canvas.itemconfig(self.player, fill=error_color)
@@ -872,33 +692,33 @@ class PathFollowingTestApp:
             # 🔒 禁用路徑收縮功能以降低複雜度
             # self.path.shrink()
 
-            now = time.time()
-            if self.start_time is None:
-                self.start_time = now
+            self.total_time += dt
+            if not inside:
+                self.off_path_time += dt
+            progress, lateral = self.path.centerline.locate(self.player_x, self.player_y)
+            self.samples.append(self.total_time, lateral, progress, inside)
 
-            self.total_time += 0.016
-            if not self.path.is_inside(self.player_x, self.player_y):
-                self.off_path_time += 0.016
+            # 紀錄玩家軌跡與該幀的實際間隔（包含抵達終點的這一步）
+            self.path.player_trace.append((self.player_x, self.player_y))
+            self.path.trace_dts.append(self.loop.frame_dt)
 
             if self.check_reached_goal():
                 self.reached_goal = True
+                self.loop.stop()
                 self.show_result()
                 self.root.after(1000, self.advance_path)
-                return
-
-            # 紀錄玩家軌跡
-            self.path.player_trace.append((self.player_x, self.player_y))
-
-        # 16ms 之後再執行一次（~60fps）
-        self.root.after(16, self.player_loop)
 
     def advance_path(self):
-        output_single_trace(self.path, self.current_path_index,
-                            self.session_output_dir)
+        # 軌跡圖交給背景程序繪製，下一條路徑立即開始
+        submit_trial_trace(single_trace_job(self.path, self.current_path_index,
+                                            self.session_output_dir),
+                           self.trace_jobs)
         self.current_path_index += 1
         if self.current_path_index >= len(self.paths):
             print(f"✅ {get_text('path_all_complete')}")
             self.save_test_results()
+            submit_session_sheet(self.trace_jobs, self.session_output_dir)
+            flush_trace_jobs()
             # 延遲關閉視窗以確保所有資源正確清理
             self.root.after(2000, self.close_application)
         else:
@@ -907,6 +727,8 @@ class PathFollowingTestApp:
     def close_application(self):
         """安全關閉應用程式"""
         self.running = False
+        self.loop.stop()
+        shutdown_trace_workers()
         try:
             self.root.quit()
             self.root.destroy()
@@ -914,61 +736,23 @@ class PathFollowingTestApp:
             pass
 
     def check_reached_goal(self):
-        """檢查是否到達目標"""
-        goal_area = self.path.get_goal_area()
-
-        if 'points' in goal_area:
-            # 簡化的多邊形目標區域檢查
-            # 檢查玩家是否在目標區域的邊界框內
-            points = goal_area['points']
-            min_x = min(points[0::2])  # 取所有x座標的最小值
-            max_x = max(points[0::2])  # 取所有x座標的最大值
-            min_y = min(points[1::2])  # 取所有y座標的最小值
-            max_y = max(points[1::2])  # 取所有y座標的最大值
-
-            return (min_x <= self.player_x <= max_x
-                    and min_y <= self.player_y <= max_y)
-        else:
-            # 矩形目標區域的檢查
-            return (goal_area['left'] <= self.player_x <= goal_area['right']
-                    and
-                    goal_area['top'] <= self.player_y <= goal_area['bottom'])
+        """檢查是否到達目標（精確判斷旋轉後的目標矩形）"""
+        return self.goal_region.contains_point(self.player_x, self.player_y)
 
     def analyze_movement_segments(self, path):
-        """分析玩家在路徑上的移動段落：直線段 vs 轉彎段"""
+        """分析玩家在路徑上的移動段落：以軌跡點與路徑幾何分類直線段與轉彎段"""
+        step_seconds = self.loop.step_seconds
         if isinstance(path, StraightPath):
             # 直線路徑只有一個直線段
-            return {
-                "straight_segments": [{
-                    "start_time": 0,
-                    "duration": self.total_time,
-                    "movement_type": path.movement_type,
-                    "accuracy": 100 - (self.off_path_time / self.total_time * 100) if self.total_time > 0 else 0
-                }],
-                "corner_segments": []
-            }
+            return analyze_straight_trace(path.player_trace, (path.start_x, path.start_y),
+                                          (path.end_x, path.end_y), path.width, step_seconds,
+                                          path.movement_type)
         elif isinstance(path, CornerPath):
-            # 轉彎路徑需要分析兩段：直線段和轉彎段
-            # 這裡需要根據軌跡點來分析，簡化版本按比例估算
-            segment1_ratio = path.segment1_length / path.total_length
-            segment1_duration = self.total_time * segment1_ratio
-            segment2_duration = self.total_time * (1 - segment1_ratio)
-            
-            return {
-                "straight_segments": [{
-                    "start_time": 0,
-                    "duration": segment1_duration,
-                    "movement_type": "first_straight",
-                    "accuracy": 95  # 簡化，實際應分析軌跡
-                }],
-                "corner_segments": [{
-                    "start_time": segment1_duration,
-                    "duration": segment2_duration,
-                    "movement_type": "corner_turn",
-                    "accuracy": 85  # 轉彎通常較困難
-                }]
-            }
-        
+            # 轉彎路徑分為第一段、轉角區、第二段
+            return analyze_corner_trace(path.player_trace, (path.start_x, path.start_y),
+                                        (path.corner_x, path.corner_y), (path.end_x, path.end_y),
+                                        path.width, step_seconds)
+
         return {"straight_segments": [], "corner_segments": []}
 
     def show_result(self):
@@ -979,6 +763,8 @@ class PathFollowingTestApp:
         
         # 新增：移動段落分析
         movement_analysis = self.analyze_movement_segments(self.path)
+        # 本條路徑的迴圈時間統計；有時間被捨棄時完成時間比真實時間短，標記為 timing_degraded
+        timing = self.loop.get_timing_stats()
         
         path_info = {
             "start_x": self.path.start_x,
@@ -1004,12 +790,18 @@ class PathFollowingTestApp:
             "path_info": path_info,
             "completion_time_seconds": self.total_time,
             "off_path_time_seconds": self.off_path_time,
+            "timing_degraded": timing["degraded"],
             "off_path_percentage": percent_off,
             "path_accuracy": 100 - percent_off,
             "trace_points_count": len(self.path.player_trace),
             "movement_analysis": movement_analysis,  # 新增：段落分析
             # 新增：繪圖所需的完整資料
-            "player_trace": self.path.player_trace,  # 完整的玩家移動軌跡
+            "off_path_events": self.samples.summary(self.loop.step_seconds, self.path.width / 2,
+                                                    self.path.centerline.length),
+            "path_samples": self.samples.columns(),  # 每個模擬步長的偏離記錄（另存於 sidecar）
+            "player_trace": Columnar(self.path.player_trace, width=2),  # 完整的玩家移動軌跡（另存於 sidecar）
+            "frame_dt_seconds": Columnar(self.path.trace_dts),  # 每個軌跡點所在幀的實際間隔
+            "timing": timing,
             "path_shapes": self.path.get_path_shapes(),  # 路徑形狀資料
             "goal_area": self.path.get_goal_area(),  # 目標區域資料
             "canvas_dimensions": {
@@ -1025,6 +817,8 @@ class PathFollowingTestApp:
         print(get_text('path_total_time_format', time=self.total_time))
         print(get_text('path_off_path_time_format', time=self.off_path_time))
         print(get_text('path_off_path_percentage_format', percentage=percent_off))
+        if timing["degraded"]:
+            print(get_text('path_timing_degraded', seconds=timing["dropped_seconds"]))
         print(get_text('path_movement_type_format', type=path_info['movement_type']))
         
         # 顯示段落分析
@@ -1034,7 +828,7 @@ class PathFollowingTestApp:
             print(get_text('path_corner_segments_format', count=len(movement_analysis['corner_segments'])))
 
     def on_joycon_input(self, buttons, leftX, leftY, last_key_bit,
-                        last_key_down):
+                        last_key_down, timestamp_ns=None):
         self.leftX = leftX
         self.leftY = leftY
         if not self.running and last_key_down:
@@ -1071,10 +865,14 @@ class PathFollowingTestApp:
                 "description": "路徑跟隨測試，參考Mario Party設計，測試joystick路徑跟隨精確度",
                 "data_definitions": {
                     "completion_time_definition": "從進入起始區域到到達終點區域的時間",
+                    "timing_definition": "timing 為該條路徑的迴圈統計；dropped_seconds 為超過補跑上限而未模擬的時間，大於 0 時 timing_degraded 為 True，完成時間與偏離時間偏短",
                     "off_path_time_definition": "玩家中心超出路徑邊界的累計時間",
                     "path_accuracy_calculation": "(總時間 - 偏離時間) / 總時間 × 100%",
-                    "trajectory_sampling": "玩家移動軌跡以約60fps頻率記錄",
-                    "coordinate_system": "畫布座標系統，左上角為(0,0)"
+                    "trajectory_sampling": "玩家移動軌跡以固定模擬步長記錄，每點附上該幀的實際間隔 (frame_dt_seconds)",
+                    "coordinate_system": "畫布座標系統，左上角為(0,0)",
+                    "segment_classification": "movement_analysis 以軌跡點分類：距轉角一個路寬內為轉角區（corner_turn），其餘歸到距中心線較近的直線段；每段時間 = 樣本數 × 模擬步長",
+                    "lateral_rms_definition": "段落內軌跡點到路徑中心線距離的均方根（像素）",
+                    "corner_cut_area_definition": "轉角區軌跡與路徑中心線圍成的淨面積（平方像素），往轉彎內側切為正、往外側繞為負"
                 }
             },
             "window_size": {
@@ -1096,7 +894,7 @@ class PathFollowingTestApp:
             "path_detection": {
                 "method": "玩家中心點位置檢測",
                 "boundary_definition": "路徑邊界外視為偏離",
-                "real_time_tracking": "即時記錄偏離時間點"
+                "real_time_tracking": "每個模擬步長記錄於 path_samples：步長結束時的 trial 時間 time_s、相對中心線的橫向距離 lateral_px（沿行進方向右側為正）、沿中心線的進度 progress_px、是否在路徑內 inside；off_path_events 為由這些記錄計算的偏離次數、持續時間分佈與最大偏離"
             }
         }
         
@@ -1175,7 +973,6 @@ class PathFollowingTestApp:
 
 if __name__ == "__main__":
     import argparse
-    from common.controller_input import ControllerInput
     import atexit
 
     # 檢查是否有 --english 參數來提前設定語言
@@ -1241,6 +1038,7 @@ if __name__ == "__main__":
     atexit.register(cleanup_on_exit)
 
     try:
+        seed_session()  # 目標位置等隨機內容的種子，記錄在原始輸入紀錄中供重播
         root = tk.Tk()
         app = PathFollowingTestApp(root, user_id)
         
@@ -1256,11 +1054,20 @@ if __name__ == "__main__":
             
         root.protocol("WM_DELETE_WINDOW", on_window_closing)
 
-        # 使用新的遙控器管理系統 - 會自動使用已配對的遙控器
-        listener = ControllerInput(analog_callback=app.on_joycon_input,
-                                   use_existing_controller=True)
-        controller_thread = Thread(target=listener.run, daemon=False)  # 改為非 daemon 執行緒
-        controller_thread.start()
+        def connect_controller():
+            """視窗出現後才載入手把模組並連接手把（pygame 初始化需數百毫秒，不延後第一個畫面）"""
+            global listener, controller_thread
+            from common.controller_input import ControllerInput
+
+            # 使用新的遙控器管理系統 - 會自動使用已配對的遙控器
+            listener = ControllerInput(analog_callback=app.on_joycon_input,
+                                       use_existing_controller=True,
+                                       tk_root=root,
+                                       analog_sample_interval_ms=config.CONTROLLER_DRAIN_INTERVAL_MS)
+            controller_thread = Thread(target=listener.run, daemon=False)  # 改為非 daemon 執行緒
+            controller_thread.start()
+
+        root.after_idle(connect_controller)
 
         root.mainloop()
 
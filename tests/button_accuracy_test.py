@@ -9,7 +9,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from common import config
-from common.utils import setup_window_topmost, collect_user_info_if_needed
+from common.utils import setup_window_topmost, collect_user_info_if_needed, event_time_ns, recorded_click, seed_session
 from common.result_saver import save_test_result
 from common.language import set_language, get_text
 
@@ -78,7 +78,7 @@ class AccuracyDirectionTestApp:
         self.start_button = tk.Button(root,
                                       text=get_text('gui_start_calculation'),
                                       font=("Arial", 24),
-                                      command=self.start_measurement,
+                                      command=recorded_click(self, self.start_measurement),
                                       bg=button_default_color,
                                       fg=text_color)
         self.reset()
@@ -90,7 +90,7 @@ class AccuracyDirectionTestApp:
 
         self.measuring = False
         self.current_target = None
-        self.round_start_time = None
+        self.round_start_ns = None
         self.waiting_for_input = False  # 新增：等待輸入狀態
         self.score = 0
         self.total = 0
@@ -117,7 +117,7 @@ class AccuracyDirectionTestApp:
         self.formal_error_count = 0  # 新增：僅記錄正式測試的錯誤次數
         self.measuring = True
         self.current_target = None
-        self.round_start_time = None
+        self.round_start_ns = None
         self.waiting_for_input = False
         
         # 重置所有按鈕顏色
@@ -156,16 +156,21 @@ class AccuracyDirectionTestApp:
         self.current_target = random.choice(list(self.directions.keys()))
         error_color = f"#{config.COLORS['ERROR'][0]:02x}{config.COLORS['ERROR'][1]:02x}{config.COLORS['ERROR'][2]:02x}"
         self.canvas.itemconfig(self.circles[self.current_target], fill=error_color)
-        self.round_start_time = time.time()
+        self.round_start_ns = time.perf_counter_ns()  # 與手把事件時間戳同一時鐘
         self.waiting_for_input = True  # 設定等待輸入狀態
 
     def on_joycon_input(self, buttons, leftX, leftY, last_key_bit,
-                        last_key_down):
+                        last_key_down, timestamp_ns=None):
         if not last_key_down or last_key_bit is None:
             return
         
         # 如果不在測試狀態或沒有開始計時或不等待輸入，忽略輸入
-        if not self.measuring or self.round_start_time is None or not self.waiting_for_input:
+        if not self.measuring or self.round_start_ns is None or not self.waiting_for_input:
+            return
+
+        # 目標亮起前按下、但稍後才從緩衝區取出的事件：與等待期間的按鍵相同，直接忽略
+        press_ns = event_time_ns(timestamp_ns)
+        if press_ns < self.round_start_ns:
             return
 
         for direction, info in self.directions.items():
@@ -173,7 +178,7 @@ class AccuracyDirectionTestApp:
                 # 立即設定為不等待輸入，防止重複觸發
                 self.waiting_for_input = False
                 
-                response_time = time.time() - self.round_start_time
+                response_time = (press_ns - self.round_start_ns) / 1e9
 
                 if direction == self.current_target:
                     success_color = f"#{config.COLORS['SUCCESS'][0]:02x}{config.COLORS['SUCCESS'][1]:02x}{config.COLORS['SUCCESS'][2]:02x}"
@@ -348,7 +353,6 @@ class AccuracyDirectionTestApp:
 
 if __name__ == "__main__":
     from threading import Thread
-    from common.controller_input import ControllerInput
 
     # 檢查是否有 --english 參數來提前設定語言
     if '--english' in sys.argv:
@@ -384,6 +388,7 @@ if __name__ == "__main__":
         # 收集使用者基本資訊（如果尚未收集）
         collect_user_info_if_needed(user_id)
 
+    seed_session()  # 目標位置等隨機內容的種子，記錄在原始輸入紀錄中供重播
     root = tk.Tk()
     app = AccuracyDirectionTestApp(root, user_id)
 
@@ -393,10 +398,17 @@ if __name__ == "__main__":
     app.directions["left"]["bit"] = 2
     app.directions["right"]["bit"] = 1
 
-    # 使用新的遙控器管理系統 - 會自動使用已配對的遙控器
-    app.listener = ControllerInput(button_callback=app.on_joycon_input,
-                                   use_existing_controller=True)
-    Thread(target=app.listener.run, daemon=True).start()
+    def connect_controller():
+        """視窗出現後才載入手把模組並連接手把（pygame 初始化需數百毫秒，不延後第一個畫面）"""
+        from common.controller_input import ControllerInput
+
+        # 使用新的遙控器管理系統 - 會自動使用已配對的遙控器
+        app.listener = ControllerInput(button_callback=app.on_joycon_input,
+                                       use_existing_controller=True,
+                                       tk_root=root)
+        Thread(target=app.listener.run, daemon=True).start()
+
+    root.after_idle(connect_controller)
 
     try:
         root.mainloop()
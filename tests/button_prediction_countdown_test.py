@@ -25,7 +25,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from common import config
-from common.utils import setup_window_topmost, collect_user_info_if_needed
+from common.utils import setup_window_topmost, collect_user_info_if_needed, event_time, recorded_click, seed_session
 from common.result_saver import save_test_result
 from common.language import set_language, get_text
 
@@ -72,7 +72,7 @@ class CountdownReactionTestApp:
         self.label.place(relx=0.5, rely=0.2, anchor='center')
 
         button_default_color = f"#{config.COLORS['BUTTON_DEFAULT'][0]:02x}{config.COLORS['BUTTON_DEFAULT'][1]:02x}{config.COLORS['BUTTON_DEFAULT'][2]:02x}"
-        self.start_button = tk.Button(root, text=get_text('gui_start_test'), font=("Arial", 24), command=self.start_test,
+        self.start_button = tk.Button(root, text=get_text('gui_start_test'), font=("Arial", 24), command=recorded_click(self, self.start_test),
                                      bg=button_default_color, fg=text_color)
         self.start_button.place(relx=0.5, rely=0.8, anchor='center')
 
@@ -124,7 +124,7 @@ class CountdownReactionTestApp:
         ball_data = {
             'id': ball_obj,
             'number': ball_number,
-            'start_time': time.time(),
+            'start_time': time.perf_counter(),
             'active': True,
             'hit': False
         }
@@ -137,7 +137,7 @@ class CountdownReactionTestApp:
 
     def animate_all_balls(self):
         """同時動畫所有活躍的球"""
-        current_time = time.time()
+        current_time = time.perf_counter()
         balls_to_remove = []
         
         for ball_data in self.active_balls:
@@ -202,12 +202,12 @@ class CountdownReactionTestApp:
         # 繼續動畫循環
         self.animation_id = self.root.after(self.FRAME_INTERVAL, self.animate_all_balls)
 
-    def register_press(self):
-        """處理按鍵，找到最接近目標位置的球"""
+    def register_press(self, timestamp_ns=None):
+        """處理按鍵，找到最接近目標位置的球（timestamp_ns 為手把事件取出時的 perf_counter_ns）"""
         if not self.active_balls:
             return
             
-        now = time.time()
+        now = event_time(timestamp_ns)
         best_ball = None
         best_score = float('inf')
         
@@ -350,7 +350,7 @@ class CountdownReactionTestApp:
         text_color = f"#{config.COLORS['TEXT'][0]:02x}{config.COLORS['TEXT'][1]:02x}{config.COLORS['TEXT'][2]:02x}"
         button_default_color = f"#{config.COLORS['BUTTON_DEFAULT'][0]:02x}{config.COLORS['BUTTON_DEFAULT'][1]:02x}{config.COLORS['BUTTON_DEFAULT'][2]:02x}"
         
-        self.start_button = tk.Button(self.root, text=get_text('gui_restart_test'), font=("Arial", 24), command=self.start_test,
+        self.start_button = tk.Button(self.root, text=get_text('gui_restart_test'), font=("Arial", 24), command=recorded_click(self, self.start_test),
                                      bg=button_default_color, fg=text_color)
         self.start_button.place(relx=0.5, rely=0.8, anchor='center')
 
@@ -454,9 +454,9 @@ class CountdownReactionTestApp:
         print("=" * 50)
 
     # ← Joy-Con 按鍵會呼叫這個函數
-    def on_joycon_input(self, buttons, leftX, leftY, last_key_bit, last_key_down):
+    def on_joycon_input(self, buttons, leftX, leftY, last_key_bit, last_key_down, timestamp_ns=None):
         if last_key_down:
-            self.register_press()
+            self.register_press(timestamp_ns)
 
     def on_closing(self):
         """處理視窗關閉事件"""
@@ -476,7 +476,6 @@ class CountdownReactionTestApp:
 
 if __name__ == "__main__":
     from threading import Thread
-    from common.controller_input import ControllerInput
 
     # 檢查是否有 --english 參數來提前設定語言
     if '--english' in sys.argv:
@@ -512,13 +511,21 @@ if __name__ == "__main__":
         # 收集使用者基本資訊（如果尚未收集）
         collect_user_info_if_needed(user_id)
 
+    seed_session()  # 目標位置等隨機內容的種子，記錄在原始輸入紀錄中供重播
     root = tk.Tk()
     app = CountdownReactionTestApp(root, user_id)
 
-    # 使用新的遙控器管理系統 - 會自動使用已配對的遙控器
-    app.listener = ControllerInput(button_callback=app.on_joycon_input,
-                                   use_existing_controller=True)
-    Thread(target=app.listener.run, daemon=True).start()
+    def connect_controller():
+        """視窗出現後才載入手把模組並連接手把（pygame 初始化需數百毫秒，不延後第一個畫面）"""
+        from common.controller_input import ControllerInput
+
+        # 使用新的遙控器管理系統 - 會自動使用已配對的遙控器
+        app.listener = ControllerInput(button_callback=app.on_joycon_input,
+                                       use_existing_controller=True,
+                                       tk_root=root)
+        Thread(target=app.listener.run, daemon=True).start()
+
+    root.after_idle(connect_controller)
 
     try:
         root.mainloop()
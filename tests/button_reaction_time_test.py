@@ -10,7 +10,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from common import config
 from common.result_saver import save_test_result
-from common.utils import setup_window_topmost, collect_user_info_if_needed
+from common.utils import setup_window_topmost, collect_user_info_if_needed, event_time_ns, recorded_click, seed_session
 from common.language import set_language, get_text
 
 
@@ -32,7 +32,7 @@ class ReactionTestApp:
         self.canvas.pack()
 
         self.state = "waiting"  # 初始狀態
-        self.start_time = None
+        self.start_time_ns = None
         self.after_id = None
         self.reaction_times = []
         self.test_results = []  # 儲存詳細的測試結果
@@ -61,7 +61,7 @@ class ReactionTestApp:
                                       bg=f"#{config.COLORS['BACKGROUND'][0]:02x}{config.COLORS['BACKGROUND'][1]:02x}{config.COLORS['BACKGROUND'][2]:02x}",
                                       fg=text_color)
 
-        self.start_button = tk.Button(root, text=get_text('gui_start_test'), font=("Arial", 24), command=self.start_test_series,
+        self.start_button = tk.Button(root, text=get_text('gui_start_test'), font=("Arial", 24), command=recorded_click(self, self.start_test_series),
                                      bg=f"#{config.COLORS['BUTTON_DEFAULT'][0]:02x}{config.COLORS['BUTTON_DEFAULT'][1]:02x}{config.COLORS['BUTTON_DEFAULT'][2]:02x}",
                                      fg=f"#{config.COLORS['TEXT'][0]:02x}{config.COLORS['TEXT'][1]:02x}{config.COLORS['TEXT'][2]:02x}")
         self.start_button.place(relx=0.5, rely=0.8, anchor='center')
@@ -129,9 +129,9 @@ class ReactionTestApp:
         # self.label.config(text="快按 Joy-Con！", font=("Arial", 32))
         self.state = "go"
         self.waiting_for_input = True
-        self.start_time = time.time()
+        self.start_time_ns = time.perf_counter_ns()  # 與手把事件時間戳同一時鐘
 
-    def on_joycon_input(self, buttons, leftX, leftY, last_key_bit, last_key_down):
+    def on_joycon_input(self, buttons, leftX, leftY, last_key_bit, last_key_down, timestamp_ns=None):
         if not last_key_down:
             return  # 只處理按下事件（不處理放開）
 
@@ -143,8 +143,12 @@ class ReactionTestApp:
             # 在等待開始階段，完全忽略輸入
             return
 
-        elif self.state == "ready":
-            # 在準備狀態按鈕被按下，表示太早
+        # 事件經由緩衝區稍後才取出：在變紅前按下的事件可能在狀態切到 go 之後才送達，以事件時間戳判斷
+        press_ns = event_time_ns(timestamp_ns)
+        pressed_before_go = self.state == "go" and self.waiting_for_input and press_ns < self.start_time_ns
+
+        if self.state == "ready" or pressed_before_go:
+            # 在準備狀態（變紅之前）按鈕被按下，表示太早
             print(get_text('too_fast_restart', trial=self.current_trial))
             if self.after_id:
                 self.root.after_cancel(self.after_id)
@@ -155,7 +159,7 @@ class ReactionTestApp:
         elif self.state == "go" and self.waiting_for_input:
             # 正確的反應
             self.waiting_for_input = False  # 立即設定為不等待輸入
-            reaction_time = time.time() - self.start_time
+            reaction_time = (press_ns - self.start_time_ns) / 1e9
             self.reaction_times.append(reaction_time)
             
             # 記錄詳細的測試結果
@@ -290,7 +294,6 @@ class ReactionTestApp:
 
 if __name__ == "__main__":
     from threading import Thread
-    from common.controller_input import ControllerInput
 
     # 檢查是否有 --english 參數來提前設定語言
     if '--english' in sys.argv:
@@ -326,12 +329,20 @@ if __name__ == "__main__":
         # 收集使用者基本資訊（如果尚未收集）
         collect_user_info_if_needed(user_id)
 
+    seed_session()  # 目標位置等隨機內容的種子，記錄在原始輸入紀錄中供重播
     root = tk.Tk()
     app = ReactionTestApp(root, user_id)
 
-    # 使用新的遙控器管理系統 - 會自動使用已配對的遙控器
-    app.listener = ControllerInput(button_callback=app.on_joycon_input, use_existing_controller=True)
-    Thread(target=app.listener.run, daemon=True).start()
+    def connect_controller():
+        """視窗出現後才載入手把模組並連接手把（pygame 初始化需數百毫秒，不延後第一個畫面）"""
+        from common.controller_input import ControllerInput
+
+        # 使用新的遙控器管理系統 - 會自動使用已配對的遙控器
+        app.listener = ControllerInput(button_callback=app.on_joycon_input, use_existing_controller=True,
+                                       tk_root=root)
+        Thread(target=app.listener.run, daemon=True).start()
+
+    root.after_idle(connect_controller)
 
     try:
         root.mainloop()
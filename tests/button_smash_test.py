@@ -8,7 +8,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from common import config
-from common.utils import setup_window_topmost, collect_user_info_if_needed
+from common.utils import setup_window_topmost, collect_user_info_if_needed, event_time, event_wall_time, recorded_click, seed_session
 from common.result_saver import save_test_result
 from common.language import set_language, get_text
 
@@ -112,7 +112,7 @@ class ButtonSmashTestApp:
         self.start_button = tk.Button(root, 
                                       text=get_text('gui_start_test'), 
                                       font=("Arial", 24), 
-                                      command=self.start_test,
+                                      command=recorded_click(self, self.start_test),
                                       bg=button_default_color,
                                       fg=text_color)
         self.start_button.place(relx=0.5, rely=0.85, anchor='center')
@@ -151,7 +151,7 @@ class ButtonSmashTestApp:
         if self.state != "testing" or self.start_time is None:
             return
             
-        elapsed = time.time() - self.start_time
+        elapsed = time.perf_counter() - self.start_time
         remaining = max(0, self.test_duration - elapsed)
         
         if remaining > 0:
@@ -293,7 +293,7 @@ class ButtonSmashTestApp:
         else:
             return get_text('button_smash_beginner')
 
-    def on_joycon_input(self, buttons, leftX, leftY, last_key_bit, last_key_down):
+    def on_joycon_input(self, buttons, leftX, leftY, last_key_bit, last_key_down, timestamp_ns=None):
         """處理 Joy-Con 輸入"""
         
         # 如果在等待狀態，不處理手把輸入（開始測試只能用滑鼠）
@@ -313,14 +313,14 @@ class ButtonSmashTestApp:
             if self.designated_button is None:
                 self.designated_button = last_key_bit
                 print(get_text('button_smash_designated_button', button=last_key_bit))
-            self.on_button_press()
+            self.on_button_press(timestamp_ns)
         else:
             # 按鍵放開 - 只處理指定按鈕的放開事件
             if last_key_bit == self.designated_button:
                 self.on_button_release()
 
-    def on_button_press(self):
-        """處理按鍵按下事件"""
+    def on_button_press(self, timestamp_ns=None):
+        """處理按鍵按下事件（timestamp_ns 為手把事件取出時的 perf_counter_ns）"""
         if self.button_pressed:
             return  # 避免重複觸發
             
@@ -328,21 +328,22 @@ class ButtonSmashTestApp:
         
         # 在測試狀態才處理按鈕輸入，等待狀態只能用滑鼠點擊開始按鈕
         if self.state == "testing":
+            current_time = event_time(timestamp_ns)
+
             # 如果是第一次點擊，開始計時
             if self.start_time is None:
-                self.start_time = time.time()
+                self.start_time = current_time
                 self.update_timer()
                 print(get_text('button_smash_start_timing'))
             
             # 檢查是否還在測試時間內
-            current_time = time.time()
             if self.start_time and (current_time - self.start_time) < self.test_duration:
                 self.click_count += 1
                 
                 # 記錄點擊時間戳
                 click_timestamp = {
                     "click_number": self.click_count,
-                    "absolute_time": current_time,
+                    "absolute_time": event_wall_time(timestamp_ns),
                     "relative_time_ms": (current_time - self.start_time) * 1000
                 }
                 self.click_timestamps.append(click_timestamp)
@@ -401,7 +402,6 @@ class ButtonSmashTestApp:
 
 if __name__ == "__main__":
     from threading import Thread
-    from common.controller_input import ControllerInput
 
     # 檢查是否有 --english 參數來提前設定語言
     if '--english' in sys.argv:
@@ -438,6 +438,7 @@ if __name__ == "__main__":
         # 收集使用者基本資訊（如果尚未收集）
         collect_user_info_if_needed(user_id)
 
+    seed_session()  # 目標位置等隨機內容的種子，記錄在原始輸入紀錄中供重播
     root = tk.Tk()
     app = ButtonSmashTestApp(root, user_id)
 
@@ -448,7 +449,7 @@ if __name__ == "__main__":
         
         # 模擬 25 次點擊，應該得到 2.5 CPS
         app.start_test()
-        app.start_time = time.time()
+        app.start_time = time.perf_counter()
         app.click_count = 25
         app.finish_test()
         
@@ -456,11 +457,18 @@ if __name__ == "__main__":
         root.destroy()
         sys.exit(0)
 
-    # 設定手把輸入監聽
-    # 使用新的遙控器管理系統 - 會自動使用已配對的遙控器
-    app.listener = ControllerInput(button_callback=app.on_joycon_input,
-                                   use_existing_controller=True)
-    Thread(target=app.listener.run, daemon=True).start()
+    def connect_controller():
+        """視窗出現後才載入手把模組並連接手把（pygame 初始化需數百毫秒，不延後第一個畫面）"""
+        from common.controller_input import ControllerInput
+
+        # 設定手把輸入監聽
+        # 使用新的遙控器管理系統 - 會自動使用已配對的遙控器
+        app.listener = ControllerInput(button_callback=app.on_joycon_input,
+                                       use_existing_controller=True,
+                                       tk_root=root)
+        Thread(target=app.listener.run, daemon=True).start()
+
+    root.after_idle(connect_controller)
 
     try:
         root.mainloop()